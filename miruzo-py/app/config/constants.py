@@ -8,3 +8,8 @@ SCORE_MAXIMUM = 32767
 MAX_IMAGE_WIDTH = 10240
 MAX_IMAGE_HEIGHT = 10240
 MAX_IMAGE_PIXELS = MAX_IMAGE_WIDTH * MAX_IMAGE_HEIGHT
+
+# data URI of the inline list placeholder
+PLACEHOLDER_MAX_LENGTH = 1024
+# 0xRRGGBB
+DOMINANT_COLOR_MAXIMUM = 0xFFFFFF
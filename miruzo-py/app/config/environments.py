@@ -17,6 +17,12 @@ class DatabaseBackend(str, Enum):
 	SQLITE = 'sqlite'
 
 
+@final
+class SQLiteProfile(str, Enum):
+	SERVE = 'serve'
+	BULK = 'bulk'
+
+
 @final
 class Environment(str, Enum):
 	DEVELOPMENT = 'development'
@@ -37,6 +43,8 @@ class Settings(BaseSettings):
 
 	database_backend: DatabaseBackend = DatabaseBackend.SQLITE
 	database_url: str = 'sqlite:///../var/miruzo.sqlite'
+	# pragma set for SQLite connections; use bulk for large initial imports
+	sqlite_profile: SQLiteProfile = SQLiteProfile.SERVE
 
 	media_root: Path = Path('../var/media')
 	public_media_root: str = '/media/'
@@ -46,6 +54,10 @@ class Settings(BaseSettings):
 	gataku_symlink_dirname: str = 'gataku'
 
 	score: ScoreConfig = ScoreConfig()
+	# also keep every ingest execution in the ingest_executions table
+	ingest_execution_log: bool = False
+	# let bulk loads on MySQL use LOAD DATA LOCAL INFILE (the server must allow it too)
+	mysql_local_infile: bool = False
 	variant_layers: tuple[VariantLayerSpec, ...] = DEFAULT_VARIANT_LAYERS
 
 	@property
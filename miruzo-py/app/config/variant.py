@@ -1,6 +1,9 @@
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
 from typing import Literal, final
 
+from app.models.enums import ImageKind
+
 
 @dataclass(frozen=True, slots=True)
 @final
@@ -13,6 +16,17 @@ class VariantFormat:
 	default_quality: int | None = None
 
 
+@dataclass(frozen=True, slots=True)
+@final
+class VariantEncoderProfile:
+	"""Encoder effort settings; more effort buys fewer bytes with CPU time."""
+
+	name: Literal['fast', 'archival']
+	webp_method: int
+	jpeg_optimize: bool
+	jpeg_progressive: bool
+
+
 @dataclass(frozen=True, slots=True)
 @final
 class VariantSlot:
@@ -69,6 +83,26 @@ JPEG_FORMAT = VariantFormat(
 )
 
 
+# Cheap enough for the ingest critical path; the optimizer re-encodes later.
+FAST_ENCODER_PROFILE = VariantEncoderProfile(
+	name='fast',
+	webp_method=3,
+	jpeg_optimize=False,
+	jpeg_progressive=False,
+)
+
+ARCHIVAL_ENCODER_PROFILE = VariantEncoderProfile(
+	name='archival',
+	webp_method=6,
+	jpeg_optimize=True,
+	jpeg_progressive=True,
+)
+
+ENCODER_PROFILES: Mapping[str, VariantEncoderProfile] = {
+	profile.name: profile for profile in (FAST_ENCODER_PROFILE, ARCHIVAL_ENCODER_PROFILE)
+}
+
+
 def _spec(
 	fmt: VariantFormat,
 	*,
@@ -110,5 +144,29 @@ DEFAULT_VARIANT_LAYERS: tuple[VariantLayerSpec, ...] = (
 )
 
 
+# Flat graphics compress smaller and faster losslessly than as lossy VP8.
+# Shaded illustrations and photos still win with lossy VP8, so they keep
+# the configured format. Overrides must keep the file extension, because the
+# variant path is derived from the configured spec.
+VARIANT_KIND_FORMATS: Mapping[ImageKind, Mapping[VariantFormat, VariantFormat]] = {
+	ImageKind.GRAPHIC: {WEBP_FORMAT: LOSSLESS_WEBP_FORMAT},
+}
+
+
+def apply_variant_kind_preset(spec: VariantSpec, kind: ImageKind) -> VariantSpec:
+	"""Return the spec with the encoder format preferred for the image kind."""
+
+	fmt = VARIANT_KIND_FORMATS.get(kind, {}).get(spec.format)
+	if fmt is None:
+		return spec
+	return replace(spec, format=fmt)
+
+
+def has_variant_kind_preset(spec: VariantSpec) -> bool:
+	"""Check whether some image kind encodes this spec in another format."""
+
+	return any(spec.format in formats for formats in VARIANT_KIND_FORMATS.values())
+
+
 def is_variant_fallback_id(layer_id: int) -> bool:
 	return layer_id == _FALLBACK_LAYER_ID
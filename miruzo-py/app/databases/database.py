@@ -1,3 +1,4 @@
+from contextlib import AbstractContextManager, nullcontext
 from typing import Any
 
 from sqlalchemy import Engine, NullPool, create_engine, event
@@ -5,8 +6,9 @@ from sqlalchemy.engine import make_url
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.orm import Session
 
-from app.config.environments import DatabaseBackend, env
+from app.config.environments import DatabaseBackend, SQLiteProfile, env
 from app.databases.mysql_version import verify_mysql_supports_check_constraints
+from app.databases.sqlite_profile import SQLITE_PROFILE_PRAGMAS, restore_secondary_indexes
 from app.databases.sqlite_version import verify_sqlite_supports_returning_and_strict
 
 MYSQL_CHARSET = 'utf8mb4'
@@ -18,6 +20,7 @@ def _create_mysql_engine(
 	*,
 	pool_size: int = 1,
 	max_overflow: int = 2,
+	local_infile: bool = False,
 ) -> Engine:
 	try:
 		parsed_dsn = make_url(dsn)
@@ -33,11 +36,15 @@ def _create_mysql_engine(
 	if parsed_dsn.drivername == 'mysql+mysqldb' and parsed_dsn.host == 'localhost':
 		parsed_dsn = parsed_dsn.set(host='127.0.0.1')
 
+	connect_args: dict[str, Any] = {
+		'init_command': "SET sql_mode='TRADITIONAL,NO_AUTO_VALUE_ON_ZERO,ONLY_FULL_GROUP_BY',time_zone='+00:00'",
+	}
+	if local_infile:
+		connect_args['local_infile'] = 1
+
 	engine = create_engine(
 		parsed_dsn,
-		connect_args={
-			'init_command': "SET sql_mode='TRADITIONAL,NO_AUTO_VALUE_ON_ZERO,ONLY_FULL_GROUP_BY',time_zone='+00:00'",
-		},
+		connect_args=connect_args,
 		echo=False,
 		future=True,
 		max_overflow=max_overflow,
@@ -131,11 +138,27 @@ def _create_postgres_engine(
 	return engine
 
 
-def _create_sqlite3_engine(
+def create_sqlite3_engine(
 	dsn: str,
 	*,
 	pool_size: int = 1,
+	profile: SQLiteProfile = SQLiteProfile.SERVE,
 ) -> Engine:
+	"""
+	Build a SQLite engine with the pragmas of the given profile applied.
+
+	Args:
+		dsn: SQLite DSN; only the pysqlite driver is supported.
+		pool_size: Connection pool size.
+		profile: Pragma profile applied to every new connection.
+
+	Returns:
+		Engine with WAL journaling enabled.
+
+	Raises:
+		RuntimeError: if the DSN is not a pysqlite one.
+	"""
+
 	if not dsn.startswith(('sqlite://', 'sqlite+pysqlite://')):
 		raise RuntimeError('Unsupported SQLite DSN')
 
@@ -154,10 +177,18 @@ def _create_sqlite3_engine(
 		cursor = dbapi_connection.cursor()
 		try:
 			cursor.execute('PRAGMA foreign_keys=1;')
-			cursor.execute('PRAGMA wal_autocheckpoint=100;')
+			for pragma in SQLITE_PROFILE_PRAGMAS[profile]:
+				cursor.execute(pragma)
 		finally:
 			cursor.close()
 
+	if profile == SQLiteProfile.BULK:
+
+		@event.listens_for(engine, 'close')
+		def _optimize_sqlite(dbapi_connection: Connection, _: object) -> None:
+			# refresh planner statistics after the bulk write
+			dbapi_connection.execute('PRAGMA optimize;')
+
 	with engine.connect() as conn:
 		sqlite_version = conn.exec_driver_sql('SELECT sqlite_version();').scalar_one()
 		if not isinstance(sqlite_version, str):
@@ -166,20 +197,49 @@ def _create_sqlite3_engine(
 
 		conn.exec_driver_sql('PRAGMA journal_mode=WAL;')
 
+		# repair indexes a killed import left dropped
+		restore_secondary_indexes(conn)
+		conn.commit()
+
 	return engine
 
 
+def open_pipeline(session: Session) -> AbstractContextManager[object]:
+	"""
+	Enter psycopg pipeline mode on the session's connection.
+
+	Statements are then sent without waiting for each result; psycopg syncs
+	when a result is fetched and when the block exits. Other drivers get a
+	no-op context.
+	"""
+
+	connection = session.connection()
+	if connection.dialect.driver != 'psycopg':
+		return nullcontext()
+
+	driver_connection = connection.connection.driver_connection
+	if driver_connection is None:
+		raise RuntimeError('Pipeline mode needs an open psycopg connection')
+	return driver_connection.pipeline()
+
+
 match env.database_backend:
 	case DatabaseBackend.MYSQL:
-		engine = _create_mysql_engine(env.database_url)
+		engine = _create_mysql_engine(env.database_url, local_infile=env.mysql_local_infile)
 	case DatabaseBackend.POSTGRE_SQL:
 		engine = _create_postgres_engine(env.database_url)
 	case DatabaseBackend.SQLITE:
-		engine = _create_sqlite3_engine(env.database_url)
+		engine = create_sqlite3_engine(env.database_url, profile=env.sqlite_profile)
 	case _:
 		raise ValueError(f'Unsupported database type: {env.database_backend!r}')
 
 
+def close_engine() -> None:
+	"""Close every pooled connection, running per-connection teardown such as PRAGMA optimize."""
+
+	engine.dispose()
+
+
 def create_session() -> Session:
 	session = Session(engine)
 
@@ -0,0 +1,198 @@
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import final
+
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from app.config.environments import SQLiteProfile
+
+SQLITE_PROFILE_PRAGMAS: Mapping[SQLiteProfile, tuple[str, ...]] = {
+	# many short reads next to occasional writes
+	SQLiteProfile.SERVE: (
+		'PRAGMA synchronous=NORMAL;',
+		'PRAGMA mmap_size=268435456;',
+		'PRAGMA cache_size=-65536;',
+		'PRAGMA temp_store=MEMORY;',
+		'PRAGMA busy_timeout=5000;',
+		'PRAGMA wal_autocheckpoint=100;',
+	),
+	# long write runs: let the WAL grow and checkpoint at batch boundaries instead
+	SQLiteProfile.BULK: (
+		'PRAGMA synchronous=NORMAL;',
+		'PRAGMA cache_size=-262144;',
+		'PRAGMA temp_store=MEMORY;',
+		'PRAGMA busy_timeout=5000;',
+		'PRAGMA wal_autocheckpoint=10000;',
+	),
+}
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class _SecondaryIndex:
+	name: str
+	table_name: str
+	migration_version: int
+	"""Version of the SQLite migration that creates the index."""
+	sql: str
+
+
+# the non-unique indexes that miruzo/internal/database/sqlite/migrations put on
+# the tables the importer writes; kept idempotent so they can be replayed
+_SECONDARY_INDEXES: tuple[_SecondaryIndex, ...] = (
+	_SecondaryIndex(
+		name='ix_images_latest',
+		table_name='images',
+		migration_version=2,
+		sql='CREATE INDEX IF NOT EXISTS ix_images_latest ON images (ingested_at DESC, ingest_id DESC)',
+	),
+	_SecondaryIndex(
+		name='ix_ingests_chronological',
+		table_name='ingests',
+		migration_version=2,
+		sql='CREATE INDEX IF NOT EXISTS ix_ingests_chronological ON ingests (captured_at DESC, id DESC)',
+	),
+	_SecondaryIndex(
+		name='ix_stats_recently',
+		table_name='stats',
+		migration_version=2,
+		sql=(
+			'CREATE INDEX IF NOT EXISTS ix_stats_recently ON stats (last_viewed_at DESC, ingest_id DESC) '
+			'WHERE last_viewed_at IS NOT NULL'
+		),
+	),
+	_SecondaryIndex(
+		name='ix_stats_first_love',
+		table_name='stats',
+		migration_version=2,
+		sql=(
+			'CREATE INDEX IF NOT EXISTS ix_stats_first_love ON stats (first_loved_at DESC, ingest_id DESC) '
+			'WHERE first_loved_at IS NOT NULL'
+		),
+	),
+	_SecondaryIndex(
+		name='ix_stats_hall_of_fame',
+		table_name='stats',
+		migration_version=2,
+		sql=(
+			'CREATE INDEX IF NOT EXISTS ix_stats_hall_of_fame ON stats (hall_of_fame_at DESC, ingest_id DESC) '
+			'WHERE hall_of_fame_at IS NOT NULL'
+		),
+	),
+	_SecondaryIndex(
+		name='ix_stats_engaged',
+		table_name='stats',
+		migration_version=2,
+		sql=(
+			'CREATE INDEX IF NOT EXISTS ix_stats_engaged ON stats (score_evaluated DESC, ingest_id DESC) '
+			'WHERE hall_of_fame_at IS NULL'
+		),
+	),
+	_SecondaryIndex(
+		name='ix_ingest_executions_status',
+		table_name='ingest_executions',
+		migration_version=4,
+		sql='CREATE INDEX IF NOT EXISTS ix_ingest_executions_status ON ingest_executions (status, executed_at)',
+	),
+	_SecondaryIndex(
+		name='ix_ingest_executions_ingest',
+		table_name='ingest_executions',
+		migration_version=4,
+		sql='CREATE INDEX IF NOT EXISTS ix_ingest_executions_ingest ON ingest_executions (ingest_id, executed_at)',
+	),
+)
+
+_SELECT_INDEX_NAMES_STMT = text("SELECT name FROM sqlite_master WHERE type='index'")
+
+_SELECT_MIGRATIONS_TABLE_STMT = text(
+	"SELECT 1 FROM sqlite_master WHERE type='table' AND name='schema_migrations'",
+)
+
+_SELECT_MIGRATION_VERSION_STMT = text('SELECT version, dirty FROM schema_migrations LIMIT 1')
+
+
+def _read_migration_version(connection: Connection) -> int | None:
+	"""Return the applied golang-migrate version, or None for an unmigrated or dirty schema."""
+
+	if connection.execute(_SELECT_MIGRATIONS_TABLE_STMT).first() is None:
+		return None
+
+	row = connection.execute(_SELECT_MIGRATION_VERSION_STMT).first()
+	if row is None or row.dirty:
+		return None
+	return int(row.version)
+
+
+def restore_secondary_indexes(connection: Connection) -> None:
+	"""
+	Recreate the known secondary indexes the applied migrations define.
+
+	An import killed inside defer_secondary_indexes leaves them dropped, and
+	the migrations do not run again, so this repairs the schema on the next
+	start. Existing indexes are kept; other backends and schemas not managed
+	by the migrations are left alone. The caller commits.
+	"""
+
+	if connection.dialect.name != 'sqlite':
+		return
+
+	version = _read_migration_version(connection)
+	if version is None:
+		return
+
+	for index in _SECONDARY_INDEXES:
+		if index.migration_version <= version:
+			connection.execute(text(index.sql))
+
+
+def checkpoint_wal(session: Session) -> None:
+	"""Copy the WAL back into the database file and truncate it; a no-op on other backends."""
+
+	connection = session.connection()
+	if connection.dialect.name != 'sqlite':
+		return
+
+	connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE);')
+
+
+@contextmanager
+def defer_secondary_indexes(
+	session_factory: Callable[[], Session],
+	tables: Sequence[str],
+) -> Iterator[None]:
+	"""
+	Drop the known secondary indexes of tables for the duration of the block.
+
+	They are rebuilt once the block exits, which is cheaper than maintaining
+	them row by row during a large import. Only indexes listed in
+	_SECONDARY_INDEXES are dropped, so restore_secondary_indexes can bring
+	them back if the process dies before the rebuild. Unique indexes stay,
+	since inserts rely on them to reject duplicates.
+	"""
+
+	indexes: list[_SecondaryIndex] = []
+	with session_factory() as session:
+		if session.connection().dialect.name == 'sqlite':
+			present = set(session.execute(_SELECT_INDEX_NAMES_STMT).scalars())
+			indexes = [
+				index
+				for index in _SECONDARY_INDEXES
+				if index.table_name in tables and index.name in present
+			]
+			for index in indexes:
+				session.execute(text(f'DROP INDEX "{index.name}"'))
+			session.commit()
+
+	if not indexes:
+		yield
+		return
+
+	try:
+		yield
+	finally:
+		with session_factory() as session:
+			for index in indexes:
+				session.execute(text(index.sql))
+			session.commit()
@@ -1,8 +1,10 @@
+from app.databases.tables.executions import _execution_table as execution_table
 from app.databases.tables.images import _image_table as image_table
 from app.databases.tables.ingests import _ingest_table as ingest_table
 from app.databases.tables.stats import _stats_table as stats_table
 
 __all__ = [
+	'execution_table',
 	'image_table',
 	'ingest_table',
 	'stats_table',
@@ -0,0 +1,41 @@
+from sqlalchemy import (
+	CheckConstraint,
+	Column,
+	DateTime,
+	Double,
+	ForeignKey,
+	Table,
+	Text,
+)
+
+from app.databases.metadata import metadata
+from app.databases.tables.ingests import INGEST_ID_TYPE, _ingest_table
+from app.databases.types import LEAST8_INT
+
+# One narrow row per execution. ingests.executions keeps only the latest few
+# as a summary; this log keeps the history with typed phase durations.
+_execution_table = Table(
+	'ingest_executions',
+	metadata,
+	Column('id', INGEST_ID_TYPE, primary_key=True),
+	Column(
+		'ingest_id',
+		ForeignKey(_ingest_table.c.id, ondelete='CASCADE'),
+		nullable=False,
+	),
+	Column(
+		'status',
+		LEAST8_INT,
+		CheckConstraint('status BETWEEN 0 AND 5', 'ck_ingest_executions_status'),
+		nullable=False,
+	),
+	Column('error_type', Text),
+	Column('error_message', Text),
+	Column('executed_at', DateTime, nullable=False),
+	Column('inspect_seconds', Double),
+	Column('collect_seconds', Double),
+	Column('plan_seconds', Double),
+	Column('execute_seconds', Double),
+	Column('store_seconds', Double),
+	Column('overall_seconds', Double),
+)
@@ -3,10 +3,13 @@ from sqlalchemy import (
 	Column,
 	DateTime,
 	ForeignKey,
+	Integer,
+	String,
 	Table,
 	text,
 )
 
+from app.config.constants import DOMINANT_COLOR_MAXIMUM, PLACEHOLDER_MAX_LENGTH
 from app.databases.metadata import metadata
 from app.databases.tables.ingests import _ingest_table
 from app.databases.types import JSON_VALUE, LEAST8_INT
@@ -31,6 +34,15 @@ _image_table = Table(
 	Column('original', JSON_VALUE, nullable=False),
 	Column('fallback', JSON_VALUE),
 	Column('variants', JSON_VALUE, nullable=False),
+	Column('placeholder', String(length=PLACEHOLDER_MAX_LENGTH)),
+	Column(
+		'dominant_color',
+		Integer,
+		CheckConstraint(
+			f'dominant_color BETWEEN 0 AND {DOMINANT_COLOR_MAXIMUM}',
+			'ck_images_dominant_color',
+		),
+	),
 )
 
 # MySQL constraints
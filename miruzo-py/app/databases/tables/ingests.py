@@ -40,6 +40,7 @@ _ingest_table = Table(
 		'relative_path',
 		String(length=255),
 		nullable=False,
+		unique=True,
 	),
 	Column('fingerprint', String(length=64), nullable=False, unique=True),
 	Column('ingested_at', DateTime, nullable=False),
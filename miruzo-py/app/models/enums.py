@@ -27,6 +27,7 @@ class ExecutionStatus(int, Enum):
 	DB_ERROR = 2
 	IO_ERROR = 3
 	IMAGE_ERROR = 4
+	RESOURCE_ERROR = 5
 
 
 @final
@@ -20,3 +20,5 @@ class Image(BaseModel):
 	original: VariantEntry
 	fallback: VariantEntry | None
 	variants: Annotated[Sequence[VariantEntry], Field(min_length=1)]
+	placeholder: Annotated[str | None, Field(max_length=c.PLACEHOLDER_MAX_LENGTH)] = None
+	dominant_color: Annotated[int | None, Field(ge=0, le=c.DOMINANT_COLOR_MAXIMUM)] = None
@@ -1,11 +1,12 @@
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, TypedDict, final
+from typing import Annotated, Literal, TypedDict, final
 
 from annotated_types import Interval, Len
 from pydantic import AfterValidator, BeforeValidator, Field, StrictStr
 
 from app.config import constants as c
 from app.config.constants import MAX_IMAGE_HEIGHT, MAX_IMAGE_WIDTH
+from app.utils.files.content_hash import CONTENT_HASH_LENGTH
 
 OptionalStrictStr = StrictStr | None
 
@@ -38,8 +39,7 @@ class CommitEntry(TypedDict):
 	duration: Annotated[timedelta, Field(ge=0)]
 
 
-@final
-class VariantEntry(TypedDict):
+class _VariantEntryRequired(TypedDict):
 	rel: str
 	layer_id: Annotated[int, Field(ge=0, le=9)]
 	format: Annotated[str, Field(min_length=3, max_length=8)]
@@ -48,3 +48,12 @@ class VariantEntry(TypedDict):
 	width: Annotated[int, Field(ge=1, le=MAX_IMAGE_WIDTH)]
 	height: Annotated[int, Field(ge=1, le=MAX_IMAGE_HEIGHT)]
 	quality: Annotated[int | None, Field(default=None, ge=1, le=100)]
+
+
+# optional keys are declared with total=False; typing.NotRequired needs Python 3.11
+@final
+class VariantEntry(_VariantEntryRequired, total=False):
+	# content hash of the encoded file; absent for records written before it existed
+	hash: Annotated[str, Field(min_length=CONTENT_HASH_LENGTH, max_length=CONTENT_HASH_LENGTH)]
+	# encoder profile name; 'fast' marks a variant for the background optimizer
+	encoder: Literal['fast', 'archival']
@@ -0,0 +1,26 @@
+from typing import Literal, TypeAlias
+
+from app.config.environments import DatabaseBackend, env
+
+BulkLoader: TypeAlias = Literal['copy', 'load_data']
+
+
+def resolve_bulk_loader(bulk_load: bool) -> BulkLoader | None:
+	"""
+	Pick the bulk loader create_many should use on the configured backend.
+
+	Returns:
+		'copy' on PostgreSQL, 'load_data' on MySQL when local infile is
+		enabled, otherwise None for the normal INSERT path.
+	"""
+
+	if not bulk_load:
+		return None
+
+	match env.database_backend:
+		case DatabaseBackend.POSTGRE_SQL:
+			return 'copy'
+		case DatabaseBackend.MYSQL if env.mysql_local_infile:
+			return 'load_data'
+		case _:
+			return None
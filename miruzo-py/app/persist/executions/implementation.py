@@ -0,0 +1,56 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any, final
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.databases.tables import execution_table
+from app.persist.executions.protocol import ExecutionCreateInput, ExecutionRepository
+
+
+def _to_seconds(value: timedelta | None) -> float | None:
+	return value.total_seconds() if value is not None else None
+
+
+@final
+class _ExecutionRepositoryImpl:
+	def __init__(self, session: Session) -> None:
+		self._session = session
+
+	@staticmethod
+	def _to_values(entry: ExecutionCreateInput) -> dict[str, Any]:
+		execution = entry.execution
+		return {
+			'ingest_id': entry.ingest_id,
+			'status': int(execution.status),
+			'error_type': execution.error_type,
+			'error_message': execution.error_message,
+			'executed_at': execution.executed_at,
+			'inspect_seconds': _to_seconds(execution.inspect),
+			'collect_seconds': _to_seconds(execution.collect),
+			'plan_seconds': _to_seconds(execution.plan),
+			'execute_seconds': _to_seconds(execution.execute),
+			'store_seconds': _to_seconds(execution.store),
+			'overall_seconds': _to_seconds(execution.overall),
+		}
+
+	def create_many(self, entries: Sequence[ExecutionCreateInput]) -> None:
+		if not entries:
+			return
+
+		self._session.execute(insert(execution_table), [self._to_values(entry) for entry in entries])
+
+
+def create_execution_repository(session: Session) -> ExecutionRepository:
+	"""
+	Build an execution log repository implementation for the configured backend.
+
+	Args:
+		session: SQLAlchemy session bound to the current database engine.
+
+	Returns:
+		Concrete repository tied to the active backend.
+	"""
+
+	return _ExecutionRepositoryImpl(session)
@@ -0,0 +1,22 @@
+from collections.abc import Sequence
+from typing import Annotated, Protocol, final
+
+from pydantic import BaseModel, Field
+
+from app.config import constants as c
+from app.models.ingest import Execution
+
+
+@final
+class ExecutionCreateInput(BaseModel):
+	ingest_id: Annotated[
+		int,
+		Field(ge=c.INGEST_ID_MINIMUM, le=c.INGEST_ID_MAXIMUM),
+	]
+	execution: Execution
+
+
+class ExecutionRepository(Protocol):
+	def create_many(self, entries: Sequence[ExecutionCreateInput]) -> None:
+		"""Insert one execution log row per entry."""
+		...
@@ -1,32 +1,101 @@
+from collections.abc import Sequence
 from typing import final
 
-from sqlalchemy import insert
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
-from app.databases.tables import image_table
+from app.databases.tables import image_table, ingest_table, stats_table
 from app.models.image import Image
-from app.persist.images.protocol import ImageRepository
+from app.models.types import VariantEntry
+from app.persist.bulk import BulkLoader, resolve_bulk_loader
+from app.persist.images.protocol import ImageRepository, ImageVariantsEntry
+from app.persist.mysql_load import LoadColumns, load_rows
+from app.persist.postgres_copy import CopyColumns, copy_rows
+
+_COPY_COLUMNS: CopyColumns = (
+	('ingest_id', 'int8'),
+	('ingested_at', 'timestamp'),
+	('kind', 'int2'),
+	('original', 'jsonb'),
+	('fallback', 'jsonb'),
+	('variants', 'jsonb'),
+	('placeholder', 'text'),
+	('dominant_color', 'int4'),
+)
+
+_LOAD_COLUMNS: LoadColumns = (
+	('ingest_id', 'int'),
+	('ingested_at', 'datetime'),
+	('kind', 'int'),
+	('original', 'json'),
+	('fallback', 'json'),
+	('variants', 'json'),
+	('placeholder', 'text'),
+	('dominant_color', 'int'),
+)
 
 
 @final
 class _ImageRepositoryImpl:
-	def __init__(self, session: Session) -> None:
+	def __init__(self, session: Session, *, bulk_loader: BulkLoader | None = None) -> None:
 		self._session = session
+		self._bulk_loader = bulk_loader
 
 	def create(self, entry: Image) -> None:
 		stmt = insert(image_table).values(**entry.model_dump())
 		self._session.execute(stmt)
 
+	def create_many(self, entries: Sequence[Image]) -> None:
+		if not entries:
+			return
+
+		match self._bulk_loader:
+			case 'copy':
+				copy_rows(self._session, 'images', _COPY_COLUMNS, (entry.model_dump() for entry in entries))
+			case 'load_data':
+				load_rows(self._session, 'images', _LOAD_COLUMNS, (entry.model_dump() for entry in entries))
+			case None:
+				self._session.execute(insert(image_table), [entry.model_dump() for entry in entries])
+			case _:
+				raise ValueError(f'Unsupported bulk loader: {self._bulk_loader}')
+
+	def list_by_score(self, *, limit: int, offset: int = 0) -> Sequence[ImageVariantsEntry]:
+		stmt = (
+			select(
+				image_table.c.ingest_id,
+				ingest_table.c.relative_path,
+				image_table.c.kind,
+				image_table.c.variants,
+			)
+			.join(ingest_table, ingest_table.c.id == image_table.c.ingest_id)
+			.join(stats_table, stats_table.c.ingest_id == image_table.c.ingest_id)
+			.order_by(stats_table.c.score.desc(), image_table.c.ingest_id.desc())
+			.limit(limit)
+			.offset(offset)
+		)
+		rows = self._session.execute(stmt).mappings()
+		return [ImageVariantsEntry.model_validate(dict(row)) for row in rows]
+
+	def update_variants(self, ingest_id: int, variants: Sequence[VariantEntry]) -> None:
+		stmt = (
+			update(image_table).where(image_table.c.ingest_id == ingest_id).values(variants=list(variants))
+		)
+		self._session.execute(stmt)
+
 
-def create_image_repository(session: Session) -> ImageRepository:
+def create_image_repository(session: Session, *, bulk_load: bool = False) -> ImageRepository:
 	"""
 	Build an image repository implementation for the configured backend.
 
 	Args:
 		session: SQLAlchemy session bound to the current database engine.
+		bulk_load: Prefer the backend's bulk loader for create_many, if it has one.
 
 	Returns:
 		Concrete repository tied to the active backend.
 	"""
 
-	return _ImageRepositoryImpl(session)
+	return _ImageRepositoryImpl(
+		session,
+		bulk_loader=resolve_bulk_loader(bulk_load),
+	)
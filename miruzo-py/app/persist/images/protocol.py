@@ -1,7 +1,26 @@
-from typing import Protocol
+from collections.abc import Sequence
+from typing import Protocol, final
 
+from pydantic import BaseModel
+
+from app.models.enums import ImageKind
 from app.models.image import Image
+from app.models.types import IngestIdType, VariantEntry
+
+
+@final
+class ImageVariantsEntry(BaseModel):
+	ingest_id: IngestIdType
+	relative_path: str
+	kind: ImageKind
+	variants: Sequence[VariantEntry]
 
 
 class ImageRepository(Protocol):
 	def create(self, entry: Image) -> None: ...
+
+	def create_many(self, entries: Sequence[Image]) -> None: ...
+
+	def list_by_score(self, *, limit: int, offset: int = 0) -> Sequence[ImageVariantsEntry]: ...
+
+	def update_variants(self, ingest_id: int, variants: Sequence[VariantEntry]) -> None: ...
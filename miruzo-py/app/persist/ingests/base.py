@@ -1,29 +1,167 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
 from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.databases.tables import ingest_table
 from app.models.enums import ExecutionStatus, ProcessStatus
 from app.models.ingest import Execution, executions_adapter
-from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput
+from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput, IngestCreateResult
 
 _EXECUTIONS_SELECT_STATEMENT = select(ingest_table.c.executions).where(
 	ingest_table.c.id == bindparam('ingest_id'),
 )
 
 
-class _IngestRepositoryBaseImpl:
+def _split_unique_ingests(
+	entries: Sequence[IngestAppendExecutionInput],
+) -> list[list[IngestAppendExecutionInput]]:
+	"""
+	Split entries into rounds that touch each ingest at most once.
+
+	A set-based UPDATE applies only one joined row per target row, so repeated
+	ingests go to later rounds, which keeps their order.
+	"""
+
+	rounds: list[list[IngestAppendExecutionInput]] = []
+	counts: dict[int, int] = {}
+	for entry in entries:
+		index = counts.get(entry.ingest_id, 0)
+		counts[entry.ingest_id] = index + 1
+		if index == len(rounds):
+			rounds.append([])
+		rounds[index].append(entry)
+	return rounds
+
+
+def _format_datetime(value: datetime) -> str:
+	"""Format a datetime the way naive DATETIME values are stored by SQLite and MySQL."""
+
+	return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+class _IngestRepositoryBaseImpl(ABC):
 	def __init__(self, session: Session, *, max_executions: int) -> None:
 		self._session = session
 		self._max_executions = max_executions
 
+	@staticmethod
+	def _to_values(entry: IngestCreateInput) -> dict[str, Any]:
+		# every row carries the same keys so executemany can batch them
+		execution = entry.execution
+		executions = [execution] if execution is not None else []
+		finished = execution is not None and execution.status == ExecutionStatus.SUCCESS
+		return {
+			**entry.model_dump(exclude={'execution'}),
+			'process': int(ProcessStatus.FINISHED if finished else ProcessStatus.PROCESSING),
+			'updated_at': entry.ingested_at,
+			'executions': executions_adapter.dump_python(executions, mode='json'),
+		}
+
 	def create(self, entry: IngestCreateInput) -> int:
-		stmt = insert(ingest_table).values(
-			**entry.model_dump(),
-			updated_at=entry.ingested_at,
-		)
+		stmt = insert(ingest_table).values(**self._to_values(entry))
 		row_id = self._session.execute(stmt).inserted_primary_key[0]  # pyright: ignore[reportAttributeAccessIssue]
 		return row_id
 
+	def create_many(self, entries: Sequence[IngestCreateInput]) -> Sequence[int]:
+		if not entries:
+			return []
+
+		# insertmanyvalues batches the rows into multi-row INSERT .. RETURNING
+		# statements; asking for ordered rows would fall back to one statement
+		# per row without a sentinel column, so map the ids by fingerprint instead
+		stmt = insert(ingest_table).returning(ingest_table.c.fingerprint, ingest_table.c.id)
+		rows = self._session.execute(stmt, [self._to_values(entry) for entry in entries])
+		ids: dict[str, int] = dict(rows.tuples().all())
+		return [ids[entry.fingerprint] for entry in entries]
+
+	@abstractmethod
+	def _insert_if_absent(self, values: Sequence[dict[str, Any]]) -> dict[str, int]:
+		"""Insert rows, skipping fingerprint conflicts; return the new ids by fingerprint."""
+
+	def _create_many_or_none(self, entries: Sequence[IngestCreateInput]) -> list[IngestCreateResult] | None:
+		"""
+		Insert entries through create_many inside a savepoint.
+
+		Callers filter out stored fingerprints beforehand, so this usually
+		succeeds and keeps the backend's bulk loader. Returns None when an
+		entry conflicts, e.g. with a row of a concurrent importer; the
+		savepoint is rolled back then.
+		"""
+
+		if len({entry.fingerprint for entry in entries}) != len(entries):
+			return None
+
+		try:
+			with self._session.begin_nested():
+				ingest_ids = self.create_many(entries)
+		except IntegrityError:
+			return None
+
+		return [
+			IngestCreateResult(id=ingest_id, relative_path=entry.relative_path, created=True)
+			for ingest_id, entry in zip(ingest_ids, entries, strict=True)
+		]
+
+	def create_many_if_absent(self, entries: Sequence[IngestCreateInput]) -> Sequence[IngestCreateResult]:
+		if not entries:
+			return []
+
+		first_entries: dict[str, IngestCreateInput] = {}
+		for entry in entries:
+			first_entries.setdefault(entry.fingerprint, entry)
+
+		created = self._insert_if_absent([self._to_values(entry) for entry in first_entries.values()])
+
+		known = {
+			fingerprint: (ingest_id, first_entries[fingerprint].relative_path)
+			for fingerprint, ingest_id in created.items()
+		}
+		missing = [fingerprint for fingerprint in first_entries if fingerprint not in created]
+		if missing:
+			rows = self._session.execute(
+				select(
+					ingest_table.c.fingerprint,
+					ingest_table.c.id,
+					ingest_table.c.relative_path,
+				).where(ingest_table.c.fingerprint.in_(missing)),
+			)
+			known.update((fingerprint, (ingest_id, path)) for fingerprint, ingest_id, path in rows.tuples())
+
+		results: list[IngestCreateResult] = []
+		for entry in entries:
+			row = known.get(entry.fingerprint)
+			if row is None:
+				# skipped on another unique key, e.g. relative_path
+				raise IntegrityError(
+					'INSERT INTO ingests',
+					None,
+					ValueError(f'ingest {entry.relative_path} conflicts with a row of another fingerprint'),
+				)
+
+			ingest_id, relative_path = row
+			results.append(
+				IngestCreateResult(
+					id=ingest_id,
+					relative_path=relative_path,
+					created=entry is first_entries[entry.fingerprint] and entry.fingerprint in created,
+				),
+			)
+		return results
+
+	def find_existing_fingerprints(self, fingerprints: Sequence[str]) -> set[str]:
+		if not fingerprints:
+			return set()
+
+		rows = self._session.execute(
+			select(ingest_table.c.fingerprint).where(ingest_table.c.fingerprint.in_(set(fingerprints))),
+		)
+		return set(rows.scalars().all())
+
 	def append_execution(self, entry: IngestAppendExecutionInput) -> None:
 		executions_row = self._session.execute(
 			_EXECUTIONS_SELECT_STATEMENT,
@@ -47,3 +185,7 @@ class _IngestRepositoryBaseImpl:
 
 		stmt = update(ingest_table).where(ingest_table.c.id == entry.ingest_id).values(**values)
 		self._session.execute(stmt)
+
+	def append_executions(self, entries: Sequence[IngestAppendExecutionInput]) -> None:
+		for entry in entries:
+			self.append_execution(entry)
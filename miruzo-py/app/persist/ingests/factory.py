@@ -2,40 +2,70 @@ from sqlalchemy.orm import Session
 
 from app.config.environments import DatabaseBackend, env
 from app.models.ingest import MAX_EXECUTIONS
-from app.persist.ingests.base import _IngestRepositoryBaseImpl
 from app.persist.ingests.protocol import IngestRepository
 
 
-def _create_ingest_repository_from_backend(
+def create_ingest_repository_from_backend(
 	session: Session,
 	*,
 	backend: DatabaseBackend,
 	max_executions: int,
+	bulk_load: bool = False,
+	local_infile: bool = False,
 ) -> IngestRepository:
+	"""
+	Build a ingest repository implementation for an explicit backend.
+
+	Args:
+		session: SQLAlchemy session bound to an engine of that backend.
+		backend: Database backend the session talks to.
+		max_executions: Upper bound of recorded executions per ingest.
+		bulk_load: Prefer the backend's bulk loader for create_many, if it has one.
+		local_infile: Whether MySQL may use LOAD DATA LOCAL INFILE.
+
+	Returns:
+		Concrete repository for the given backend.
+
+	Raises:
+		ValueError: if the backend is unsupported.
+	"""
+
 	match backend:
 		case DatabaseBackend.MYSQL:
 			from app.persist.ingests.mysql import _IngestRepositoryMySQLImpl
 
-			return _IngestRepositoryMySQLImpl(session, max_executions=max_executions)
+			return _IngestRepositoryMySQLImpl(
+				session,
+				max_executions=max_executions,
+				bulk_load=bulk_load,
+				local_infile=local_infile,
+			)
 
 		case DatabaseBackend.POSTGRE_SQL:
 			from app.persist.ingests.postgres import _IngestRepositoryPostgreSQLImpl
 
-			return _IngestRepositoryPostgreSQLImpl(session, max_executions=max_executions)
+			return _IngestRepositoryPostgreSQLImpl(
+				session,
+				max_executions=max_executions,
+				bulk_load=bulk_load,
+			)
 
 		case DatabaseBackend.SQLITE:
-			return _IngestRepositoryBaseImpl(session, max_executions=max_executions)
+			from app.persist.ingests.sqlite import _IngestRepositorySQLiteImpl
+
+			return _IngestRepositorySQLiteImpl(session, max_executions=max_executions)
 
 		case _:
 			raise ValueError(f'Unsupported database type: {backend}')
 
 
-def create_ingest_repository(session: Session) -> IngestRepository:
+def create_ingest_repository(session: Session, *, bulk_load: bool = False) -> IngestRepository:
 	"""
 	Build a ingest repository implementation for the configured backend.
 
 	Args:
 		session: SQLAlchemy session bound to the current database engine.
+		bulk_load: Prefer the backend's bulk loader for create_many, if it has one.
 
 	Returns:
 		Concrete repository tied to the active backend.
@@ -44,8 +74,10 @@ def create_ingest_repository(session: Session) -> IngestRepository:
 		ValueError: if the configured backend is unsupported.
 	"""
 
-	return _create_ingest_repository_from_backend(
+	return create_ingest_repository_from_backend(
 		session,
 		backend=env.database_backend,
 		max_executions=MAX_EXECUTIONS,
+		bulk_load=bulk_load,
+		local_infile=env.mysql_local_infile,
 	)
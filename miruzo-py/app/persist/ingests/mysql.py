@@ -1,11 +1,17 @@
-from typing import final
+import json
+from collections.abc import Sequence
+from typing import Any, final
 
-from sqlalchemy import JSON, BigInteger, DateTime, Integer, bindparam, text
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, bindparam, insert, select, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
 
+from app.databases.tables import ingest_table
 from app.models.enums import ExecutionStatus
-from app.persist.ingests.base import _IngestRepositoryBaseImpl
-from app.persist.ingests.protocol import IngestAppendExecutionInput
+from app.persist.ingests.base import _format_datetime, _IngestRepositoryBaseImpl, _split_unique_ingests
+from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput, IngestCreateResult
+from app.persist.mysql_load import LoadColumns, load_rows
 
 # keep latest non-success executions, restore chronological order,
 # then append new success execution
@@ -65,8 +71,174 @@ _APPEND_ERROR_STMT = text(
 )
 
 
+# same rules for many ingests at once: a success drops prior successes,
+# an error keeps them; entries hold at most one row per ingest
+_APPEND_MANY_STMT = text(
+	"""
+	UPDATE ingests
+	JOIN JSON_TABLE(CAST(:entries AS JSON), '$[*]' COLUMNS(
+		ingest_id BIGINT UNSIGNED PATH '$.ingest_id',
+		updated_at DATETIME(6) PATH '$.updated_at',
+		execution JSON PATH '$.execution',
+		status INT PATH '$.execution.status'
+	))e ON ingests.id=e.ingest_id
+	SET
+		ingests.process=CASE WHEN e.status=0 THEN 1 ELSE ingests.process END,
+		ingests.updated_at=e.updated_at,
+		ingests.executions=CASE
+			WHEN e.status=0 THEN JSON_ARRAY_APPEND(
+				COALESCE(
+					(
+						SELECT CAST(CONCAT(
+							'[', GROUP_CONCAT(CAST(v AS CHAR)ORDER BY i SEPARATOR ','), ']'
+						)AS JSON)
+						FROM(
+							SELECT v, i
+							FROM JSON_TABLE(ingests.executions, '$[*]' COLUMNS(
+								i FOR ORDINALITY,
+								v JSON PATH '$',
+								status INT PATH '$.status'
+							))j
+							WHERE status<>0
+							ORDER BY i DESC
+							LIMIT :max_retained_executions
+						)l
+					),
+					JSON_ARRAY()
+				),
+				'$',
+				e.execution
+			)
+			ELSE JSON_EXTRACT(
+				JSON_ARRAY_APPEND(ingests.executions,'$',e.execution),
+				CONCAT('$[last-',:max_retained_executions,' to last]')
+			)
+		END
+	""",
+).bindparams(
+	bindparam('entries', type_=String),
+	bindparam('max_retained_executions', type_=Integer),
+)
+
+
+_AUTOINC_SETTINGS_STMT = text('SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment')
+
+# "traditional" and "consecutive" give every simple multi-row INSERT one
+# contiguous block of ids; "interleaved" (2, the 8.0 default) does not
+_CONTIGUOUS_AUTOINC_LOCK_MODES = (0, 1)
+
+# rows per multi-row INSERT; keeps statements well under max_allowed_packet
+_MULTI_ROW_CHUNK_SIZE = 500
+
+_LOAD_COLUMNS: LoadColumns = (
+	('process', 'int'),
+	('relative_path', 'text'),
+	('fingerprint', 'text'),
+	('ingested_at', 'datetime'),
+	('captured_at', 'datetime'),
+	('updated_at', 'datetime'),
+	('executions', 'json'),
+)
+
+
 @final
 class _IngestRepositoryMySQLImpl(_IngestRepositoryBaseImpl):
+	def __init__(
+		self,
+		session: Session,
+		*,
+		max_executions: int,
+		bulk_load: bool = False,
+		local_infile: bool = False,
+	) -> None:
+		super().__init__(session, max_executions=max_executions)
+		self._bulk_load = bulk_load
+		self._local_infile = local_infile
+		self._autoinc_step: int | None = None
+
+	def create_many(self, entries: Sequence[IngestCreateInput]) -> Sequence[int]:
+		if not entries:
+			return []
+
+		if self._bulk_load and self._local_infile:
+			load_rows(self._session, 'ingests', _LOAD_COLUMNS, map(self._to_values, entries))
+			return self._select_ids(entries)
+
+		if self._bulk_load:
+			step = self._contiguous_autoinc_step()
+			if step is not None:
+				return self._insert_contiguous(entries, step=step)
+
+		# MySQL has no RETURNING; insert with one executemany and read the ids
+		# back through the unique fingerprints
+		self._session.execute(insert(ingest_table), [self._to_values(entry) for entry in entries])
+		return self._select_ids(entries)
+
+	def create_many_if_absent(self, entries: Sequence[IngestCreateInput]) -> Sequence[IngestCreateResult]:
+		if self._bulk_load and entries:
+			results = self._create_many_or_none(entries)
+			if results is not None:
+				return results
+
+		return super().create_many_if_absent(entries)
+
+	def _insert_if_absent(self, values: Sequence[dict[str, Any]]) -> dict[str, int]:
+		fingerprints = [value['fingerprint'] for value in values]
+		# the shared lock also covers the gaps, so a concurrent importer cannot
+		# insert one of the absent fingerprints before this transaction does
+		present = set(
+			self._session.execute(
+				select(ingest_table.c.fingerprint)
+				.where(ingest_table.c.fingerprint.in_(fingerprints))
+				.with_for_update(read=True),
+			).scalars(),
+		)
+
+		absent = [value for value in values if value['fingerprint'] not in present]
+		if not absent:
+			return {}
+
+		# a no-op update instead of INSERT IGNORE, which would also swallow
+		# data errors; a row skipped on relative_path has no id below
+		stmt = mysql_insert(ingest_table).on_duplicate_key_update(id=ingest_table.c.id)
+		self._session.execute(stmt, absent)
+
+		rows = self._session.execute(
+			select(ingest_table.c.fingerprint, ingest_table.c.id).where(
+				ingest_table.c.fingerprint.in_([value['fingerprint'] for value in absent]),
+			),
+		)
+		return dict(rows.tuples().all())
+
+	def _select_ids(self, entries: Sequence[IngestCreateInput]) -> list[int]:
+		fingerprints = [entry.fingerprint for entry in entries]
+		rows = self._session.execute(
+			select(ingest_table.c.fingerprint, ingest_table.c.id).where(
+				ingest_table.c.fingerprint.in_(fingerprints),
+			),
+		)
+		ids: dict[str, int] = dict(rows.tuples().all())
+		return [ids[fingerprint] for fingerprint in fingerprints]
+
+	def _contiguous_autoinc_step(self) -> int | None:
+		"""Return auto_increment_increment when multi-row ids are contiguous, else None."""
+
+		if self._autoinc_step is None:
+			lock_mode, increment = self._session.execute(_AUTOINC_SETTINGS_STMT).one()
+			self._autoinc_step = int(increment) if int(lock_mode) in _CONTIGUOUS_AUTOINC_LOCK_MODES else 0
+
+		return self._autoinc_step or None
+
+	def _insert_contiguous(self, entries: Sequence[IngestCreateInput], *, step: int) -> list[int]:
+		ids: list[int] = []
+		for start in range(0, len(entries), _MULTI_ROW_CHUNK_SIZE):
+			chunk = entries[start : start + _MULTI_ROW_CHUNK_SIZE]
+			stmt = insert(ingest_table).values([self._to_values(entry) for entry in chunk])
+			# LAST_INSERT_ID() is the first id of the block
+			first_id = self._session.execute(stmt).lastrowid  # pyright: ignore[reportAttributeAccessIssue]
+			ids.extend(first_id + index * step for index in range(len(chunk)))
+		return ids
+
 	def append_execution(self, entry: IngestAppendExecutionInput) -> None:
 		params = {
 			'ingest_id': entry.ingest_id,
@@ -81,3 +253,24 @@ class _IngestRepositoryMySQLImpl(_IngestRepositoryBaseImpl):
 
 		if result.rowcount != 1:  # pyright: ignore[reportAttributeAccessIssue]
 			raise NoResultFound('No row was found when one was required')
+
+	def append_executions(self, entries: Sequence[IngestAppendExecutionInput]) -> None:
+		for entries_round in _split_unique_ingests(entries):
+			payload = [
+				{
+					'ingest_id': entry.ingest_id,
+					'updated_at': _format_datetime(entry.updated_at),
+					'execution': entry.execution.model_dump(mode='json'),
+				}
+				for entry in entries_round
+			]
+			result = self._session.execute(
+				_APPEND_MANY_STMT,
+				{
+					'entries': json.dumps(payload),
+					'max_retained_executions': self._max_executions - 1,
+				},
+			)
+
+			if result.rowcount != len(entries_round):  # pyright: ignore[reportAttributeAccessIssue]
+				raise NoResultFound('No row was found when one was required')
@@ -1,13 +1,17 @@
-from typing import final
+from collections.abc import Sequence
+from typing import Any, final
 
-from sqlalchemy import BigInteger, DateTime, Integer, bindparam, insert, text
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy import BigInteger, DateTime, Integer, Text, bindparam, insert, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm import Session
 
 from app.databases.tables import ingest_table
 from app.models.enums import ExecutionStatus
-from app.persist.ingests.base import _IngestRepositoryBaseImpl
-from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput
+from app.persist.ingests.base import _IngestRepositoryBaseImpl, _split_unique_ingests
+from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput, IngestCreateResult
+from app.persist.postgres_copy import CopyColumns, copy_rows
 
 # keep latest non-success executions, restore chronological order,
 # then append new success execution
@@ -61,20 +65,122 @@ _APPEND_ERROR_STMT = text(
 )
 
 
+# same rules for many ingests at once: a success drops prior successes,
+# an error keeps them; the arrays hold at most one row per ingest
+_APPEND_MANY_STMT = text(
+	"""
+	UPDATE ingests
+	SET
+		process=CASE WHEN e.status=0 THEN 1 ELSE ingests.process END,
+		updated_at=e.updated_at,
+		executions=(
+			SELECT jsonb_agg(v ORDER BY i)
+			FROM(
+				SELECT v, i
+				FROM(
+					SELECT v, i
+					FROM jsonb_array_elements(ingests.executions) WITH ORDINALITY AS t(v, i)
+					WHERE e.status<>0 OR(v->>'status')::int<>0
+					ORDER BY i DESC
+					LIMIT :max_retained_executions
+				)l
+				UNION ALL
+				SELECT e.execution, 2147483647
+			)m
+		)
+	FROM(
+		SELECT ingest_id, updated_at, execution, (execution->>'status')::int AS status
+		FROM unnest(
+			CAST(:ingest_ids AS bigint[]),
+			CAST(:updated_ats AS timestamp[]),
+			CAST(:executions AS jsonb[])
+		)AS u(ingest_id, updated_at, execution)
+	)e
+	WHERE ingests.id=e.ingest_id
+	""",
+).bindparams(
+	bindparam('ingest_ids', type_=ARRAY(BigInteger)),
+	bindparam('updated_ats', type_=ARRAY(DateTime)),
+	bindparam('executions', type_=ARRAY(Text)),
+	bindparam('max_retained_executions', type_=Integer),
+)
+
+
+# reserve a block of ids so COPY can write them directly
+_ALLOCATE_IDS_STMT = text(
+	"""
+	SELECT nextval(pg_get_serial_sequence('ingests','id'))
+	FROM generate_series(1,:count)
+	""",
+).bindparams(
+	bindparam('count', type_=Integer),
+)
+
+_COPY_COLUMNS: CopyColumns = (
+	('id', 'int8'),
+	('process', 'int2'),
+	('relative_path', 'text'),
+	('fingerprint', 'text'),
+	('ingested_at', 'timestamp'),
+	('captured_at', 'timestamp'),
+	('updated_at', 'timestamp'),
+	('executions', 'jsonb'),
+)
+
+
 @final
 class _IngestRepositoryPostgreSQLImpl(_IngestRepositoryBaseImpl):
+	def __init__(self, session: Session, *, max_executions: int, bulk_load: bool = False) -> None:
+		super().__init__(session, max_executions=max_executions)
+		self._bulk_load = bulk_load
+
 	def create(self, entry: IngestCreateInput) -> int:
-		stmt = (
-			insert(ingest_table)
-			.values(
-				**entry.model_dump(),
-				updated_at=entry.ingested_at,
-			)
-			.returning(ingest_table.c.id)
-		)
+		stmt = insert(ingest_table).values(**self._to_values(entry)).returning(ingest_table.c.id)
 		row_id = self._session.execute(stmt).scalar_one()
 		return row_id
 
+	def create_many(self, entries: Sequence[IngestCreateInput]) -> Sequence[int]:
+		if not self._bulk_load or not entries:
+			return super().create_many(entries)
+
+		try:
+			with self._session.begin_nested():
+				return self._copy_many(entries)
+		except IntegrityError:
+			# COPY rejects the whole batch on a conflict; let the normal
+			# insert path handle it row-aware
+			return super().create_many(entries)
+
+	def create_many_if_absent(self, entries: Sequence[IngestCreateInput]) -> Sequence[IngestCreateResult]:
+		if self._bulk_load and entries:
+			results = self._create_many_or_none(entries)
+			if results is not None:
+				return results
+
+		return super().create_many_if_absent(entries)
+
+	def _insert_if_absent(self, values: Sequence[dict[str, Any]]) -> dict[str, int]:
+		# RETURNING only yields the rows that were actually inserted
+		stmt = (
+			postgres_insert(ingest_table)
+			.on_conflict_do_nothing(index_elements=[ingest_table.c.fingerprint])
+			.returning(ingest_table.c.fingerprint, ingest_table.c.id)
+		)
+		return dict(self._session.execute(stmt, list(values)).tuples().all())
+
+	def _copy_many(self, entries: Sequence[IngestCreateInput]) -> list[int]:
+		ingest_ids = list(self._session.execute(_ALLOCATE_IDS_STMT, {'count': len(entries)}).scalars())
+		copy_rows(
+			self._session,
+			'ingests',
+			_COPY_COLUMNS,
+			(
+				{**self._to_values(entry), 'id': ingest_id}
+				for ingest_id, entry in zip(ingest_ids, entries, strict=True)
+			),
+		)
+		return ingest_ids
+
 	def append_execution(self, entry: IngestAppendExecutionInput) -> None:
 		params = {
 			'ingest_id': entry.ingest_id,
@@ -89,3 +195,18 @@ class _IngestRepositoryPostgreSQLImpl(_IngestRepositoryBaseImpl):
 
 		if result.rowcount != 1:  # pyright: ignore[reportAttributeAccessIssue]
 			raise NoResultFound('No row was found when one was required')
+
+	def append_executions(self, entries: Sequence[IngestAppendExecutionInput]) -> None:
+		for entries_round in _split_unique_ingests(entries):
+			result = self._session.execute(
+				_APPEND_MANY_STMT,
+				{
+					'ingest_ids': [entry.ingest_id for entry in entries_round],
+					'updated_ats': [entry.updated_at for entry in entries_round],
+					'executions': [entry.execution.model_dump_json() for entry in entries_round],
+					'max_retained_executions': self._max_executions - 1,
+				},
+			)
+
+			if result.rowcount != len(entries_round):  # pyright: ignore[reportAttributeAccessIssue]
+				raise NoResultFound('No row was found when one was required')
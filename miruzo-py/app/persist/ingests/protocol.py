@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Annotated, Protocol, final
 
@@ -14,6 +15,8 @@ class IngestCreateInput(BaseModel):
 	fingerprint: Annotated[str, Field(min_length=64, max_length=64)]
 	ingested_at: datetime
 	captured_at: datetime
+	execution: Execution | None = None
+	"""First execution, written with the row instead of appended afterwards."""
 
 
 @final
@@ -26,11 +29,44 @@ class IngestAppendExecutionInput(BaseModel):
 	execution: Execution
 
 
+@final
+class IngestCreateResult(BaseModel):
+	id: Annotated[
+		int,
+		Field(ge=c.INGEST_ID_MINIMUM, le=c.INGEST_ID_MAXIMUM),
+	]
+	relative_path: RelativePathType
+	"""Path stored in the row, which differs from the input when it already existed."""
+	created: bool
+	"""False when a row with the same fingerprint was already present."""
+
+
 class IngestRepository(Protocol):
 	def create(self, entry: IngestCreateInput) -> int:
 		"""Insert a new ingest row."""
 		...
 
+	def create_many(self, entries: Sequence[IngestCreateInput]) -> Sequence[int]:
+		"""Insert several ingest rows at once, returning their ids in input order."""
+		...
+
+	def create_many_if_absent(self, entries: Sequence[IngestCreateInput]) -> Sequence[IngestCreateResult]:
+		"""
+		Insert the ingest rows whose fingerprint is not stored yet, in input order.
+
+		Rows that already exist, or repeat an earlier entry, are reported with
+		created=False instead of raising.
+		"""
+		...
+
+	def find_existing_fingerprints(self, fingerprints: Sequence[str]) -> set[str]:
+		"""Return the given fingerprints that already have an ingest row."""
+		...
+
 	def append_execution(self, entry: IngestAppendExecutionInput) -> None:
 		"""Append an execution entry to an existing ingest row."""
 		...
+
+	def append_executions(self, entries: Sequence[IngestAppendExecutionInput]) -> None:
+		"""Append execution entries to many ingest rows, in input order per ingest."""
+		...
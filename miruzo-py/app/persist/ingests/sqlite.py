@@ -0,0 +1,169 @@
+import json
+from collections.abc import Sequence
+from typing import Any, final
+
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, bindparam, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import NoResultFound
+
+from app.databases.tables import ingest_table
+from app.models.enums import ExecutionStatus
+from app.persist.ingests.base import _format_datetime, _IngestRepositoryBaseImpl, _split_unique_ingests
+from app.persist.ingests.protocol import IngestAppendExecutionInput
+
+# keep latest non-success executions, restore chronological order,
+# then append new success execution
+_APPEND_SUCCESS_STMT = text(
+	"""
+	UPDATE ingests
+	SET
+		process=1,
+		updated_at=:updated_at,
+		executions=json_insert(
+			(
+				SELECT json_group_array(json(value))
+				FROM(
+					SELECT key, value
+					FROM(
+						SELECT key, value
+						FROM json_each(ingests.executions)
+						WHERE json_extract(value,'$.status')<>0
+						ORDER BY key DESC
+						LIMIT :max_retained_executions
+					)
+					ORDER BY key
+				)
+			),
+			'$[#]',
+			json(:execution)
+		)
+	WHERE id=:ingest_id
+	""",
+).bindparams(
+	bindparam('updated_at', type_=DateTime),
+	bindparam('ingest_id', type_=BigInteger),
+	bindparam('execution', type_=JSON),
+	bindparam('max_retained_executions', type_=Integer),
+)
+
+# keep the latest retained executions, then append new error execution
+_APPEND_ERROR_STMT = text(
+	"""
+	UPDATE ingests
+	SET
+		updated_at=:updated_at,
+		executions=json_insert(
+			(
+				SELECT json_group_array(json(value))
+				FROM(
+					SELECT key, value
+					FROM(
+						SELECT key, value
+						FROM json_each(ingests.executions)
+						ORDER BY key DESC
+						LIMIT :max_retained_executions
+					)
+					ORDER BY key
+				)
+			),
+			'$[#]',
+			json(:execution)
+		)
+	WHERE id=:ingest_id
+	""",
+).bindparams(
+	bindparam('updated_at', type_=DateTime),
+	bindparam('ingest_id', type_=BigInteger),
+	bindparam('execution', type_=JSON),
+	bindparam('max_retained_executions', type_=Integer),
+)
+
+
+# same rules for many ingests at once: a success drops prior successes,
+# an error keeps them; entries hold at most one row per ingest
+_APPEND_MANY_STMT = text(
+	"""
+	UPDATE ingests
+	SET
+		process=CASE WHEN e.status=0 THEN 1 ELSE ingests.process END,
+		updated_at=e.updated_at,
+		executions=json_insert(
+			(
+				SELECT json_group_array(json(value))
+				FROM(
+					SELECT key, value
+					FROM(
+						SELECT key, value
+						FROM json_each(ingests.executions)
+						WHERE e.status<>0 OR json_extract(value,'$.status')<>0
+						ORDER BY key DESC
+						LIMIT :max_retained_executions
+					)
+					ORDER BY key
+				)
+			),
+			'$[#]',
+			json(e.execution)
+		)
+	FROM(
+		SELECT
+			json_extract(value,'$.ingest_id') AS ingest_id,
+			json_extract(value,'$.updated_at') AS updated_at,
+			json_extract(value,'$.execution') AS execution,
+			json_extract(value,'$.execution.status') AS status
+		FROM json_each(:entries)
+	)e
+	WHERE ingests.id=e.ingest_id
+	""",
+).bindparams(
+	bindparam('entries', type_=String),
+	bindparam('max_retained_executions', type_=Integer),
+)
+
+
+@final
+class _IngestRepositorySQLiteImpl(_IngestRepositoryBaseImpl):
+	def _insert_if_absent(self, values: Sequence[dict[str, Any]]) -> dict[str, int]:
+		# RETURNING only yields the rows that were actually inserted
+		stmt = (
+			sqlite_insert(ingest_table)
+			.on_conflict_do_nothing(index_elements=[ingest_table.c.fingerprint])
+			.returning(ingest_table.c.fingerprint, ingest_table.c.id)
+		)
+		return dict(self._session.execute(stmt, list(values)).tuples().all())
+
+	def append_execution(self, entry: IngestAppendExecutionInput) -> None:
+		params = {
+			'ingest_id': entry.ingest_id,
+			'updated_at': entry.updated_at,
+			'execution': entry.execution.model_dump(mode='json'),
+			'max_retained_executions': self._max_executions - 1,
+		}
+		if entry.execution.status == ExecutionStatus.SUCCESS:
+			result = self._session.execute(_APPEND_SUCCESS_STMT, params)
+		else:
+			result = self._session.execute(_APPEND_ERROR_STMT, params)
+
+		if result.rowcount != 1:  # pyright: ignore[reportAttributeAccessIssue]
+			raise NoResultFound('No row was found when one was required')
+
+	def append_executions(self, entries: Sequence[IngestAppendExecutionInput]) -> None:
+		for entries_round in _split_unique_ingests(entries):
+			payload = [
+				{
+					'ingest_id': entry.ingest_id,
+					'updated_at': _format_datetime(entry.updated_at),
+					'execution': entry.execution.model_dump(mode='json'),
+				}
+				for entry in entries_round
+			]
+			result = self._session.execute(
+				_APPEND_MANY_STMT,
+				{
+					'entries': json.dumps(payload),
+					'max_retained_executions': self._max_executions - 1,
+				},
+			)
+
+			if result.rowcount != len(entries_round):  # pyright: ignore[reportAttributeAccessIssue]
+				raise NoResultFound('No row was found when one was required')
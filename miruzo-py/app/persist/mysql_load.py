@@ -0,0 +1,99 @@
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import timezone
+from tempfile import NamedTemporaryFile
+from typing import Any, Literal, TypeAlias
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+LoadColumnKind: TypeAlias = Literal['int', 'text', 'datetime', 'json']
+
+LoadColumns: TypeAlias = Sequence[tuple[str, LoadColumnKind]]
+"""Column names paired with how their values are written to the load file."""
+
+_NULL = '\\N'
+
+# LOAD DATA's default ESCAPED BY '\\' sequences
+_ESCAPES = str.maketrans(
+	{
+		'\\': '\\\\',
+		'\t': '\\t',
+		'\n': '\\n',
+		'\r': '\\r',
+		'\0': '\\0',
+	},
+)
+
+
+def _dump_json(value: Any) -> str:
+	# LOAD DATA LOCAL turns bad values into warnings, so reject them here
+	if not isinstance(value, (dict, list)):
+		raise ValueError(f'expected a JSON object or array, got {type(value).__name__}')
+
+	try:
+		return json.dumps(value, allow_nan=False, ensure_ascii=False, separators=(',', ':'))
+	except (TypeError, ValueError) as exc:
+		raise ValueError(f'value is not valid JSON: {exc}') from exc
+
+
+def _format_value(kind: LoadColumnKind, value: Any) -> str:
+	if value is None:
+		return _NULL
+
+	match kind:
+		case 'int':
+			return str(int(value))
+		case 'datetime':
+			if value.tzinfo is not None:
+				value = value.astimezone(timezone.utc).replace(tzinfo=None)
+			return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+		case 'json':
+			return _dump_json(value).translate(_ESCAPES)
+		case 'text':
+			return str(value).translate(_ESCAPES)
+
+
+def load_rows(
+	session: Session,
+	table_name: str,
+	columns: LoadColumns,
+	rows: Iterable[Mapping[str, Any]],
+) -> None:
+	"""
+	Spool rows into a temporary file and load it with LOAD DATA LOCAL INFILE.
+
+	The engine must be created with local_infile enabled, and the server
+	must allow it.
+
+	Raises:
+		ValueError: when a JSON column holds a value MySQL would not accept.
+		IntegrityError: when fewer rows were loaded than written. LOCAL loads
+			skip conflicting rows with a warning instead of failing.
+	"""
+
+	with NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.tsv') as spool:
+		count = 0
+		for row in rows:
+			spool.write('\t'.join(_format_value(kind, row[name]) for name, kind in columns))
+			spool.write('\n')
+			count += 1
+		spool.flush()
+
+		if count == 0:
+			return
+
+		path = spool.name.replace('\\', '\\\\').replace("'", "\\'")
+		names = ', '.join(name for name, _ in columns)
+		statement = (
+			f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table_name} CHARACTER SET utf8mb4 "
+			f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({names})"
+		)
+		result = session.connection().exec_driver_sql(statement)
+
+	if result.rowcount != count:
+		raise IntegrityError(
+			statement,
+			None,
+			ValueError(f'loaded {result.rowcount} of {count} rows into {table_name}'),
+		)
@@ -0,0 +1,71 @@
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any, TypeAlias
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+CopyColumns: TypeAlias = Sequence[tuple[str, str]]
+"""Column names paired with the PostgreSQL type names used by binary COPY."""
+
+_INTEGER_TYPES = frozenset(('int2', 'int4', 'int8'))
+
+
+def _require_psycopg() -> Any:
+	try:
+		import psycopg
+	except ModuleNotFoundError as exc:
+		raise RuntimeError('PostgreSQL bulk load requires psycopg3.') from exc
+	return psycopg
+
+
+def _build_converter(type_name: str, jsonb: Callable[[Any], Any]) -> Callable[[Any], Any]:
+	if type_name == 'jsonb':
+		return jsonb
+	if type_name == 'timestamp':
+		# match what the UTC session stores for aware values on normal inserts
+		def to_naive_utc(value: datetime) -> datetime:
+			if value.tzinfo is None:
+				return value
+			return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+		return to_naive_utc
+	if type_name in _INTEGER_TYPES:
+		# enum members would otherwise pick their own dumper
+		return int
+	return lambda value: value
+
+
+def copy_rows(
+	session: Session,
+	table_name: str,
+	columns: CopyColumns,
+	rows: Iterable[Mapping[str, Any]],
+) -> None:
+	"""
+	Stream rows into a table with binary COPY on the session's connection.
+
+	Raises:
+		IntegrityError: when a row violates a constraint; the whole COPY is
+			rejected, so callers should run it inside a savepoint.
+	"""
+
+	psycopg = _require_psycopg()
+	from psycopg.types.json import Jsonb
+
+	converters = [(name, _build_converter(type_name, Jsonb)) for name, type_name in columns]
+	names = ', '.join(name for name, _ in columns)
+	statement = f'COPY {table_name} ({names}) FROM STDIN (FORMAT BINARY)'
+
+	connection = session.connection().connection.driver_connection
+	if connection is None:
+		raise RuntimeError('COPY needs an open psycopg connection')
+	try:
+		with connection.cursor() as cursor, cursor.copy(statement) as copy:
+			copy.set_types([type_name for _, type_name in columns])
+			for row in rows:
+				copy.write_row(
+					[None if row[name] is None else convert(row[name]) for name, convert in converters],
+				)
+	except psycopg.IntegrityError as exc:
+		raise IntegrityError(statement, None, exc) from exc
@@ -1,35 +1,74 @@
-from typing import final
+from collections.abc import Sequence
+from typing import Any, final
 
 from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.databases.tables import stats_table
+from app.persist.bulk import BulkLoader, resolve_bulk_loader
+from app.persist.mysql_load import LoadColumns, load_rows
+from app.persist.postgres_copy import CopyColumns, copy_rows
 from app.persist.stats.protocol import StatsCreateInput, StatsRepository
 
+_COPY_COLUMNS: CopyColumns = (
+	('ingest_id', 'int8'),
+	('score', 'int2'),
+	('score_evaluated', 'int2'),
+)
+
+_LOAD_COLUMNS: LoadColumns = (
+	('ingest_id', 'int'),
+	('score', 'int'),
+	('score_evaluated', 'int'),
+)
+
 
 @final
 class _StatsRepositoryImpl:
-	def __init__(self, session: Session) -> None:
+	def __init__(self, session: Session, *, bulk_loader: BulkLoader | None = None) -> None:
 		self._session = session
+		self._bulk_loader = bulk_loader
+
+	@staticmethod
+	def _to_values(entry: StatsCreateInput) -> dict[str, Any]:
+		return {
+			'ingest_id': entry.ingest_id,
+			'score': entry.initial_score,
+			'score_evaluated': entry.initial_score,
+		}
 
 	def create(self, entry: StatsCreateInput) -> None:
-		stmt = insert(stats_table).values(
-			ingest_id=entry.ingest_id,
-			score=entry.initial_score,
-			score_evaluated=entry.initial_score,
-		)
+		stmt = insert(stats_table).values(**self._to_values(entry))
 		self._session.execute(stmt)
 
+	def create_many(self, entries: Sequence[StatsCreateInput]) -> None:
+		if not entries:
+			return
+
+		match self._bulk_loader:
+			case 'copy':
+				copy_rows(self._session, 'stats', _COPY_COLUMNS, map(self._to_values, entries))
+			case 'load_data':
+				load_rows(self._session, 'stats', _LOAD_COLUMNS, map(self._to_values, entries))
+			case None:
+				self._session.execute(insert(stats_table), [self._to_values(entry) for entry in entries])
+			case _:
+				raise ValueError(f'Unsupported bulk loader: {self._bulk_loader}')
+
 
-def create_stats_repository(session: Session) -> StatsRepository:
+def create_stats_repository(session: Session, *, bulk_load: bool = False) -> StatsRepository:
 	"""
 	Build an stats repository implementation for the configured backend.
 
 	Args:
 		session: SQLAlchemy session bound to the current database engine.
+		bulk_load: Prefer the backend's bulk loader for create_many, if it has one.
 
 	Returns:
 		Concrete repository tied to the active backend.
 	"""
 
-	return _StatsRepositoryImpl(session)
+	return _StatsRepositoryImpl(
+		session,
+		bulk_loader=resolve_bulk_loader(bulk_load),
+	)
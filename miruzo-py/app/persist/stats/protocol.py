@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Annotated, Protocol, final
 
 from pydantic import BaseModel, Field
@@ -19,3 +20,5 @@ class StatsCreateInput(BaseModel):
 
 class StatsRepository(Protocol):
 	def create(self, entry: StatsCreateInput) -> None: ...
+
+	def create_many(self, entries: Sequence[StatsCreateInput]) -> None: ...
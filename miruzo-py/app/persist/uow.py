@@ -1,10 +1,12 @@
-from contextlib import AbstractContextManager
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from types import TracebackType
 from typing import Callable, final
 
 from sqlalchemy.orm import Session
 
+from app.persist.executions.implementation import create_execution_repository
+from app.persist.executions.protocol import ExecutionRepository
 from app.persist.images.implementation import create_image_repository
 from app.persist.images.protocol import ImageRepository
 from app.persist.ingests.factory import create_ingest_repository
@@ -19,12 +21,26 @@ class Repositories:
 	ingest: IngestRepository
 	image: ImageRepository
 	stats: StatsRepository
+	execution: ExecutionRepository
 
 
 @final
 class UnitOfWork(AbstractContextManager['UnitOfWork']):
-	def __init__(self, *, session_factory: Callable[[], Session]) -> None:
+	def __init__(
+		self,
+		*,
+		session_factory: Callable[[], Session],
+		bulk_load: bool = False,
+		pipeline: bool = False,
+	) -> None:
+		if bulk_load and pipeline:
+			raise ValueError(
+				'bulk_load cannot be combined with pipeline: COPY is unavailable in pipeline mode.',
+			)
+
 		self._session_factory = session_factory
+		self._bulk_load = bulk_load
+		self._pipeline = pipeline
 		self._session: Session | None = None
 		self._repos: Repositories | None = None
 
@@ -32,9 +48,10 @@ class UnitOfWork(AbstractContextManager['UnitOfWork']):
 		session = self._session_factory()
 		self._session = session
 		self._repos = Repositories(
-			ingest=create_ingest_repository(session),
-			image=create_image_repository(session),
-			stats=create_stats_repository(session),
+			ingest=create_ingest_repository(session, bulk_load=self._bulk_load),
+			image=create_image_repository(session, bulk_load=self._bulk_load),
+			stats=create_stats_repository(session, bulk_load=self._bulk_load),
+			execution=create_execution_repository(session),
 		)
 
 		return self
@@ -73,6 +90,31 @@ class UnitOfWork(AbstractContextManager['UnitOfWork']):
 
 		session.rollback()
 
+	def checkpoint(self) -> None:
+		"""Checkpoint the SQLite WAL; a no-op on other backends."""
+
+		session = self._session
+		if session is None:
+			raise RuntimeError('UnitOfWork is not active. Use within "with UnitOfWork(...)".')
+
+		from app.databases.sqlite_profile import checkpoint_wal
+
+		checkpoint_wal(session)
+
+	def pipeline(self) -> AbstractContextManager[object]:
+		"""Send the statements issued inside the block without waiting on each round-trip."""
+
+		session = self._session
+		if session is None:
+			raise RuntimeError('UnitOfWork is not active. Use within "with UnitOfWork(...)".')
+
+		if not self._pipeline:
+			return nullcontext()
+
+		from app.databases.database import open_pipeline
+
+		return open_pipeline(session)
+
 	@property
 	def repositories(self) -> Repositories:
 		repos = self._repos
@@ -1,14 +1,22 @@
+import os
+from collections.abc import Callable, Generator, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, replace
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import final
+from typing import TypeAlias, final
 
+from app.config import constants as c
 from app.config.environments import env
 from app.domain.clock.protocol import ClockProvider
-from app.models.enums import ImageKind, IngestMode
+from app.models.enums import IngestMode
 from app.models.image import Image
-from app.models.ingest import Ingest
+from app.models.ingest import Execution, Ingest
+from app.persist.executions.protocol import ExecutionCreateInput
 from app.persist.stats.protocol import StatsCreateInput
 from app.persist.uow import Repositories
+from app.services.images.variants.executors.executor import VariantExecutor
 from app.services.images.variants.executors.local import LocalVariantExecutor
 from app.services.images.variants.mapper import (
 	map_commit_results_to_variants,
@@ -17,9 +25,100 @@ from app.services.images.variants.mapper import (
 from app.services.images.variants.path import VariantRelativePath
 from app.services.images.variants.pipeline import VariantPipeline
 from app.services.images.variants.pipeline_execution import VariantPipelineExecutionSession
-from app.services.images.variants.types import FileInfo, OriginalFile, VariantPolicy
-from app.services.images.variants.utils import get_image_info_from_file
-from app.services.ingests.service import IngestService
+from app.services.images.variants.placeholder import (
+	ImagePlaceholder,
+	create_placeholder_from_file,
+	select_placeholder_source,
+)
+from app.services.images.variants.scheduler import VariantJob, VariantScheduler
+from app.services.images.variants.types import (
+	FileInfo,
+	OriginalFile,
+	VariantCommitResult,
+	VariantExecution,
+	VariantPolicy,
+)
+from app.services.images.variants.utils import get_image_info_from_buffer
+from app.services.ingests.service import IngestService, PendingIngest
+from app.utils.files.content_hash import compute_content_hash
+from app.utils.files.group_sync import GroupSync
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class ImageIngestRequest:
+	origin_path: Path
+	fingerprint: str | None
+	captured_at: datetime
+	ingest_mode: IngestMode
+	origin_stat: os.stat_result | None = None
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class _VariantRun:
+	origin_relpath: VariantRelativePath
+	file: OriginalFile
+	session: VariantPipelineExecutionSession
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class _IngestRecord:
+	"""A finished ingest waiting for its rows to be written."""
+
+	pending: PendingIngest
+	execution: Execution
+	image: Image | None
+	error: Exception | None
+
+
+ImageIngestOutcome: TypeAlias = tuple[Ingest, Image | None]
+
+_IngestSteps: TypeAlias = Generator[_VariantRun, VariantExecution, _IngestRecord]
+
+# Images are built before their ingest row exists; the real id replaces this
+# one when the batch is written.
+_UNASSIGNED_INGEST_ID = c.INGEST_ID_MINIMUM
+
+
+def _collect_written_paths(results: Sequence[VariantCommitResult]) -> list[Path]:
+	"""Collect every file the pipeline created, replaced or removed."""
+
+	paths: list[Path] = []
+	for result in results:
+		if result.action in ('generate', 'regenerate') and result.report is not None:
+			paths.append(result.report.file.file_info.absolute_path)
+		elif result.touched_path is not None:
+			# deletions and prune markers change directory entries too
+			paths.append(result.touched_path)
+	return paths
+
+
+def _create_placeholder(results: Sequence[VariantCommitResult]) -> ImagePlaceholder | None:
+	source = select_placeholder_source(results)
+	if source is None:
+		return None
+
+	# the smallest variant was just written or verified, so it is cheap to decode
+	try:
+		return create_placeholder_from_file(source.file_info.absolute_path)
+	except (OSError, ValueError):
+		return None
+
+
+def _resume_steps(resume: Callable[[], _VariantRun]) -> _IngestRecord:
+	try:
+		resume()
+	except StopIteration as stop:
+		return stop.value
+	raise RuntimeError('image ingest steps yielded more than once')
+
+
+def _raise_first_error(records: Sequence[_IngestRecord]) -> None:
+	for record in records:
+		if record.error is not None:
+			raise record.error
 
 
 @final
@@ -31,14 +130,22 @@ class ImageIngestService:
 		clock: ClockProvider,
 		policy: VariantPolicy,
 		initial_score: int,
+		executor: VariantExecutor | None = None,
+		group_sync: GroupSync | None = None,
+		log_executions: bool = False,
+		store_scope: Callable[[], AbstractContextManager[object]] = nullcontext,
 	) -> None:
 		self._image_repo = repos.image
 		self._stats_repo = repos.stats
+		self._execution_repo = repos.execution if log_executions else None
 		self._ingest_core = IngestService(
 			repository=repos.ingest,
 			clock=clock,
 		)
 		self._clock = clock
+		self._executor = executor if executor is not None else LocalVariantExecutor()
+		self._group_sync = group_sync
+		self._store_scope = store_scope
 		self._pipeline = VariantPipeline(
 			media_root=env.media_root,
 			policy=policy,
@@ -46,60 +153,328 @@ class ImageIngestService:
 		)
 		self._initial_score = initial_score
 
-	def ingest(
-		self,
-		*,
-		origin_path: Path,
-		fingerprint: str | None,
-		captured_at: datetime,
-		ingest_mode: IngestMode,
-	) -> tuple[Ingest, Image]:
-		ingest = self._ingest_core.create_ingest(
-			origin_path=origin_path,
-			fingerprint=fingerprint,
-			captured_at=captured_at,
-			ingest_mode=ingest_mode,
-		)
+	def _ingest_steps(self, request: ImageIngestRequest) -> _IngestSteps:
+		"""
+		Run one image ingest, yielding once when the variant pipeline should run.
 
-		self._stats_repo.create(
-			StatsCreateInput(
-				ingest_id=ingest.id,
-				initial_score=self._initial_score,
-			),
+		Everything before and after the yield stays on the caller's thread; the
+		yielded run may be executed elsewhere. No rows are written here: the
+		returned record is stored together with the rest of its batch.
+		"""
+
+		pending = self._ingest_core.prepare_ingest(
+			origin_path=request.origin_path,
+			fingerprint=request.fingerprint,
+			captured_at=request.captured_at,
+			ingest_mode=request.ingest_mode,
+			origin_stat=request.origin_stat,
 		)
 
-		executor = LocalVariantExecutor()
-		session = VariantPipelineExecutionSession(executor, clock=self._clock)
+		image: Image | None = None
+		error: Exception | None = None
+		session = VariantPipelineExecutionSession(self._executor, clock=self._clock)
 		try:
 			with session:
 				with session.phase('inspect'):
-					origin_relpath = VariantRelativePath(Path(ingest.relative_path))
+					origin_relpath = VariantRelativePath(Path(pending.entry.relative_path))
 					original_fileinfo = FileInfo.from_relative_path(
 						origin_relpath,
 						under=self._pipeline.media_root,
+						stat=request.origin_stat,
 					)
+					# one read serves both the hash and the header inspection
+					original_data = original_fileinfo.absolute_path.read_bytes()
+					original_fileinfo = replace(
+						original_fileinfo,
+						content_hash=compute_content_hash(original_data),
+					)
+					# the kind is left to the executor, which classifies the decoded image
 					original_file = OriginalFile(
 						file_info=original_fileinfo,
-						image_info=get_image_info_from_file(original_fileinfo.absolute_path),
+						image_info=get_image_info_from_buffer(original_data),
 					)
+					# the steps suspend across the pipeline run; do not keep the buffer alive
+					del original_data
+
+				execution = yield _VariantRun(origin_relpath, original_file, session)
+				results = execution.results
 
-				results = self._pipeline.run(origin_relpath, original_file, session)
+				if self._group_sync is not None:
+					written_paths = _collect_written_paths(results)
+					if request.ingest_mode == IngestMode.COPY:
+						written_paths.append(original_fileinfo.absolute_path)
+					self._group_sync.track(written_paths)
 
 				with session.phase('store'):
 					original = map_original_info_to_variant_record(original_file)
 					variants = map_commit_results_to_variants(results)
+					placeholder = _create_placeholder(results)
 
 					image = Image(
-						ingest_id=ingest.id,
-						ingested_at=ingest.ingested_at,
-						kind=ImageKind.UNSPECIFIED,
+						ingest_id=_UNASSIGNED_INGEST_ID,
+						ingested_at=pending.entry.ingested_at,
+						kind=execution.kind,
 						original=original,
 						fallback=None,
 						variants=list(variants),
+						placeholder=placeholder.data_uri if placeholder is not None else None,
+						dominant_color=placeholder.dominant_color if placeholder is not None else None,
 					)
-					self._image_repo.create(image)
-		finally:
-			entry = session.to_dto()
-			self._ingest_core.append_execution(ingest.id, entry)
+		except GeneratorExit:
+			# the batch was abandoned, so this ingest will never be written
+			self._ingest_core.discard_ingest(pending)
+			raise
+		except Exception as exc:
+			error = exc
+
+		return _IngestRecord(pending=pending, execution=session.to_dto(), image=image, error=error)
+
+	def _run_pipeline(self, run: _VariantRun) -> VariantExecution:
+		return self._pipeline.run(run.origin_relpath, run.file, run.session)
+
+	def _run_steps(self, steps: _IngestSteps) -> _IngestRecord:
+		try:
+			run = next(steps)
+		except StopIteration as stop:
+			return stop.value
+
+		try:
+			execution = self._run_pipeline(run)
+		except BaseException as exc:
+			return _resume_steps(partial(steps.throw, exc))
+
+		return _resume_steps(partial(steps.send, execution))
+
+	def _run_sequential(
+		self,
+		requests: Sequence[ImageIngestRequest],
+		process_order: Sequence[int],
+	) -> list[_IngestRecord]:
+		records: list[_IngestRecord | None] = [None] * len(requests)
+
+		try:
+			for index in process_order:
+				records[index] = self._run_steps(self._ingest_steps(requests[index]))
+		except BaseException:
+			self._discard([record for record in records if record is not None])
+			raise
+
+		return [record for record in records if record is not None]
+
+	def _run_scheduled(
+		self,
+		requests: Sequence[ImageIngestRequest],
+		scheduler: VariantScheduler,
+		process_order: Sequence[int],
+	) -> list[_IngestRecord]:
+		records: list[_IngestRecord | None] = [None] * len(requests)
+		pending: list[tuple[int, _IngestSteps, _VariantRun]] = []
+
+		try:
+			for index in process_order:
+				steps = self._ingest_steps(requests[index])
+				try:
+					run = next(steps)
+				except StopIteration as stop:
+					records[index] = stop.value
+					continue
+
+				pending.append((index, steps, run))
+		except BaseException:
+			for _, steps, _ in pending:
+				steps.close()
+			self._discard([record for record in records if record is not None])
+			raise
+
+		futures = scheduler.run(
+			[
+				VariantJob(image_info=run.file.image_info, run=partial(self._run_pipeline, run))
+				for _, _, run in pending
+			],
+		)
+
+		for (index, steps, _), future in zip(pending, futures, strict=True):
+			try:
+				execution = future.result()
+			except BaseException as exc:
+				records[index] = _resume_steps(partial(steps.throw, exc))
+			else:
+				records[index] = _resume_steps(partial(steps.send, execution))
+
+		return [record for record in records if record is not None]
+
+	def _discard(self, records: Sequence[_IngestRecord]) -> None:
+		for record in records:
+			self._ingest_core.discard_ingest(record.pending)
+
+	def _discard_duplicate(self, record: _IngestRecord) -> None:
+		"""Remove the original copy and the variants of an ingest stored under another path."""
+
+		self._ingest_core.discard_ingest(record.pending)
+		if record.image is None:
+			return
+
+		for variant in record.image.variants:
+			(self._pipeline.media_root / variant['rel']).unlink(missing_ok=True)
+
+	def _select_missing(
+		self,
+		requests: Sequence[ImageIngestRequest],
+		process_order: Sequence[int],
+	) -> tuple[list[ImageIngestRequest], list[int]]:
+		"""
+		Drop the requests whose fingerprint is stored or repeats an earlier one.
+
+		This runs before any original is copied or any variant is written, so
+		skipped images cost one hash at most. The kept requests carry their
+		resolved fingerprint and process_order is remapped onto them.
+		"""
+
+		fingerprints = [
+			self._ingest_core.resolve_fingerprint(
+				origin_path=request.origin_path,
+				fingerprint=request.fingerprint,
+				origin_stat=request.origin_stat,
+			)
+			for request in requests
+		]
+		seen = self._ingest_core.find_existing_fingerprints(fingerprints)
+
+		selected: list[ImageIngestRequest] = []
+		new_indices: dict[int, int] = {}
+		for index, (request, fingerprint) in enumerate(zip(requests, fingerprints, strict=True)):
+			if fingerprint in seen:
+				continue
+
+			seen.add(fingerprint)
+			new_indices[index] = len(selected)
+			selected.append(replace(request, fingerprint=fingerprint))
+
+		return selected, [new_indices[index] for index in process_order if index in new_indices]
+
+	def _store(
+		self,
+		records: Sequence[_IngestRecord],
+		*,
+		skip_existing: bool = False,
+	) -> list[ImageIngestOutcome]:
+		"""Write the rows of finished ingests with one batched insert per table."""
+
+		with self._store_scope():
+			return self._write_rows(records, skip_existing=skip_existing)
+
+	def _write_rows(
+		self,
+		records: Sequence[_IngestRecord],
+		*,
+		skip_existing: bool,
+	) -> list[ImageIngestOutcome]:
+		pending = [record.pending for record in records]
+		executions = [record.execution for record in records]
+
+		stored: list[tuple[Ingest, _IngestRecord]]
+		if skip_existing:
+			created = self._ingest_core.create_missing_ingests(
+				pending,
+				executions=executions,
+				discard=lambda index: self._discard_duplicate(records[index]),
+			)
+			stored = [
+				(ingest, record)
+				for ingest, record in zip(created, records, strict=True)
+				if ingest is not None
+			]
+		else:
+			ingests = self._ingest_core.create_ingests(pending, executions=executions)
+			stored = list(zip(ingests, records, strict=True))
+
+		self._stats_repo.create_many(
+			[
+				StatsCreateInput(
+					ingest_id=ingest.id,
+					initial_score=self._initial_score,
+				)
+				for ingest, _ in stored
+			],
+		)
+
+		images = [
+			record.image.model_copy(update={'ingest_id': ingest.id}) if record.image is not None else None
+			for ingest, record in stored
+		]
+		self._image_repo.create_many([image for image in images if image is not None])
+
+		if self._execution_repo is not None:
+			self._execution_repo.create_many(
+				[
+					ExecutionCreateInput(ingest_id=ingest.id, execution=record.execution)
+					for ingest, record in stored
+				],
+			)
+
+		return [(ingest, image) for (ingest, _), image in zip(stored, images, strict=True)]
+
+	def ingest(
+		self,
+		*,
+		origin_path: Path,
+		fingerprint: str | None,
+		captured_at: datetime,
+		ingest_mode: IngestMode,
+		origin_stat: os.stat_result | None = None,
+	) -> ImageIngestOutcome:
+		steps = self._ingest_steps(
+			ImageIngestRequest(
+				origin_path=origin_path,
+				fingerprint=fingerprint,
+				captured_at=captured_at,
+				ingest_mode=ingest_mode,
+				origin_stat=origin_stat,
+			),
+		)
+
+		record = self._run_steps(steps)
+		outcomes = self._store([record])
+		_raise_first_error([record])
+		return outcomes[0]
+
+	def ingest_many(
+		self,
+		requests: Sequence[ImageIngestRequest],
+		*,
+		scheduler: VariantScheduler | None = None,
+		skip_existing: bool = False,
+		process_order: Sequence[int] | None = None,
+	) -> Sequence[ImageIngestOutcome]:
+		"""
+		Ingest several images and write their rows together.
+
+		With a scheduler the variant pipelines run in parallel; without one
+		they run on the calling thread, in request order unless process_order
+		lists the request indices to handle first. Rows are always written in
+		request order, so ingest ids follow it whatever the processing order.
+		Database work always stays on the calling thread and is issued once
+		for the whole batch. When an unexpected error occurs, the remaining
+		images are still finished and stored, and the first error is raised
+		afterwards.
+
+		With skip_existing, images whose fingerprint is already stored, or
+		repeats an earlier request, are looked up before anything is copied
+		or processed; they write no files and no rows and are left out of the
+		returned outcomes.
+		"""
+
+		if process_order is None:
+			process_order = range(len(requests))
+
+		if skip_existing:
+			requests, process_order = self._select_missing(requests, process_order)
+
+		if scheduler is not None:
+			records = self._run_scheduled(requests, scheduler, process_order)
+		else:
+			records = self._run_sequential(requests, process_order)
 
-		return ingest, image
+		outcomes = self._store(records, skip_existing=skip_existing)
+		_raise_first_error(records)
+		return outcomes
@@ -0,0 +1,116 @@
+from collections.abc import Sequence
+from dataclasses import replace
+from pathlib import Path
+from typing import final
+
+from app.config.environments import env
+from app.config.variant import ARCHIVAL_ENCODER_PROFILE, VariantSlot
+from app.models.types import VariantEntry
+from app.persist.images.protocol import ImageRepository, ImageVariantsEntry
+from app.services.images.variants.executors.executor import VariantExecutor
+from app.services.images.variants.executors.local import LocalVariantExecutor
+from app.services.images.variants.mapper import map_commit_result_to_variant_record
+from app.services.images.variants.path import VariantRelativePath
+from app.services.images.variants.pipeline import VariantPipeline
+from app.services.images.variants.plan import force_regenerate
+from app.services.images.variants.types import FileInfo, OriginalFile, VariantPolicy
+from app.services.images.variants.utils import get_image_info_from_file, parse_variant_slot
+from app.utils.files.content_hash import compute_file_content_hash
+
+
+def _find_fast_slots(variants: Sequence[VariantEntry]) -> set[VariantSlot]:
+	return {
+		parse_variant_slot(Path(variant['rel']).parts[0])
+		for variant in variants
+		if variant.get('encoder') == 'fast'
+	}
+
+
+def _with_content_hash(variant: VariantEntry, media_root: Path) -> VariantEntry:
+	"""Backfill the hash of a kept variant written before hashes were recorded, once."""
+
+	if 'hash' in variant:
+		return variant
+
+	try:
+		content_hash = compute_file_content_hash(media_root / variant['rel'])
+	except OSError:
+		return variant
+	return {**variant, 'hash': content_hash}
+
+
+@final
+class ImageOptimizeService:
+	"""Re-encode variants written with the fast encoder profile using the archival one."""
+
+	def __init__(
+		self,
+		repository: ImageRepository,
+		*,
+		policy: VariantPolicy,
+		executor: VariantExecutor | None = None,
+	) -> None:
+		self._repository = repository
+		self._executor = executor if executor is not None else LocalVariantExecutor()
+		self._policy = replace(
+			policy,
+			encoder_profile=ARCHIVAL_ENCODER_PROFILE,
+			regenerate_mismatched=True,
+			generate_missing=False,
+			delete_orphaned=False,
+			prune_threshold=None,
+		)
+		self._pipeline = VariantPipeline(
+			media_root=env.media_root,
+			policy=self._policy,
+			spec=env.variant_layers,
+		)
+
+	def list_candidates(self, *, limit: int, offset: int = 0) -> Sequence[ImageVariantsEntry]:
+		"""Return the highest-scored images, which are the most served ones."""
+
+		return self._repository.list_by_score(limit=limit, offset=offset)
+
+	def optimize(self, entry: ImageVariantsEntry) -> bool:
+		"""Re-encode the fast variants of one image; returns False when there are none."""
+
+		fast_slots = _find_fast_slots(entry.variants)
+		if not fast_slots:
+			return False
+
+		media_root = self._pipeline.media_root
+		origin_relpath = VariantRelativePath(Path(entry.relative_path))
+		file_info = FileInfo.from_relative_path(origin_relpath, under=media_root)
+		original_file = OriginalFile(
+			file_info=file_info,
+			image_info=get_image_info_from_file(file_info.absolute_path),
+			kind=entry.kind,
+		)
+
+		plan = force_regenerate(self._pipeline.build_plan(origin_relpath, original_file), fast_slots)
+		execution = self._executor.execute(
+			media_root=media_root,
+			file=original_file,
+			plan=plan,
+			policy=self._policy,
+		)
+
+		updated: dict[str, VariantEntry] = {}
+		for result in execution.results:
+			if result.result != 'success' or result.action not in ('regenerate', 'unchanged'):
+				continue
+			assert result.report is not None
+			record = map_commit_result_to_variant_record(result.report)
+			updated[record['rel']] = record
+
+		if not updated:
+			return False
+
+		self._repository.update_variants(
+			entry.ingest_id,
+			[
+				updated.get(variant['rel'], _with_content_hash(variant, media_root))
+				for variant in entry.variants
+			],
+		)
+		return True
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import final
+
+from PIL import Image as PILImage
+from PIL import ImageChops, ImageFilter
+
+from app.models.enums import ImageKind
+
+# Classify on a small nearest-neighbour sample: it keeps the original palette
+# intact (filters would invent blended colors). Sampling happens before any
+# mode conversion, so the cost is independent of the decoded image size.
+_SAMPLE_SIZE = 128
+
+# Neighbouring pixels closer than this are considered part of one flat region.
+_FLAT_THRESHOLD = 2
+# Pixels whose edge response exceeds this count as edges.
+_EDGE_THRESHOLD = 48
+
+_GRAPHIC_MAX_COLOR_RATIO = 0.02
+_GRAPHIC_MIN_FLAT_RATIO = 0.75
+_ILLUST_MAX_COLOR_RATIO = 0.25
+_ILLUST_MIN_FLAT_RATIO = 0.4
+_ILLUST_MIN_EDGE_RATIO = 0.02
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class ImageFeatures:
+	color_ratio: float
+	"""Distinct colors per sampled pixel."""
+	flat_ratio: float
+	"""Share of pixels equal to their right and lower neighbours."""
+	edge_ratio: float
+	"""Share of pixels on a strong edge."""
+
+
+def _sample(image: PILImage.Image) -> PILImage.Image:
+	scale = min(1.0, _SAMPLE_SIZE / max(image.width, image.height))
+	size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+	if size != image.size:
+		image = image.resize(size, PILImage.Resampling.NEAREST)
+
+	if image.mode != 'RGB':
+		image = image.convert('RGB')
+	return image
+
+
+def _count_below(image: PILImage.Image, threshold: int) -> int:
+	return sum(image.histogram()[:threshold])
+
+
+def measure_image_features(image: PILImage.Image) -> ImageFeatures:
+	sample = _sample(image)
+	pixels = sample.width * sample.height
+
+	colors = sample.getcolors(maxcolors=pixels)
+	color_count = len(colors) if colors is not None else pixels
+
+	# Compare each pixel with its right and lower neighbour; the wrapped
+	# border row and column are negligible at this size.
+	gray = sample.convert('L')
+	right = ImageChops.difference(gray, ImageChops.offset(gray, -1, 0))
+	below = ImageChops.difference(gray, ImageChops.offset(gray, 0, -1))
+	flat = _count_below(ImageChops.lighter(right, below), _FLAT_THRESHOLD)
+
+	edges = gray.filter(ImageFilter.FIND_EDGES)
+	strong_edges = pixels - _count_below(edges, _EDGE_THRESHOLD + 1)
+
+	return ImageFeatures(
+		color_ratio=color_count / pixels,
+		flat_ratio=flat / pixels,
+		edge_ratio=strong_edges / pixels,
+	)
+
+
+def classify_features(features: ImageFeatures) -> ImageKind:
+	if features.color_ratio <= _GRAPHIC_MAX_COLOR_RATIO and features.flat_ratio >= _GRAPHIC_MIN_FLAT_RATIO:
+		return ImageKind.GRAPHIC
+
+	if (
+		features.color_ratio <= _ILLUST_MAX_COLOR_RATIO
+		and features.flat_ratio >= _ILLUST_MIN_FLAT_RATIO
+		and features.edge_ratio >= _ILLUST_MIN_EDGE_RATIO
+	):
+		return ImageKind.ILLUST
+
+	return ImageKind.PHOTO
+
+
+def classify_image(image: PILImage.Image) -> ImageKind:
+	"""Guess whether an image is a photo, an illustration or a flat graphic."""
+
+	return classify_features(measure_image_features(image))
@@ -5,7 +5,9 @@ from pathlib import Path
 from PIL import Image as PILImage
 from PIL import UnidentifiedImageError as PILUnidentifiedImageError
 
+from app.config.variant import VariantSlot
 from app.services.images.variants.path import (
+	PRUNED_MARKER_SUFFIX,
 	VariantBasePath,
 	build_absolute_path,
 	build_variant_relative_path,
@@ -111,12 +113,31 @@ def collect_variant_files(
 		output_name = target_base.name
 
 		for absolute_path in output_path.glob(f'{output_name}.*'):
+			if absolute_path.suffix == PRUNED_MARKER_SUFFIX:
+				continue
+
 			relpath_withext = relative_path.with_suffix(absolute_path.suffix)
 			variant_file = _load_variant_file(absolute_path, relpath_withext, variant_dirname)
 			if variant_file is not None:
 				yield variant_file
 
 
+def collect_pruned_slots(
+	media_relpaths: Iterable[VariantRelativePath],
+	*,
+	under: Path,
+) -> Iterator[VariantSlot]:
+	"""Yield the slots whose variant was pruned by an earlier commit."""
+
+	# Normalize argument name for internal use
+	media_root = under
+
+	for relative_path in media_relpaths:
+		marker_path = build_absolute_path(relative_path, under=media_root).with_suffix(PRUNED_MARKER_SUFFIX)
+		if marker_path.is_file():
+			yield parse_variant_slot(relative_path.parts[0])
+
+
 def normalize_media_relative_paths(
 	relative_path: VariantBasePath,
 	*,
@@ -1,9 +1,19 @@
 import os
 from collections.abc import Iterator, Sequence
+from dataclasses import replace
 from pathlib import Path
 
-from app.services.images.variants.generate import generate_variant
-from app.services.images.variants.path import build_absolute_path
+from app.config.variant import ARCHIVAL_ENCODER_PROFILE, VariantEncoderProfile, VariantSpec
+from app.services.images.variants.generate import (
+	EncodedVariant,
+	render_variant,
+	write_variant,
+)
+from app.services.images.variants.path import (
+	PRUNED_MARKER_SUFFIX,
+	VariantRelativePath,
+	build_absolute_path,
+)
 from app.services.images.variants.types import (
 	OriginalImage,
 	VariantCommitResult,
@@ -11,15 +21,19 @@ from app.services.images.variants.types import (
 	VariantPlan,
 	VariantPlanFile,
 	VariantPolicy,
+	VariantRegeneratePlan,
 	VariantReport,
 )
+from app.utils.files.atomic import write_file_atomically
+from app.utils.files.content_hash import compute_content_hash
 
 
 def _delete_variant_file(
 	file: VariantFile,
 ) -> VariantCommitResult:
+	absolute_path = file.file_info.absolute_path
 	try:
-		os.remove(file.file_info.absolute_path)
+		os.remove(absolute_path)
 
 	except FileNotFoundError:
 		return VariantCommitResult.failure('delete', 'file_already_missing')
@@ -30,7 +44,7 @@ def _delete_variant_file(
 	except OSError:
 		return VariantCommitResult.failure('delete', 'os_error')
 
-	return VariantCommitResult.success('delete', None)
+	return VariantCommitResult.success('delete', None, touched_path=absolute_path)
 
 
 def _prepare_variant(media_root: Path, plan_file: VariantPlanFile) -> None:
@@ -38,6 +52,144 @@ def _prepare_variant(media_root: Path, plan_file: VariantPlanFile) -> None:
 	absolute_path.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _find_next_smaller(reports: Sequence[VariantReport], spec: VariantSpec) -> VariantFile | None:
+	smaller = [
+		report.file
+		for report in reports
+		if report.spec.layer_id == spec.layer_id and report.file.image_info.width < spec.width
+	]
+	return max(smaller, key=lambda file: file.image_info.width, default=None)
+
+
+def _should_prune(encoded: EncodedVariant, smaller: VariantFile, threshold: float) -> bool:
+	"""Check whether the extra pixels over the smaller variant cost too many bytes."""
+
+	pixels = encoded.image_info.width * encoded.image_info.height
+	smaller_pixels = smaller.image_info.width * smaller.image_info.height
+	pixel_gain = pixels / smaller_pixels
+	byte_gain = encoded.data.nbytes / max(1, smaller.file_info.bytes)
+	return pixel_gain / byte_gain < threshold
+
+
+def _prune_variant(
+	media_root: Path,
+	plan_file: VariantPlanFile,
+	*,
+	durable_write: bool,
+) -> VariantCommitResult:
+	# the marker keeps later runs from generating the variant again
+	marker_relpath = VariantRelativePath(plan_file.path.with_suffix(PRUNED_MARKER_SUFFIX))
+	marker_path = build_absolute_path(marker_relpath, under=media_root)
+	try:
+		write_file_atomically(marker_path, b'', durable=durable_write)
+	except OSError:
+		return VariantCommitResult.failure('prune', 'save_failed')
+
+	return VariantCommitResult.success('prune', None, touched_path=marker_path)
+
+
+def _generate_missing_variant(
+	media_root: Path,
+	plan_file: VariantPlanFile,
+	original: OriginalImage,
+	*,
+	reports: Sequence[VariantReport],
+	policy: VariantPolicy,
+) -> VariantCommitResult:
+	durable_write = policy.durable_write is True
+	spec = plan_file.spec
+
+	encoded = render_variant(
+		spec,
+		original,
+		profile=policy.encoder_profile,
+		quality_target=policy.quality_target,
+	)
+	if encoded is None:
+		return VariantCommitResult.failure('generate', 'save_failed')
+
+	smaller = _find_next_smaller(reports, spec)
+	if (
+		not spec.required
+		and policy.prune_threshold is not None
+		and smaller is not None
+		and _should_prune(encoded, smaller, policy.prune_threshold)
+	):
+		return _prune_variant(media_root, plan_file, durable_write=durable_write)
+
+	file = write_variant(
+		encoded,
+		media_root=media_root,
+		variant_relpath=plan_file.path,
+		durable_write=durable_write,
+	)
+	if file is None:
+		return VariantCommitResult.failure('generate', 'save_failed')
+
+	return VariantCommitResult.success(
+		'generate',
+		VariantReport(encoded.spec, file, profile=encoded.profile),
+	)
+
+
+def _has_same_content(file: VariantFile, encoded: EncodedVariant) -> bool:
+	# the size was recorded when the file was collected, so most mismatches end here
+	if file.file_info.bytes != encoded.data.nbytes:
+		return False
+
+	try:
+		return encoded.data == memoryview(file.file_info.absolute_path.read_bytes())
+	except OSError:
+		return False
+
+
+def _regenerate_variant(
+	media_root: Path,
+	cmp: VariantRegeneratePlan,
+	original: OriginalImage,
+	*,
+	durable_write: bool,
+	profile: VariantEncoderProfile = ARCHIVAL_ENCODER_PROFILE,
+	quality_target: float | None = None,
+) -> VariantCommitResult:
+	plan_file = cmp.planning_file
+
+	encoded = render_variant(plan_file.spec, original, profile=profile, quality_target=quality_target)
+	if encoded is None:
+		return VariantCommitResult.failure('regenerate', 'save_failed')
+
+	# Leave byte-identical files alone: no SSD write, no page cache or ETag churn.
+	if _has_same_content(cmp.actual_file, encoded):
+		file = VariantFile(
+			file_info=replace(cmp.actual_file.file_info, content_hash=compute_content_hash(encoded.data)),
+			image_info=encoded.image_info,
+			variant_dir=encoded.spec.slot.key,
+		)
+		return VariantCommitResult.success(
+			'unchanged',
+			VariantReport(encoded.spec, file, profile=encoded.profile),
+		)
+
+	report = _delete_variant_file(cmp.actual_file)
+	if report.result == 'failure':
+		return report
+
+	_prepare_variant(media_root, plan_file)
+	file = write_variant(
+		encoded,
+		media_root=media_root,
+		variant_relpath=plan_file.path,
+		durable_write=durable_write,
+	)
+	if file is None:
+		return VariantCommitResult.failure('regenerate', 'save_failed')
+
+	return VariantCommitResult.success(
+		'regenerate',
+		VariantReport(encoded.spec, file, profile=encoded.profile),
+	)
+
+
 def _build_commit_variant_plan_iterator(
 	*,
 	plan: VariantPlan,
@@ -48,44 +200,45 @@ def _build_commit_variant_plan_iterator(
 	if not media_root.is_dir():
 		raise RuntimeError(f'media_root does not exist or is not a directory: {media_root}')
 
+	# kept variants so far; pruning compares against the next smaller one
+	reports: list[VariantReport] = []
+
 	# 0. matched
 	for cmp in plan.matched:
+		# reused files keep whatever hash they were collected with; reading them
+		# again just to hash would cost a full pass per variant and ingest
 		report = VariantReport(cmp.expected_spec, cmp.actual_file)
+		reports.append(report)
 		yield VariantCommitResult.success('reuse', report)
 
 	# 1. missing
 	if policy.generate_missing:
+		# layer specs list widths in ascending order, so the next smaller
+		# variant is always settled before a larger one is considered
 		for plan_file in plan.missing:
 			_prepare_variant(media_root, plan_file)
-			report = generate_variant(
+			result = _generate_missing_variant(
 				media_root,
 				plan_file,
 				original,
-				durable_write=policy.durable_write,
+				reports=reports,
+				policy=policy,
 			)
-			if report is None:
-				yield VariantCommitResult.failure('generate', 'save_failed')
-			else:
-				yield VariantCommitResult.success('generate', report)
+			if result.report is not None:
+				reports.append(result.report)
+			yield result
 
 	# 2. mismatched
 	if policy.regenerate_mismatched:
 		for cmp in plan.mismatched:
-			report = _delete_variant_file(cmp.actual_file)
-			if report.result == 'failure':
-				yield report
-			else:
-				_prepare_variant(media_root, cmp.planning_file)
-				report = generate_variant(
-					media_root,
-					cmp.planning_file,
-					original,
-					durable_write=policy.durable_write,
-				)
-				if report is None:
-					yield VariantCommitResult.failure('regenerate', 'save_failed')
-				else:
-					yield VariantCommitResult.success('regenerate', report)
+			yield _regenerate_variant(
+				media_root,
+				cmp,
+				original,
+				durable_write=policy.durable_write is True,
+				profile=policy.encoder_profile,
+				quality_target=policy.quality_target,
+			)
 
 	# 3. orphaned
 	if policy.delete_orphaned:
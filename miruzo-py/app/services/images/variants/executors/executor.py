@@ -1,10 +1,9 @@
-from collections.abc import Sequence
 from pathlib import Path
 from typing import Protocol
 
 from app.services.images.variants.types import (
 	OriginalFile,
-	VariantCommitResult,
+	VariantExecution,
 	VariantPlan,
 	VariantPolicy,
 )
@@ -18,4 +17,11 @@ class VariantExecutor(Protocol):
 		file: OriginalFile,
 		plan: VariantPlan,
 		policy: VariantPolicy,
-	) -> Sequence[VariantCommitResult]: ...
+	) -> VariantExecution:
+		"""
+		Decode the original and commit the plan.
+
+		When file.kind is UNSPECIFIED, the image is classified from the decoded
+		buffer first and the plan switched to the formats of that kind.
+		"""
+		...
@@ -0,0 +1,232 @@
+import multiprocessing
+import os
+import sys
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from types import TracebackType
+from typing import final
+
+from app.services.images.variants.bootstrap import configure_pillow
+from app.services.images.variants.executors.executor import VariantExecutor
+from app.services.images.variants.executors.local import LocalVariantExecutor
+from app.services.images.variants.types import (
+	OriginalFile,
+	VariantExecution,
+	VariantPlan,
+	VariantPolicy,
+)
+
+_POLL_INTERVAL_SECONDS = 0.05
+
+
+class VariantWorkerError(RuntimeError):
+	"""The isolated worker was killed or died while executing a variant plan."""
+
+
+@final
+class VariantTimeoutError(VariantWorkerError):
+	pass
+
+
+@final
+class VariantMemoryLimitError(VariantWorkerError):
+	pass
+
+
+@final
+class VariantWorkerCrashedError(VariantWorkerError):
+	pass
+
+
+if sys.platform == 'linux':
+	_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+	def _read_rss(pid: int) -> int | None:
+		try:
+			with open(f'/proc/{pid}/statm', 'rb') as fp:
+				resident_pages = int(fp.read().split()[1])
+		except (OSError, IndexError, ValueError):
+			return None
+		return resident_pages * _PAGE_SIZE
+else:
+
+	def _read_rss(pid: int) -> int | None:  # noqa: ARG001
+		# RSS of another process is not available without extra dependencies;
+		# only the wall-clock budget is enforced here.
+		return None
+
+
+def _serve(conn: Connection, downscale_first: bool) -> None:
+	configure_pillow()
+	executor = LocalVariantExecutor(downscale_first=downscale_first)
+
+	while True:
+		try:
+			request = conn.recv()
+		except EOFError:
+			return
+
+		try:
+			execution = executor.execute(**request)
+		except Exception as exc:
+			try:
+				conn.send((False, exc))
+			except Exception:
+				# the exception itself may not be picklable
+				conn.send((False, RuntimeError(f'{type(exc).__name__}: {exc}')))
+		else:
+			conn.send((True, execution))
+
+
+@final
+class _Worker:
+	def __init__(self, *, downscale_first: bool) -> None:
+		context = multiprocessing.get_context('spawn')
+		self._conn, child_conn = context.Pipe()
+		self._process: BaseProcess = context.Process(
+			target=_serve,
+			args=(child_conn, downscale_first),
+			daemon=True,
+		)
+		self._process.start()
+		child_conn.close()
+
+	def call(
+		self,
+		request: dict[str, object],
+		*,
+		timeout: float,
+		memory_limit: int | None,
+	) -> VariantExecution:
+		try:
+			self._conn.send(request)
+		except (BrokenPipeError, ConnectionResetError) as exc:
+			raise self._crashed() from exc
+
+		deadline = monotonic() + timeout
+		while True:
+			remaining = deadline - monotonic()
+			if remaining <= 0:
+				raise VariantTimeoutError(f'variant generation exceeded {timeout:g}s')
+
+			if self._conn.poll(min(_POLL_INTERVAL_SECONDS, remaining)):
+				try:
+					ok, payload = self._conn.recv()
+				except EOFError as exc:
+					raise self._crashed() from exc
+				if ok:
+					return payload
+				raise payload
+
+			if not self._process.is_alive():
+				raise self._crashed()
+
+			if memory_limit is not None and self._process.pid is not None:
+				rss = _read_rss(self._process.pid)
+				if rss is not None and rss > memory_limit:
+					raise VariantMemoryLimitError(
+						f'variant generation exceeded {memory_limit} bytes RSS ({rss} bytes)',
+					)
+
+	def _crashed(self) -> VariantWorkerCrashedError:
+		self._process.join(_POLL_INTERVAL_SECONDS)
+		return VariantWorkerCrashedError(f'variant worker exited with code {self._process.exitcode}')
+
+	def kill(self) -> None:
+		self._process.kill()
+		self._process.join()
+		self._conn.close()
+
+	def close(self) -> None:
+		self._conn.close()
+		self._process.join(1.0)
+		if self._process.is_alive():
+			self.kill()
+
+
+@final
+class IsolatedVariantExecutor(VariantExecutor):
+	"""
+	Execute variant plans in child processes with a per-image budget.
+
+	A worker that exceeds the wall-clock timeout or the RSS memory_limit is
+	killed and replaced on the next call, and a VariantWorkerError subclass
+	is raised. Idle workers are reused, so concurrent callers get one worker each.
+	"""
+
+	def __init__(
+		self,
+		*,
+		timeout: float,
+		memory_limit: int | None = None,
+		downscale_first: bool = False,
+	) -> None:
+		if timeout <= 0:
+			raise ValueError('timeout must be greater than 0')
+		if memory_limit is not None and memory_limit < 1:
+			raise ValueError('memory_limit must be greater than or equal to 1')
+
+		self._timeout = timeout
+		self._memory_limit = memory_limit
+		self._downscale_first = downscale_first
+		self._idle: list[_Worker] = []
+		self._lock = Lock()
+
+	def __enter__(self) -> 'IsolatedVariantExecutor':
+		return self
+
+	def __exit__(
+		self,
+		exc_type: type[BaseException] | None,
+		exc: BaseException | None,
+		tb: TracebackType | None,
+	) -> None:
+		self.close()
+
+	def _acquire(self) -> _Worker:
+		with self._lock:
+			if self._idle:
+				return self._idle.pop()
+		return _Worker(downscale_first=self._downscale_first)
+
+	def _release(self, worker: _Worker) -> None:
+		with self._lock:
+			self._idle.append(worker)
+
+	def execute(
+		self,
+		*,
+		media_root: Path,
+		file: OriginalFile,
+		plan: VariantPlan,
+		policy: VariantPolicy,
+	) -> VariantExecution:
+		worker = self._acquire()
+		try:
+			execution = worker.call(
+				{'media_root': media_root, 'file': file, 'plan': plan, 'policy': policy},
+				timeout=self._timeout,
+				memory_limit=self._memory_limit,
+			)
+		except VariantWorkerError:
+			worker.kill()
+			raise
+		except Exception:
+			# the worker answered with an ordinary error and stays usable
+			self._release(worker)
+			raise
+		except BaseException:
+			worker.kill()
+			raise
+
+		self._release(worker)
+		return execution
+
+	def close(self) -> None:
+		with self._lock:
+			workers, self._idle = self._idle, []
+		for worker in workers:
+			worker.close()
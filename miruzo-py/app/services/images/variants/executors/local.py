@@ -1,23 +1,54 @@
-from collections.abc import Sequence
 from pathlib import Path
 from typing import final
 
 from PIL import Image as PILImage
 
+from app.config.variant import has_variant_kind_preset
+from app.models.enums import ImageKind
+from app.services.images.variants.classify import classify_image
 from app.services.images.variants.commit import commit_variant_plan
 from app.services.images.variants.executors.executor import VariantExecutor
-from app.services.images.variants.preprocess import preprocess_original
+from app.services.images.variants.plan import apply_variant_kind_to_plan
+from app.services.images.variants.preprocess import preprocess_downscaled, preprocess_original
 from app.services.images.variants.types import (
 	OriginalFile,
 	OriginalImage,
-	VariantCommitResult,
+	VariantExecution,
 	VariantPlan,
 	VariantPolicy,
 )
 
 
+def _find_largest_generated_width(
+	plan: VariantPlan,
+	policy: VariantPolicy,
+	*,
+	classify: bool,
+) -> int | None:
+	widths: list[int] = []
+	if policy.generate_missing:
+		widths.extend(plan_file.spec.width for plan_file in plan.missing)
+	if policy.regenerate_mismatched:
+		widths.extend(cmp.planning_file.spec.width for cmp in plan.mismatched)
+		if classify:
+			# the kind may still move these to the regenerate list
+			widths.extend(
+				cmp.expected_spec.width
+				for cmp in plan.matched
+				if has_variant_kind_preset(cmp.expected_spec)
+			)
+	return max(widths, default=None)
+
+
 @final
 class LocalVariantExecutor(VariantExecutor):
+	def __init__(self, *, downscale_first: bool = False) -> None:
+		self._downscale_first = downscale_first
+
+	@property
+	def downscale_first(self) -> bool:
+		return self._downscale_first
+
 	def execute(
 		self,
 		*,
@@ -25,10 +56,27 @@ class LocalVariantExecutor(VariantExecutor):
 		file: OriginalFile,
 		plan: VariantPlan,
 		policy: VariantPolicy,
-	) -> Sequence[VariantCommitResult]:
+	) -> VariantExecution:
+		classify = file.kind == ImageKind.UNSPECIFIED
+
 		with PILImage.open(file.file_info.absolute_path) as original_image:
+			width = (
+				_find_largest_generated_width(plan, policy, classify=classify)
+				if self._downscale_first
+				else None
+			)
+			if width is None:
+				image = preprocess_original(original_image, file.image_info)
+			else:
+				image = preprocess_downscaled(original_image, file.image_info, width=width)
+
+			# classify the buffer the variants are rendered from, so no extra decode is needed
+			kind = classify_image(image) if classify else file.kind
+			if classify:
+				plan = apply_variant_kind_to_plan(plan, kind)
+
 			preprocessed_image = OriginalImage(
-				image=preprocess_original(original_image, file.image_info),
+				image=image,
 				info=file.image_info,
 			)
 
@@ -39,4 +87,4 @@ class LocalVariantExecutor(VariantExecutor):
 				media_root=media_root,
 			)
 
-			return results
+			return VariantExecution(kind=kind, results=results)
@@ -1,11 +1,14 @@
+import io
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import IO, Callable
+from typing import final
 
 from PIL import Image as PILImage
 from PIL.Image import Resampling as PILResampling
 
-from app.config.variant import VariantSpec
+from app.config.variant import ARCHIVAL_ENCODER_PROFILE, VariantEncoderProfile, VariantSpec
 from app.services.images.variants.path import build_absolute_path
+from app.services.images.variants.quality import search_quality
 from app.services.images.variants.types import (
 	FileInfo,
 	ImageInfo,
@@ -15,7 +18,8 @@ from app.services.images.variants.types import (
 	VariantRelativePath,
 	VariantReport,
 )
-from app.utils.files.atomic import ensure_durable_write
+from app.utils.files.atomic import write_file_atomically
+from app.utils.files.content_hash import compute_content_hash
 
 
 def _select_resample_algorithm(original: ImageInfo, target_width: int) -> int:
@@ -37,58 +41,69 @@ def _transform_variant(
 ) -> PILImage.Image:
 	"""Resize/copy the original image according to the spec."""
 
+	# Derive the height from the probed info rather than the image, so a
+	# pre-downscaled original yields exactly the same dimensions.
 	width = spec.width
-	height = max(1, int(round(width * (original.image.height / original.image.width))))
+	height = max(1, int(round(width * (original.info.height / original.info.width))))
 	resample = _select_resample_algorithm(original.info, width)
 
-	variant_image = original.image.copy().resize((width, height), resample)
+	# resize() never mutates the source, so no defensive copy is needed.
+	variant_image = original.image.resize((width, height), resample)
 	return variant_image
 
 
-def _save_variant(
+@dataclass(frozen=True, slots=True)
+@final
+class EncodedVariant:
+	spec: VariantSpec
+	image_info: ImageInfo
+	data: memoryview
+	profile: VariantEncoderProfile
+
+
+def _encode_variant(
 	spec: VariantSpec,
 	output_image: PILImage.Image,
 	*,
-	media_root: Path,
-	variant_relpath: VariantRelativePath,
-	durable_write: bool,
-) -> VariantFile | None:
-	"""Encode the resized image and return filesystem metadata."""
+	profile: VariantEncoderProfile = ARCHIVAL_ENCODER_PROFILE,
+	quality_target: float | None = None,
+) -> EncodedVariant:
+	"""
+	Encode the resized image into memory; raises OSError when encoding fails.
 
-	absolute_path = build_absolute_path(variant_relpath, under=media_root)
+	With a quality_target, lossy WebP searches the lowest quality reaching that
+	SSIM against the resized image, and the returned spec carries it.
+	"""
 
 	kwargs: dict[str, object] = {}
 	match spec.format.container:
 		case 'jpeg':
 			lossless = False
-			kwargs.setdefault('optimize', True)
-			kwargs.setdefault('progressive', True)
+			kwargs.setdefault('optimize', profile.jpeg_optimize)
+			kwargs.setdefault('progressive', profile.jpeg_progressive)
 		case 'webp':
 			lossless = spec.format.codecs == 'vp8l'
-			kwargs.setdefault('method', 6)
+			kwargs.setdefault('method', profile.webp_method)
 			kwargs.setdefault('lossless', lossless)
 		case _:
 			raise ValueError(f'Unsupported variant spec: {spec.format.container}')
 
-	if spec.quality is not None:
-		kwargs['quality'] = spec.quality
-
 	pil_format = spec.format.container.upper()
 
-	write_fn: Callable[[IO[bytes]], None] = lambda file: output_image.save(file, pil_format, **kwargs)
-	try:
-		if durable_write:
-			ensure_durable_write(absolute_path, write_fn)
+	def encode(quality: int | None) -> io.BytesIO:
+		# Encode in memory first so the file is written with a single syscall.
+		buffer = io.BytesIO()
+		if quality is None:
+			output_image.save(buffer, pil_format, **kwargs)
 		else:
-			with absolute_path.open('wb') as file:
-				write_fn(file)
-	except OSError:
-		return None
+			output_image.save(buffer, pil_format, **kwargs, quality=quality)
+		return buffer
 
-	try:
-		stat = absolute_path.stat()
-	except (FileNotFoundError, PermissionError):
-		return None
+	if quality_target is not None and spec.format.container == 'webp' and not lossless:
+		quality, buffer = search_quality(output_image, encode, target=quality_target)
+		spec = replace(spec, quality=quality)
+	else:
+		buffer = encode(spec.quality)
 
 	image_info = ImageInfo(
 		container=spec.format.container,
@@ -97,38 +112,74 @@ def _save_variant(
 		height=output_image.height,
 		lossless=lossless,
 	)
+	return EncodedVariant(spec=spec, image_info=image_info, data=buffer.getbuffer(), profile=profile)
+
+
+def write_variant(
+	encoded: EncodedVariant,
+	*,
+	media_root: Path,
+	variant_relpath: VariantRelativePath,
+	durable_write: bool,
+) -> VariantFile | None:
+	"""Persist an encoded variant and return filesystem metadata."""
+
+	absolute_path = build_absolute_path(variant_relpath, under=media_root)
+
+	try:
+		write_file_atomically(absolute_path, encoded.data, durable=durable_write)
+	except OSError:
+		return None
 
 	file_info = FileInfo(
 		absolute_path=absolute_path,
 		relative_path=variant_relpath,
-		bytes=stat.st_size,
+		bytes=encoded.data.nbytes,
+		content_hash=compute_content_hash(encoded.data),
 	)
 
 	file = VariantFile(
 		file_info=file_info,
-		image_info=image_info,
-		variant_dir=spec.slot.key,
+		image_info=encoded.image_info,
+		variant_dir=encoded.spec.slot.key,
 	)
 
 	return file
 
 
+def render_variant(
+	spec: VariantSpec,
+	original: OriginalImage,
+	*,
+	profile: VariantEncoderProfile = ARCHIVAL_ENCODER_PROFILE,
+	quality_target: float | None = None,
+) -> EncodedVariant | None:
+	"""Resize and encode a variant without touching the filesystem."""
+
+	variant_image = _transform_variant(spec, original)
+	try:
+		return _encode_variant(spec, variant_image, profile=profile, quality_target=quality_target)
+	except OSError:
+		return None
+
+
 def generate_variant(
 	media_root: Path,
 	plan_file: VariantPlanFile,
 	original: OriginalImage,
 	*,
 	durable_write: bool,
+	profile: VariantEncoderProfile = ARCHIVAL_ENCODER_PROFILE,
+	quality_target: float | None = None,
 ) -> VariantReport | None:
 	"""Render and persist a single variant, returning its report."""
 
-	spec = plan_file.spec
-
-	variant_image = _transform_variant(spec, original)
+	encoded = render_variant(plan_file.spec, original, profile=profile, quality_target=quality_target)
+	if encoded is None:
+		return None
 
-	file = _save_variant(
-		spec,
-		variant_image,
+	file = write_variant(
+		encoded,
 		media_root=media_root,
 		variant_relpath=plan_file.path,
 		durable_write=durable_write,
@@ -136,6 +187,6 @@ def generate_variant(
 	if file is None:
 		return None
 
-	report = VariantReport(spec, file)
+	report = VariantReport(encoded.spec, file, profile=encoded.profile)
 
 	return report
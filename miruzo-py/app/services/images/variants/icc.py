@@ -0,0 +1,148 @@
+import hashlib
+import io
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import cast, final
+
+from PIL import Image, ImageCms
+
+# Camera and phone output reuses a handful of embedded profiles, so a small
+# cache covers nearly every image of an import.
+_MAX_CACHED_TRANSFORMS = 32
+
+# An embedded profile is treated as sRGB when the transform leaves every probe
+# color within this many code values.
+_SRGB_TOLERANCE = 1
+
+_PROBE_COLORS: tuple[tuple[int, int, int], ...] = (
+	(0, 0, 0),
+	(64, 64, 64),
+	(128, 128, 128),
+	(192, 192, 192),
+	(255, 255, 255),
+	(255, 0, 0),
+	(0, 255, 0),
+	(0, 0, 255),
+	(255, 255, 0),
+	(0, 255, 255),
+	(255, 0, 255),
+	(200, 120, 40),
+	(40, 120, 200),
+)
+
+_SRGB_PROFILE = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))  # pyright: ignore[reportUnknownArgumentType, reportUnknownMemberType]
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class IccTransformCacheStats:
+	hits: int
+	misses: int
+	size: int
+
+
+_TransformKey = tuple[bytes, str]
+
+
+@final
+class _IccTransformCache:
+	def __init__(self, maxsize: int) -> None:
+		self._maxsize = maxsize
+		# None marks a profile that is equivalent to sRGB
+		self._transforms: OrderedDict[_TransformKey, ImageCms.ImageCmsTransform | None] = OrderedDict()
+		self._lock = Lock()
+		self._hits = 0
+		self._misses = 0
+
+	def get(
+		self,
+		key: _TransformKey,
+	) -> tuple[bool, ImageCms.ImageCmsTransform | None]:
+		with self._lock:
+			if key not in self._transforms:
+				self._misses += 1
+				return False, None
+
+			self._hits += 1
+			self._transforms.move_to_end(key)
+			return True, self._transforms[key]
+
+	def put(self, key: _TransformKey, transform: ImageCms.ImageCmsTransform | None) -> None:
+		with self._lock:
+			self._transforms[key] = transform
+			self._transforms.move_to_end(key)
+			while len(self._transforms) > self._maxsize:
+				self._transforms.popitem(last=False)
+
+	def stats(self) -> IccTransformCacheStats:
+		with self._lock:
+			return IccTransformCacheStats(
+				hits=self._hits,
+				misses=self._misses,
+				size=len(self._transforms),
+			)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._transforms.clear()
+			self._hits = 0
+			self._misses = 0
+
+
+_cache = _IccTransformCache(_MAX_CACHED_TRANSFORMS)
+
+
+def _is_srgb_equivalent(transform: ImageCms.ImageCmsTransform) -> bool:
+	probe = Image.new('RGB', (len(_PROBE_COLORS), 1))
+	probe.putdata(_PROBE_COLORS)
+	converted = transform.apply(probe)
+
+	for x, expected in enumerate(_PROBE_COLORS):
+		actual = cast(tuple[int, int, int], converted.getpixel((x, 0)))
+		if any(abs(e - a) > _SRGB_TOLERANCE for e, a in zip(expected, actual, strict=True)):
+			return False
+	return True
+
+
+def _build_srgb_transform(icc_profile: bytes, mode: str) -> ImageCms.ImageCmsTransform | None:
+	src_profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+	transform = ImageCms.buildTransform(
+		src_profile,
+		_SRGB_PROFILE,
+		mode,
+		mode,
+		ImageCms.Intent.PERCEPTUAL,
+		# The default one-pixel cache is mutated on every call, which makes
+		# sharing a transform across worker threads unsafe.
+		ImageCms.Flags.NOCACHE,
+	)
+	if _is_srgb_equivalent(transform):
+		return None
+	return transform
+
+
+def get_srgb_transform(icc_profile: bytes, mode: str) -> ImageCms.ImageCmsTransform | None:
+	"""
+	Return a cached transform from an embedded profile to sRGB.
+
+	Returns None when the profile is equivalent to sRGB and no conversion is
+	needed. Raises ImageCms.PyCMSError / OSError for unusable profiles.
+	"""
+
+	key = (hashlib.blake2b(icc_profile, digest_size=16).digest(), mode)
+	found, transform = _cache.get(key)
+	if found:
+		return transform
+
+	transform = _build_srgb_transform(icc_profile, mode)
+	_cache.put(key, transform)
+	return transform
+
+
+def get_icc_transform_cache_stats() -> IccTransformCacheStats:
+	return _cache.stats()
+
+
+def clear_icc_transform_cache() -> None:
+	_cache.clear()
@@ -17,6 +17,8 @@ def map_original_info_to_variant_record(file: OriginalFile) -> VariantEntry:
 		height=file.image_info.height,
 		quality=None,
 	)
+	if file.file_info.content_hash is not None:
+		record['hash'] = file.file_info.content_hash
 
 	return record
 
@@ -37,6 +39,10 @@ def map_commit_result_to_variant_record(report: VariantReport) -> VariantEntry:
 		height=image.height,
 		quality=spec.quality,
 	)
+	if file.content_hash is not None:
+		record['hash'] = file.content_hash
+	if report.profile is not None:
+		record['encoder'] = report.profile.name
 
 	return record
 
@@ -48,7 +54,7 @@ def map_commit_results_to_variants(results: Iterable[VariantCommitResult]) -> It
 		if result.result != 'success':
 			continue
 
-		if result.action not in ('reuse', 'generate', 'regenerate'):
+		if result.action not in ('reuse', 'generate', 'regenerate', 'unchanged'):
 			continue
 
 		assert result.report is not None
@@ -6,6 +6,9 @@ from app.config.variant import VariantSlot
 VariantBasePath = NewType('VariantBasePath', Path)
 VariantRelativePath = NewType('VariantRelativePath', Path)
 
+# Empty file left in place of a variant that was pruned as not worth its bytes.
+PRUNED_MARKER_SUFFIX = '.pruned'
+
 
 def map_origin_to_variant_basepath(relative_path: Path) -> VariantBasePath:
 	"""Drop the origin prefix and suffix to build the variant base path."""
@@ -1,16 +1,23 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 
-from app.config.variant import VariantLayerSpec
+from app.config.variant import VariantLayerSpec, VariantSlot
 from app.services.images.variants.collect import (
+	collect_pruned_slots,
 	collect_variant_directories,
 	collect_variant_files,
 	normalize_media_relative_paths,
 )
-from app.services.images.variants.path import map_origin_to_variant_basepath
+from app.services.images.variants.path import VariantBasePath, map_origin_to_variant_basepath
 from app.services.images.variants.pipeline_execution import VariantPipelineExecutionSession
-from app.services.images.variants.plan import build_variant_plan, emit_variant_specs
-from app.services.images.variants.types import OriginalFile, VariantCommitResult, VariantPolicy
+from app.services.images.variants.plan import build_variant_plan, emit_variant_specs, exclude_pruned_specs
+from app.services.images.variants.types import (
+	OriginalFile,
+	VariantExecution,
+	VariantFile,
+	VariantPlan,
+	VariantPolicy,
+)
 
 
 class VariantPipeline:
@@ -37,36 +44,65 @@ class VariantPipeline:
 	def spec(self) -> Sequence[VariantLayerSpec]:
 		return self._spec
 
+	def _collect(self, variant_basepath: VariantBasePath) -> tuple[Iterable[VariantFile], set[VariantSlot]]:
+		variant_dirnames = collect_variant_directories(self._media_root)
+		media_relpaths = list(normalize_media_relative_paths(variant_basepath, under=variant_dirnames))
+		existing_files = collect_variant_files(media_relpaths, under=self._media_root)
+		pruned_slots = set(collect_pruned_slots(media_relpaths, under=self._media_root))
+		return existing_files, pruned_slots
+
+	def _plan(
+		self,
+		variant_basepath: VariantBasePath,
+		file: OriginalFile,
+		existing_files: Iterable[VariantFile],
+		pruned_slots: set[VariantSlot],
+	) -> VariantPlan:
+		planned_specs = emit_variant_specs(self._spec, file.image_info, kind=file.kind)
+		planned_specs = exclude_pruned_specs(planned_specs, pruned_slots)
+		return build_variant_plan(
+			planned=planned_specs,
+			existing=existing_files,
+			rel_to=variant_basepath,
+		)
+
+	def build_plan(self, origin_relative_path: Path, file: OriginalFile) -> VariantPlan:
+		"""Collect and plan without executing, e.g. to adjust the plan first."""
+
+		variant_basepath = map_origin_to_variant_basepath(origin_relative_path)
+		existing_files, pruned_slots = self._collect(variant_basepath)
+		return self._plan(variant_basepath, file, existing_files, pruned_slots)
+
 	def run(
 		self,
 		origin_relative_path: Path,
 		file: OriginalFile,
 		session: VariantPipelineExecutionSession,
-	) -> Sequence[VariantCommitResult]:
+	) -> VariantExecution:
+		"""
+		Collect, plan and execute the variants of one original.
+
+		An original of UNSPECIFIED kind is planned with the configured formats;
+		the executor classifies it and switches the plan to the kind's formats.
+		"""
+
 		variant_basepath = map_origin_to_variant_basepath(origin_relative_path)
 
 		# collect
 		with session.phase('collect'):
-			variant_dirnames = collect_variant_directories(self._media_root)
-			media_relpaths = normalize_media_relative_paths(variant_basepath, under=variant_dirnames)
-			existing_files = collect_variant_files(media_relpaths, under=self._media_root)
+			existing_files, pruned_slots = self._collect(variant_basepath)
 
 		# plan
 		with session.phase('plan'):
-			planned_specs = emit_variant_specs(self._spec, file.image_info)
-			plan = build_variant_plan(
-				planned=planned_specs,
-				existing=existing_files,
-				rel_to=variant_basepath,
-			)
+			plan = self._plan(variant_basepath, file, existing_files, pruned_slots)
 
 		# execute
 		with session.phase('execute'):
-			results = session.execute(
+			execution = session.execute(
 				media_root=self._media_root,
 				file=file,
 				plan=plan,
 				policy=self._policy,
 			)
 
-		return results
+		return execution
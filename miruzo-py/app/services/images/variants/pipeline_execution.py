@@ -1,4 +1,4 @@
-from collections.abc import Iterator, Sequence
+from collections.abc import Iterator
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -14,9 +14,10 @@ from app.domain.clock.protocol import ClockProvider
 from app.models.enums import ExecutionStatus
 from app.models.ingest import Execution
 from app.services.images.variants.executors.executor import VariantExecutor
+from app.services.images.variants.executors.isolated import VariantWorkerError
 from app.services.images.variants.types import (
 	OriginalFile,
-	VariantCommitResult,
+	VariantExecution,
 	VariantPlan,
 	VariantPolicy,
 )
@@ -37,7 +38,6 @@ class VariantPipelineExecutionSession:
 		self._status = ExecutionStatus.SUCCESS
 		self._executed_at: datetime | None = None
 		self._start_mark: float | None = None
-		self._last_mark: float | None = None
 
 		self._error_type: str | None = None
 		self._error_message: str | None = None
@@ -52,9 +52,7 @@ class VariantPipelineExecutionSession:
 
 	def __enter__(self) -> 'VariantPipelineExecutionSession':
 		self._executed_at = self._clock.now()
-		mark = monotonic()
-		self._start_mark = mark
-		self._last_mark = mark
+		self._start_mark = monotonic()
 		return self
 
 	def __exit__(
@@ -74,6 +72,8 @@ class VariantPipelineExecutionSession:
 			self._status = ExecutionStatus.IMAGE_ERROR
 		elif issubclass(exc_type, PILDecompressionBombError):
 			self._status = ExecutionStatus.IO_ERROR
+		elif issubclass(exc_type, VariantWorkerError):
+			self._status = ExecutionStatus.RESOURCE_ERROR
 		elif issubclass(exc_type, (DataError, IntegrityError, OperationalError)):
 			self._status = ExecutionStatus.DB_ERROR
 		else:
@@ -83,19 +83,14 @@ class VariantPipelineExecutionSession:
 		self._error_message = exc.__str__()
 		return self._status != ExecutionStatus.UNKNOWN_ERROR
 
-	def _mark_phase(self) -> timedelta:
-		assert self._last_mark is not None
-
-		current = monotonic()
-		duration = timedelta(seconds=current - self._last_mark)
-		self._last_mark = current
-		return duration
-
 	@contextmanager
 	def phase(self, name: _ExecutionPhase) -> Iterator[None]:
+		# Measure the phase body itself, so time spent waiting between phases
+		# (e.g. queued for a parallel worker) is not attributed to any phase.
+		start_mark = monotonic()
 		yield None
 
-		duration = self._mark_phase()
+		duration = timedelta(seconds=monotonic() - start_mark)
 		match name:
 			case 'inspect':
 				self._inspect = duration
@@ -125,15 +120,15 @@ class VariantPipelineExecutionSession:
 		file: OriginalFile,
 		plan: VariantPlan,
 		policy: VariantPolicy,
-	) -> Sequence[VariantCommitResult]:
-		results = self._executor.execute(
+	) -> VariantExecution:
+		execution = self._executor.execute(
 			media_root=media_root,
 			file=file,
 			plan=plan,
 			policy=policy,
 		)
 
-		return results
+		return execution
 
 	def to_dto(self) -> Execution:
 		if self._executed_at is None:
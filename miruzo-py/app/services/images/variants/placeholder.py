@@ -0,0 +1,77 @@
+import base64
+import io
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast, final
+
+from PIL import Image as PILImage
+
+from app.services.images.variants.types import VariantCommitResult, VariantFile
+
+PLACEHOLDER_SIZE = 16
+
+_PLACEHOLDER_QUALITY = 40
+_DOMINANT_COLOR_PALETTE_SIZE = 5
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class ImagePlaceholder:
+	data_uri: str
+	dominant_color: int
+
+
+def _shrink(image: PILImage.Image) -> PILImage.Image:
+	mode = 'RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB'
+	if image.mode != mode:
+		image = image.convert(mode)
+
+	# fit within a PLACEHOLDER_SIZE square so very tall images stay tiny too
+	scale = min(1.0, PLACEHOLDER_SIZE / max(image.width, image.height))
+	width = max(1, round(image.width * scale))
+	height = max(1, round(image.height * scale))
+	return image.resize((width, height), PILImage.Resampling.BOX)
+
+
+def _find_dominant_color(image: PILImage.Image) -> int:
+	rgb = image.convert('RGB')
+	palette_image = rgb.quantize(colors=_DOMINANT_COLOR_PALETTE_SIZE, method=PILImage.Quantize.MEDIANCUT)
+
+	colors = cast(list[tuple[int, int]], palette_image.getcolors())
+	_, index = max(colors)
+	palette = cast(list[int], palette_image.getpalette())
+	r, g, b = palette[3 * index : 3 * index + 3]
+	return (r << 16) | (g << 8) | b
+
+
+def create_placeholder(image: PILImage.Image) -> ImagePlaceholder:
+	"""Shrink the image into a tiny WebP data URI and find its dominant color."""
+
+	thumbnail = _shrink(image)
+
+	buffer = io.BytesIO()
+	thumbnail.save(buffer, format='WEBP', quality=_PLACEHOLDER_QUALITY, method=6)
+	encoded = base64.b64encode(buffer.getbuffer()).decode('ascii')
+
+	return ImagePlaceholder(
+		data_uri=f'data:image/webp;base64,{encoded}',
+		dominant_color=_find_dominant_color(thumbnail),
+	)
+
+
+def create_placeholder_from_file(path: Path) -> ImagePlaceholder:
+	with PILImage.open(path) as image:
+		image.draft('RGB', (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+		return create_placeholder(image)
+
+
+def select_placeholder_source(results: Sequence[VariantCommitResult]) -> VariantFile | None:
+	"""Return the smallest variant that exists on disk after a commit."""
+
+	files = [
+		result.report.file
+		for result in results
+		if result.result == 'success' and result.action != 'delete' and result.report is not None
+	]
+	return min(files, key=lambda file: file.image_info.width, default=None)
@@ -1,6 +1,8 @@
-from collections.abc import Iterable, Iterator
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import replace
 
-from app.config.variant import VariantLayerSpec, VariantSpec
+from app.config.variant import VariantLayerSpec, VariantSlot, VariantSpec, apply_variant_kind_preset
+from app.models.enums import ImageKind
 from app.services.images.variants.path import VariantBasePath, build_variant_relative_path
 from app.services.images.variants.types import (
 	ImageInfo,
@@ -17,11 +19,107 @@ def _should_emit_variant(spec: VariantSpec, original: ImageInfo) -> bool:
 	return spec.required or spec.width < original.width
 
 
-def emit_variant_specs(layers: Iterable[VariantLayerSpec], original: ImageInfo) -> Iterator[VariantSpec]:
+def emit_variant_specs(
+	layers: Iterable[VariantLayerSpec],
+	original: ImageInfo,
+	*,
+	kind: ImageKind = ImageKind.UNSPECIFIED,
+) -> Iterator[VariantSpec]:
 	for layer in layers:
 		for spec in layer.specs:
 			if _should_emit_variant(spec, original):
-				yield spec
+				yield apply_variant_kind_preset(spec, kind)
+
+
+def exclude_pruned_specs(
+	specs: Iterable[VariantSpec],
+	pruned: Collection[VariantSlot],
+) -> Iterator[VariantSpec]:
+	"""Drop optional specs whose variant an earlier commit pruned."""
+
+	for spec in specs:
+		if spec.required or spec.slot not in pruned:
+			yield spec
+
+
+def force_regenerate(plan: VariantPlan, slots: Collection[VariantSlot]) -> VariantPlan:
+	"""Move matched variants in the given slots to the regenerate list."""
+
+	matched: list[VariantComparison] = []
+	mismatched = list(plan.mismatched)
+	for cmp in plan.matched:
+		if cmp.expected_spec.slot not in slots:
+			matched.append(cmp)
+			continue
+
+		mismatched.append(
+			VariantRegeneratePlan(
+				actual_file=cmp.actual_file,
+				planning_file=VariantPlanFile(
+					path=cmp.actual_file.file_info.relative_path,
+					spec=cmp.expected_spec,
+				),
+			),
+		)
+
+	return VariantPlan(
+		matched=matched,
+		mismatched=mismatched,
+		missing=plan.missing,
+		orphaned=plan.orphaned,
+	)
+
+
+def apply_variant_kind_to_plan(plan: VariantPlan, kind: ImageKind) -> VariantPlan:
+	"""
+	Switch a plan built before the image kind was known to the kind's formats.
+
+	Kind presets keep the file extension, so every path stays where it is.
+	Matched variants whose codec no longer fits move to the regenerate list,
+	and mismatched ones that already fit are reused.
+	"""
+
+	matched: list[VariantComparison] = []
+	mismatched: list[VariantRegeneratePlan] = []
+
+	for cmp in plan.matched:
+		kind_cmp = VariantComparison(apply_variant_kind_preset(cmp.expected_spec, kind), cmp.actual_file)
+		if _is_content_matched(kind_cmp):
+			matched.append(kind_cmp)
+			continue
+
+		mismatched.append(
+			VariantRegeneratePlan(
+				actual_file=cmp.actual_file,
+				planning_file=VariantPlanFile(
+					path=cmp.actual_file.file_info.relative_path,
+					spec=kind_cmp.expected_spec,
+				),
+			),
+		)
+
+	for regen_plan in plan.mismatched:
+		kind_spec = apply_variant_kind_preset(regen_plan.planning_file.spec, kind)
+		kind_cmp = VariantComparison(kind_spec, regen_plan.actual_file)
+		if _is_content_matched(kind_cmp):
+			matched.append(kind_cmp)
+			continue
+
+		mismatched.append(
+			replace(regen_plan, planning_file=replace(regen_plan.planning_file, spec=kind_spec)),
+		)
+
+	missing = [
+		replace(plan_file, spec=apply_variant_kind_preset(plan_file.spec, kind))
+		for plan_file in plan.missing
+	]
+
+	return VariantPlan(
+		matched=matched,
+		mismatched=mismatched,
+		missing=missing,
+		orphaned=plan.orphaned,
+	)
 
 
 def _is_content_matched(cmp: VariantComparison) -> bool:
@@ -82,24 +180,35 @@ def _compare_variant_specs(
 
 
 def _classify_variant_diff(diff: VariantDiff) -> VariantDiff:
-	"""Move format-incompatible mismatches into orphaned files."""
+	"""
+	Replace format-incompatible mismatches with a fresh variant.
+
+	A file under another extension is orphaned and its spec generated anew.
+	A file that only differs in codec shares the new path, so it stays a
+	mismatch and is rewritten in place rather than deleted after generation.
+	"""
 
 	remaining_mismatched: list[VariantComparison] = list(diff.mismatched)
+	missing = list(diff.missing)
 	orphaned = list(diff.orphaned)
 
 	for c in range(len(remaining_mismatched) - 1, -1, -1):
 		comparison = remaining_mismatched[c]
 		fmt = comparison.expected_spec.format
-		info = comparison.actual_file.image_info
+		file = comparison.actual_file
 
-		if info.container != fmt.container or info.codecs != fmt.codecs:
+		if file.file_info.relative_path.suffix != fmt.file_extension:
 			del remaining_mismatched[c]
-			orphaned.append(comparison.actual_file)
+			missing.append(comparison.expected_spec)
+			orphaned.append(file)
+
+	# pruning settles the next smaller variant first, so keep widths ascending
+	missing.sort(key=lambda spec: spec.width)
 
 	return VariantDiff(
 		matched=diff.matched,
 		mismatched=remaining_mismatched,
-		missing=diff.missing,
+		missing=missing,
 		orphaned=orphaned,
 	)
 
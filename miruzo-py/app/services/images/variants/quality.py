@@ -0,0 +1,100 @@
+import io
+from collections.abc import Callable
+from typing import cast
+
+from PIL import Image as PILImage
+from PIL import ImageMath
+
+# SSIM is evaluated over non-overlapping blocks of this many pixels, which
+# reduces to BOX resizes in Pillow's C core instead of per-pixel Python.
+_SSIM_BLOCK_SIZE = 8
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+MIN_SEARCH_QUALITY = 30
+MAX_SEARCH_QUALITY = 95
+MAX_SEARCH_PROBES = 4
+
+
+def _to_luma(image: PILImage.Image) -> PILImage.Image:
+	return image.convert('L').convert('F')
+
+
+def _mean(image: PILImage.Image) -> float:
+	return cast(float, image.resize((1, 1), PILImage.Resampling.BOX).getpixel((0, 0)))
+
+
+def compute_ssim(reference: PILImage.Image, distorted: PILImage.Image) -> float:
+	"""Return the mean block SSIM of the luma planes (1.0 for identical images)."""
+
+	if reference.size != distorted.size:
+		raise ValueError('images must have the same size')
+
+	x = _to_luma(reference)
+	y = _to_luma(distorted)
+	size = (max(1, x.width // _SSIM_BLOCK_SIZE), max(1, x.height // _SSIM_BLOCK_SIZE))
+
+	def block_mean(image: PILImage.Image) -> PILImage.Image:
+		return image.resize(size, PILImage.Resampling.BOX)
+
+	mx = block_mean(x)
+	my = block_mean(y)
+	mxx = block_mean(ImageMath.lambda_eval(lambda a: a['x'] * a['x'], x=x))
+	myy = block_mean(ImageMath.lambda_eval(lambda a: a['y'] * a['y'], y=y))
+	mxy = block_mean(ImageMath.lambda_eval(lambda a: a['x'] * a['y'], x=x, y=y))
+
+	ssim_map = ImageMath.lambda_eval(
+		lambda a: (
+			(a['mx'] * a['my'] * 2 + _SSIM_C1)
+			* ((a['mxy'] - a['mx'] * a['my']) * 2 + _SSIM_C2)
+			/ (
+				(a['mx'] * a['mx'] + a['my'] * a['my'] + _SSIM_C1)
+				* (a['mxx'] - a['mx'] * a['mx'] + a['myy'] - a['my'] * a['my'] + _SSIM_C2)
+			)
+		),
+		mx=mx,
+		my=my,
+		mxx=mxx,
+		myy=myy,
+		mxy=mxy,
+	)
+	return _mean(cast(PILImage.Image, ssim_map))
+
+
+def search_quality(
+	reference: PILImage.Image,
+	encode: Callable[[int], io.BytesIO],
+	*,
+	target: float,
+	low: int = MIN_SEARCH_QUALITY,
+	high: int = MAX_SEARCH_QUALITY,
+	max_probes: int = MAX_SEARCH_PROBES,
+) -> tuple[int, io.BytesIO]:
+	"""
+	Binary-search the lowest quality whose encode reaches the SSIM target.
+
+	At most max_probes encodes are scored; when none reaches the target the
+	result is encoded at high.
+	"""
+
+	best: tuple[int, io.BytesIO] | None = None
+	probes = 0
+	while low <= high and probes < max_probes:
+		quality = (low + high) // 2
+		buffer = encode(quality)
+		probes += 1
+
+		with PILImage.open(buffer) as decoded:
+			score = compute_ssim(reference, decoded)
+
+		if score >= target:
+			best = (quality, buffer)
+			high = quality - 1
+		else:
+			low = quality + 1
+
+	if best is not None:
+		return best
+
+	# high only moves on success, so it is still the upper bound here
+	return high, encode(high)
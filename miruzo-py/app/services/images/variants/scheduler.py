@@ -0,0 +1,96 @@
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Generic, TypeVar, final
+
+from app.services.images.variants.utils import ImageInfo
+
+_T = TypeVar('_T')
+
+# Decoded buffers are budgeted as RGBA (4 bytes per pixel), which keeps a
+# MAX_IMAGE_PIXELS decode at roughly 400 MB.
+_DECODED_BYTES_PER_PIXEL = 4
+
+
+def estimate_decoded_bytes(info: ImageInfo) -> int:
+	"""Estimate the decoded buffer size of an image from its probed dimensions."""
+
+	return info.width * info.height * _DECODED_BYTES_PER_PIXEL
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class VariantJob(Generic[_T]):
+	image_info: ImageInfo
+	run: Callable[[], _T]
+
+
+@final
+class VariantScheduler:
+	"""
+	Run variant jobs on a thread pool, largest image first (LPT).
+
+	A job is admitted only while the estimated decoded bytes in flight stay
+	under memory_budget. A job larger than the whole budget still runs, but
+	only when nothing else is in flight.
+	"""
+
+	def __init__(self, *, max_workers: int, memory_budget: int) -> None:
+		if max_workers < 1:
+			raise ValueError('max_workers must be greater than or equal to 1')
+		if memory_budget < 1:
+			raise ValueError('memory_budget must be greater than or equal to 1')
+
+		self._max_workers = max_workers
+		self._memory_budget = memory_budget
+
+	@property
+	def max_workers(self) -> int:
+		return self._max_workers
+
+	@property
+	def memory_budget(self) -> int:
+		return self._memory_budget
+
+	def _pick_next(
+		self,
+		pending: list[int],
+		costs: Sequence[int],
+		in_flight_bytes: int,
+		*,
+		idle: bool,
+	) -> int | None:
+		# pending is sorted largest-first; backfill with the largest job that fits
+		for position, index in enumerate(pending):
+			if idle or in_flight_bytes + costs[index] <= self._memory_budget:
+				del pending[position]
+				return index
+		return None
+
+	def run(self, jobs: Sequence[VariantJob[_T]]) -> Sequence[Future[_T]]:
+		"""Run every job and return their futures in input order."""
+
+		costs = [estimate_decoded_bytes(job.image_info) for job in jobs]
+		pending = sorted(range(len(jobs)), key=lambda index: costs[index], reverse=True)
+		futures: list[Future[_T] | None] = [None] * len(jobs)
+
+		in_flight: dict[Future[_T], int] = {}
+		in_flight_bytes = 0
+		with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+			while pending or in_flight:
+				while pending and len(in_flight) < self._max_workers:
+					index = self._pick_next(pending, costs, in_flight_bytes, idle=not in_flight)
+					if index is None:
+						break
+
+					future = pool.submit(jobs[index].run)
+					futures[index] = future
+					in_flight[future] = index
+					in_flight_bytes += costs[index]
+
+				done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+				for future in done:
+					index = in_flight.pop(future)
+					in_flight_bytes -= costs[index]
+
+		return [future for future in futures if future is not None]
@@ -1,10 +1,13 @@
+import os
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal, TypeAlias, final
 
 from PIL import Image as PILImage
 
-from app.config.variant import VariantSlot, VariantSpec
+from app.config.variant import ARCHIVAL_ENCODER_PROFILE, VariantEncoderProfile, VariantSlot, VariantSpec
+from app.models.enums import ImageKind
 from app.services.images.variants.path import VariantRelativePath, build_absolute_path
 from app.services.images.variants.utils import ImageInfo, parse_variant_slot
 
@@ -15,15 +18,24 @@ class FileInfo:
 	absolute_path: Path
 	relative_path: VariantRelativePath
 	bytes: int
+	content_hash: str | None = None
 
 	@classmethod
-	def from_relative_path(cls, relative_path: VariantRelativePath, under: Path) -> 'FileInfo':
+	def from_relative_path(
+		cls,
+		relative_path: VariantRelativePath,
+		under: Path,
+		*,
+		stat: os.stat_result | None = None,
+	) -> 'FileInfo':
 		# Normalize argument name for internal use
 		media_root = under
 
 		absolute_path = build_absolute_path(relative_path, under=media_root)
 
-		stat = absolute_path.stat()
+		# Reuse a stat taken upstream (e.g. origin resolution) when available
+		if stat is None:
+			stat = absolute_path.stat()
 
 		info = cls(
 			absolute_path=absolute_path,
@@ -46,6 +58,7 @@ class OriginalImage:
 class OriginalFile:
 	file_info: FileInfo
 	image_info: ImageInfo
+	kind: ImageKind = ImageKind.UNSPECIFIED
 
 
 @dataclass(frozen=True, slots=True)
@@ -105,13 +118,24 @@ class VariantPlan:
 	orphaned: list[VariantFile]
 
 
+# True: fsync every variant and its directory as it is written.
+# 'batch': write normally; the caller flushes through a GroupSync before committing.
+DurableWrite: TypeAlias = bool | Literal['batch']
+
+
 @dataclass(frozen=True, slots=True)
 @final
 class VariantPolicy:
-	durable_write: bool
+	durable_write: DurableWrite
 	regenerate_mismatched: bool
 	generate_missing: bool
 	delete_orphaned: bool
+	# SSIM target for lossy WebP; None encodes at each spec's fixed quality
+	quality_target: float | None = None
+	encoder_profile: VariantEncoderProfile = ARCHIVAL_ENCODER_PROFILE
+	# Minimum pixels-per-byte ratio of a generated optional variant against the
+	# next smaller one; variants below it are pruned. None keeps every variant.
+	prune_threshold: float | None = None
 
 
 DEFAULT_VARIANT_POLICY = VariantPolicy(
@@ -127,9 +151,11 @@ DEFAULT_VARIANT_POLICY = VariantPolicy(
 class VariantReport:
 	spec: VariantSpec
 	file: VariantFile
+	# None when the file was reused and its encoder is not known
+	profile: VariantEncoderProfile | None = None
 
 
-_VariantCommitAction: TypeAlias = Literal['reuse', 'generate', 'regenerate', 'delete']
+_VariantCommitAction: TypeAlias = Literal['reuse', 'generate', 'regenerate', 'unchanged', 'prune', 'delete']
 _VariantCommitFailureReason: TypeAlias = Literal[
 	'file_already_missing',
 	'os_error',
@@ -146,10 +172,18 @@ class VariantCommitResult:
 	result: Literal['success', 'failure']
 	reason: _VariantCommitFailureReason | None
 	report: VariantReport | None
+	# file created or removed without a report (prune markers, deletions)
+	touched_path: Path | None = None
 
 	@classmethod
-	def success(cls, action: _VariantCommitAction, report: VariantReport | None) -> 'VariantCommitResult':
-		return cls(action, 'success', None, report)
+	def success(
+		cls,
+		action: _VariantCommitAction,
+		report: VariantReport | None,
+		*,
+		touched_path: Path | None = None,
+	) -> 'VariantCommitResult':
+		return cls(action, 'success', None, report, touched_path)
 
 	@classmethod
 	def failure(
@@ -158,3 +192,12 @@ class VariantCommitResult:
 		reason: _VariantCommitFailureReason,
 	) -> 'VariantCommitResult':
 		return cls(action, 'failure', reason, None)
+
+
+@dataclass(frozen=True, slots=True)
+@final
+class VariantExecution:
+	"""The commit results of one plan and the kind the variants were encoded for."""
+
+	kind: ImageKind
+	results: Sequence[VariantCommitResult]
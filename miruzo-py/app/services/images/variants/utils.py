@@ -1,3 +1,4 @@
+import io
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -81,6 +82,12 @@ def get_image_info_from_file(path: Path) -> ImageInfo:
 		return info
 
 
+def get_image_info_from_buffer(data: bytes) -> ImageInfo:
+	with PILImage.open(io.BytesIO(data)) as image:
+		info = get_image_info(image)
+		return info
+
+
 def parse_variant_slot(label: str) -> VariantSlot:
 	"""
 	Parse slot and return structured representation.
@@ -1,10 +1,13 @@
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from logging import getLogger
 from pathlib import Path
 from typing import final
 
 from app.domain.clock.protocol import ClockProvider
-from app.models.enums import IngestMode
+from app.models.enums import ExecutionStatus, IngestMode, ProcessStatus
 from app.models.ingest import Execution, Ingest
 from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput, IngestRepository
 from app.services.ingests.utils.file import copy_origin_file, delete_origin_file
@@ -19,6 +22,47 @@ from app.services.ingests.utils.path import (
 log = getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+@final
+class PendingIngest:
+	"""An ingest whose original is in place but whose row is not written yet."""
+
+	entry: IngestCreateInput
+	output_path: Path
+	ingest_mode: IngestMode
+
+
+def _with_executions(
+	pending: Sequence[PendingIngest],
+	executions: Sequence[Execution] | None,
+) -> list[IngestCreateInput]:
+	entries = [item.entry for item in pending]
+	if executions is None:
+		return entries
+
+	return [
+		entry.model_copy(update={'execution': execution})
+		for entry, execution in zip(entries, executions, strict=True)
+	]
+
+
+def _to_ingest(ingest_id: int, entry: IngestCreateInput) -> Ingest:
+	return Ingest(
+		id=ingest_id,
+		process=(
+			ProcessStatus.FINISHED
+			if entry.execution is not None and entry.execution.status == ExecutionStatus.SUCCESS
+			else ProcessStatus.PROCESSING
+		),
+		relative_path=entry.relative_path,
+		fingerprint=entry.fingerprint,
+		ingested_at=entry.ingested_at,
+		captured_at=entry.captured_at,
+		updated_at=entry.ingested_at,
+		executions=[entry.execution] if entry.execution is not None else [],
+	)
+
+
 @final
 class IngestService:
 	def __init__(
@@ -30,17 +74,50 @@ class IngestService:
 		self._repository = repository
 		self._clock = clock
 
-	def create_ingest(
+	@staticmethod
+	def _resolve_fingerprint(path: Path, fingerprint: str | None, *, origin_path: Path) -> str:
+		if fingerprint is not None:
+			normalized = normalize_fingerprint(fingerprint)
+			if normalized is not None:
+				return normalized
+			log.warning('invalid fingerprint detected; recomputing for %s', origin_path)
+
+		return compute_fingerprint(path)
+
+	def resolve_fingerprint(
+		self,
+		*,
+		origin_path: Path,
+		fingerprint: str | None,
+		origin_stat: os.stat_result | None = None,
+	) -> str:
+		"""
+		Return the normalized fingerprint of an original before it is ingested.
+
+		Without a valid fingerprint the original is hashed; a copy made later
+		has the same contents, so prepare_ingest accepts the result as is.
+		"""
+
+		origin_absolute_path = resolve_origin_absolute_path(origin_path, origin_stat=origin_stat)
+		return self._resolve_fingerprint(origin_absolute_path, fingerprint, origin_path=origin_path)
+
+	def find_existing_fingerprints(self, fingerprints: Sequence[str]) -> set[str]:
+		"""Return the fingerprints that already have an ingest row."""
+
+		return self._repository.find_existing_fingerprints(fingerprints)
+
+	def prepare_ingest(
 		self,
 		*,
 		origin_path: Path,
 		fingerprint: str | None,
 		captured_at: datetime,
 		ingest_mode: IngestMode,
-	) -> Ingest:
-		"""Create an ingest record and optionally persist the original asset."""
+		origin_stat: os.stat_result | None = None,
+	) -> PendingIngest:
+		"""Persist the original asset and build the ingest row without writing it."""
 
-		origin_absolute_path = resolve_origin_absolute_path(origin_path)
+		origin_absolute_path = resolve_origin_absolute_path(origin_path, origin_stat=origin_stat)
 
 		match ingest_mode:
 			case IngestMode.SYMLINK:
@@ -48,46 +125,114 @@ class IngestService:
 				relative_path = map_relative_to_symlink_pathstr(origin_path)
 			case IngestMode.COPY:
 				output_path = map_relative_to_output_path(origin_path)
-				copy_origin_file(origin_absolute_path, output_path)
+				copy_origin_file(origin_absolute_path, output_path, src_stat=origin_stat)
 				relative_path = map_relative_to_pathstr(origin_path)
 			case _:
 				raise ValueError(f'Unsupported ingest mode: {ingest_mode}')
 
-		if fingerprint is None:
-			fingerprint = compute_fingerprint(output_path)
-		else:
-			fingerprint = normalize_fingerprint(fingerprint)
-			if fingerprint is None:
-				log.warning('invalid fingerprint detected; recomputing for %s', origin_path)
-				fingerprint = compute_fingerprint(output_path)
+		fingerprint = self._resolve_fingerprint(output_path, fingerprint, origin_path=origin_path)
 
-		now = self._clock.now()
+		return PendingIngest(
+			entry=IngestCreateInput(
+				relative_path=relative_path,
+				fingerprint=fingerprint,
+				ingested_at=self._clock.now(),
+				captured_at=captured_at,
+			),
+			output_path=output_path,
+			ingest_mode=ingest_mode,
+		)
+
+	def discard_ingest(self, pending: PendingIngest) -> None:
+		"""Remove the original copied for an ingest that will not be written."""
+
+		if pending.ingest_mode == IngestMode.COPY:
+			delete_origin_file(pending.output_path)
+
+	def create_ingests(
+		self,
+		pending: Sequence[PendingIngest],
+		*,
+		executions: Sequence[Execution] | None = None,
+	) -> list[Ingest]:
+		"""
+		Write prepared ingest rows in one batch, in input order.
+
+		When executions are given, each row is inserted with its first
+		execution, so no follow-up append is needed.
+		"""
+
+		entries = _with_executions(pending, executions)
 		try:
-			ingest_id = self._repository.create(
-				IngestCreateInput(
-					relative_path=relative_path,
-					fingerprint=fingerprint,
-					ingested_at=now,
-					captured_at=captured_at,
-				),
-			)
+			ingest_ids = self._repository.create_many(entries)
 		except Exception:
-			if ingest_mode == IngestMode.COPY:
-				delete_origin_file(output_path)
+			for item in pending:
+				self.discard_ingest(item)
 			raise
 
-		return Ingest(
-			id=ingest_id,
-			relative_path=relative_path,
+		return [_to_ingest(ingest_id, entry) for ingest_id, entry in zip(ingest_ids, entries, strict=True)]
+
+	def create_missing_ingests(
+		self,
+		pending: Sequence[PendingIngest],
+		*,
+		executions: Sequence[Execution] | None = None,
+		discard: Callable[[int], None] | None = None,
+	) -> list[Ingest | None]:
+		"""
+		Write the prepared ingest rows whose fingerprint is not stored yet.
+
+		Ingests that are already present come back as None instead of
+		raising. A copy made for one of them is removed unless it is the
+		file the stored row points at; discard, when given, is called with
+		the index of each such ingest instead, so callers can also remove
+		what they derived from it.
+		"""
+
+		entries = _with_executions(pending, executions)
+		try:
+			results = self._repository.create_many_if_absent(entries)
+		except Exception:
+			for item in pending:
+				self.discard_ingest(item)
+			raise
+
+		ingests: list[Ingest | None] = []
+		for index, (item, entry, result) in enumerate(zip(pending, entries, results, strict=True)):
+			if result.created:
+				ingests.append(_to_ingest(result.id, entry))
+				continue
+
+			if result.relative_path != entry.relative_path:
+				if discard is not None:
+					discard(index)
+				else:
+					self.discard_ingest(item)
+			ingests.append(None)
+		return ingests
+
+	def create_ingest(
+		self,
+		*,
+		origin_path: Path,
+		fingerprint: str | None,
+		captured_at: datetime,
+		ingest_mode: IngestMode,
+		origin_stat: os.stat_result | None = None,
+	) -> Ingest:
+		"""Create an ingest record and optionally persist the original asset."""
+
+		pending = self.prepare_ingest(
+			origin_path=origin_path,
 			fingerprint=fingerprint,
-			ingested_at=now,
 			captured_at=captured_at,
-			updated_at=now,
-			executions=[],
+			ingest_mode=ingest_mode,
+			origin_stat=origin_stat,
 		)
+		return self.create_ingests([pending])[0]
 
 	def append_execution(self, ingest_id: int, execution: Execution) -> None:
-		"""Append an execution entry to the ingest record."""
+		"""Append an execution entry to an existing ingest record, e.g. on a retry."""
 
 		now = self._clock.now()
 		self._repository.append_execution(
@@ -97,3 +242,18 @@ class IngestService:
 				execution=execution,
 			),
 		)
+
+	def append_executions(self, executions: Sequence[tuple[int, Execution]]) -> None:
+		"""Append execution entries to many ingest records with one bulk update."""
+
+		now = self._clock.now()
+		self._repository.append_executions(
+			[
+				IngestAppendExecutionInput(
+					ingest_id=ingest_id,
+					updated_at=now,
+					execution=execution,
+				)
+				for ingest_id, execution in executions
+			],
+		)
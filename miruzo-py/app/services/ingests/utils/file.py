@@ -1,20 +1,27 @@
+import os
 import shutil
+import stat
 from pathlib import Path
 
 
 def copy_origin_file(
 	src: Path,
 	dst: Path,
+	*,
+	src_stat: os.stat_result | None = None,
 ) -> None:
 	"""
 	Copy the original file to the ingest destination, creating parents as needed.
 
+	When src_stat is given, it is trusted instead of stat'ing the source again.
+
 	Raises:
 		FileNotFoundError: when either the original file or destination parent is missing.
 		IOError/OSError: propagated from shutil.copy2 on failure.
 	"""
 
-	if not src.is_file():
+	is_file = src.is_file() if src_stat is None else stat.S_ISREG(src_stat.st_mode)
+	if not is_file:
 		raise ValueError(f'Origin path is not a file: {src}')
 
 	parent = dst.parent
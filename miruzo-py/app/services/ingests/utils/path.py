@@ -1,3 +1,5 @@
+import os
+import stat
 import unicodedata
 from pathlib import Path
 
@@ -61,16 +63,25 @@ def _ensure_within_root(candidate: Path, *, allowed_root: Path) -> None:
 		raise ValueError(msg) from exc
 
 
-def _validate_origin_absolute_path(origin_absolute_path: Path) -> None:
+def _validate_origin_absolute_path(
+	origin_absolute_path: Path,
+	origin_stat: os.stat_result | None,
+) -> None:
 	"""
 	Validate that the origin path is located under the configured assets root.
 
 	This ensures the parent directory exists and is within env.gataku_assets_root.
+	A pre-fetched origin_stat is used instead of touching the filesystem again.
 	"""
 
 	resolved_origin_path = origin_absolute_path
 
-	if not resolved_origin_path.is_file():
+	if origin_stat is None:
+		is_file = resolved_origin_path.is_file()
+	else:
+		is_file = stat.S_ISREG(origin_stat.st_mode)
+
+	if not is_file:
 		raise ValueError(f'origin_path must be a file: {resolved_origin_path}')
 
 	_ensure_within_root(resolved_origin_path, allowed_root=env.gataku_assets_root)
@@ -89,12 +100,16 @@ def _map_origin_relative_to_absolute_path(relative_path: Path) -> Path:
 	return output_path
 
 
-def resolve_origin_absolute_path(relative_path: Path) -> Path:
+def resolve_origin_absolute_path(
+	relative_path: Path,
+	*,
+	origin_stat: os.stat_result | None = None,
+) -> Path:
 	_validate_origin_relative_path(relative_path)
 
 	absolute_path = _map_origin_relative_to_absolute_path(relative_path)
 
-	_validate_origin_absolute_path(absolute_path)
+	_validate_origin_absolute_path(absolute_path, origin_stat)
 
 	return absolute_path
 
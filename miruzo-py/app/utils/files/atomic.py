@@ -1,3 +1,4 @@
+import errno
 import os
 import sys
 from pathlib import Path
@@ -22,7 +23,7 @@ if sys.platform == 'win32':
 			FILE_ATTRIBUTE_NORMAL,
 		)
 
-	def _fsync_dir(dir_path: Path) -> None:
+	def fsync_dir(dir_path: Path) -> None:
 		pass
 
 	def _get_file_prefix(path: Path) -> str:
@@ -35,7 +36,7 @@ else:
 	def _unset_hidden_if_required(path: Path) -> None:
 		pass
 
-	def _fsync_dir(dir_path: Path) -> None:
+	def fsync_dir(dir_path: Path) -> None:
 		fd = os.open(dir_path, os.O_DIRECTORY)
 		try:
 			os.fsync(fd)
@@ -46,6 +47,89 @@ else:
 		return '.' + path.name
 
 
+if sys.platform == 'linux':
+	# linkat() needs the anonymous file reachable through /proc; cleared once the
+	# filesystem (or a sandbox) turns out not to support publishing that way.
+	_tmpfile_supported = hasattr(os, 'O_TMPFILE') and os.path.isdir('/proc/self/fd')
+
+	# errnos meaning O_TMPFILE or linkat cannot work at all, not just this once
+	_TMPFILE_UNSUPPORTED_ERRNOS = frozenset((errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL, errno.EXDEV))
+
+	class _TmpfileLinkDeniedError(Exception):
+		"""Linking through /proc/self/fd is denied, e.g. by a sandbox."""
+
+	def _write_all(fd: int, data: memoryview) -> None:
+		offset = 0
+		while offset < len(data):
+			offset += os.pwrite(fd, data[offset:], offset)
+
+	def _link_fd(fd_path: str, path: Path) -> None:
+		try:
+			os.link(fd_path, path, follow_symlinks=True)
+		except OSError as exc:
+			# the anonymous file is new and ours, so EPERM rejects the /proc link itself
+			if exc.errno == errno.EPERM:
+				raise _TmpfileLinkDeniedError from exc
+			raise
+
+	def _link_tmpfile(fd: int, final_path: Path) -> None:
+		fd_path = f'/proc/self/fd/{fd}'
+		try:
+			_link_fd(fd_path, final_path)
+		except FileExistsError:
+			# linkat cannot replace, so publish under a temporary name and rename over
+			tmp_path = final_path.with_name(f'{_get_file_prefix(final_path)}.{os.getpid()}.{fd}.tmp')
+			_link_fd(fd_path, tmp_path)
+			try:
+				os.replace(tmp_path, final_path)
+			except Exception:
+				tmp_path.unlink(missing_ok=True)
+				raise
+
+	def _write_tmpfile(final_path: Path, data: memoryview, *, durable: bool) -> bool:
+		"""
+		Publish data through O_TMPFILE; False asks the caller to fall back.
+
+		Only errors showing the path cannot work anywhere disable it for the
+		process. Others, like a directory removed meanwhile, fall back for
+		this call alone.
+		"""
+
+		global _tmpfile_supported
+		if not _tmpfile_supported:
+			return False
+
+		try:
+			fd = os.open(final_path.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+		except OSError as exc:
+			if exc.errno in _TMPFILE_UNSUPPORTED_ERRNOS:
+				_tmpfile_supported = False
+			return False
+
+		try:
+			_write_all(fd, data)
+			if durable:
+				os.fsync(fd)
+			_link_tmpfile(fd, final_path)
+		except _TmpfileLinkDeniedError:
+			_tmpfile_supported = False
+			return False
+		except OSError as exc:
+			if exc.errno in _TMPFILE_UNSUPPORTED_ERRNOS:
+				_tmpfile_supported = False
+			return False
+		finally:
+			os.close(fd)
+
+		if durable:
+			fsync_dir(final_path.parent)
+		return True
+else:
+
+	def _write_tmpfile(final_path: Path, data: memoryview, *, durable: bool) -> bool:  # noqa: ARG001
+		return False
+
+
 def ensure_durable_write(
 	final_path: Path,
 	write_fn: Callable[[IO[bytes]], None],
@@ -88,4 +172,32 @@ def ensure_durable_write(
 		raise
 
 	# fsync directory
-	_fsync_dir(final_path.parent)
+	fsync_dir(final_path.parent)
+
+
+def write_file_atomically(
+	final_path: Path,
+	data: bytes | bytearray | memoryview,
+	*,
+	durable: bool,
+) -> None:
+	"""
+	Write an encoded buffer in as few syscalls as possible; parent directory must exist.
+
+	On Linux the data goes into an anonymous O_TMPFILE and is published with
+	linkat, so readers never see a partial file. Elsewhere durable writes fall
+	back to ensure_durable_write and plain writes go straight to final_path.
+	"""
+
+	view = memoryview(data)
+	if _write_tmpfile(final_path, view, durable=durable):
+		return
+
+	def write_fn(file: IO[bytes]) -> None:
+		file.write(view)
+
+	if durable:
+		ensure_durable_write(final_path, write_fn)
+	else:
+		with final_path.open('wb') as file:
+			write_fn(file)
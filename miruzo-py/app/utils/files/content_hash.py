@@ -0,0 +1,25 @@
+import hashlib
+from pathlib import Path
+
+# 64-bit BLAKE2b, hex encoded: a strong-enough validator for ETags while
+# keeping image rows small.
+_DIGEST_SIZE = 8
+_READ_CHUNK_SIZE = 1024 * 1024
+
+CONTENT_HASH_LENGTH = _DIGEST_SIZE * 2
+
+
+def compute_content_hash(data: bytes | bytearray | memoryview) -> str:
+	"""Hash an in-memory buffer, e.g. a freshly encoded variant."""
+
+	return hashlib.blake2b(data, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def compute_file_content_hash(path: Path) -> str:
+	"""Hash a file on disk with the same algorithm as compute_content_hash."""
+
+	digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+	with path.open('rb') as fp:
+		while chunk := fp.read(_READ_CHUNK_SIZE):
+			digest.update(chunk)
+	return digest.hexdigest()
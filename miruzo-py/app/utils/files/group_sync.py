@@ -0,0 +1,130 @@
+import os
+import sys
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from time import monotonic
+from typing import final
+
+from app.utils.files.atomic import fsync_dir
+
+if sys.platform == 'linux':
+	import ctypes
+
+	_libc = ctypes.CDLL(None, use_errno=True)
+	_syncfs: Callable[[int], int] | None = getattr(_libc, 'syncfs', None)
+
+	def _sync_filesystem(dir_path: Path) -> bool:
+		"""Flush the whole filesystem containing dir_path with one syncfs(2)."""
+
+		if _syncfs is None:
+			return False
+
+		fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+		try:
+			if _syncfs(fd) != 0:
+				error = ctypes.get_errno()
+				raise OSError(error, os.strerror(error), str(dir_path))
+		finally:
+			os.close(fd)
+		return True
+else:
+
+	def _sync_filesystem(dir_path: Path) -> bool:  # noqa: ARG001
+		return False
+
+
+def _fsync_file(path: Path) -> None:
+	try:
+		fd = os.open(path, os.O_RDONLY)
+	except FileNotFoundError:
+		# replaced or deleted since it was written
+		return
+
+	try:
+		os.fsync(fd)
+	finally:
+		os.close(fd)
+
+
+@final
+class GroupSync:
+	"""
+	Make written files durable in groups instead of one fsync pair per file.
+
+	Callers track the files each unit of work (an image) created or removed
+	and flush once should_flush() reports that max_units units or max_delay
+	seconds have accumulated; the flush must happen before the matching
+	database transaction commits.
+	"""
+
+	def __init__(
+		self,
+		*,
+		max_units: int,
+		max_delay: float,
+		clock: Callable[[], float] = monotonic,
+	) -> None:
+		if max_units < 1:
+			raise ValueError('max_units must be greater than or equal to 1')
+		if max_delay <= 0:
+			raise ValueError('max_delay must be greater than 0')
+
+		self._max_units = max_units
+		self._max_delay = max_delay
+		self._clock = clock
+
+		self._files: set[Path] = set()
+		self._units = 0
+		self._first_pending_at: float | None = None
+
+	@property
+	def pending_files(self) -> int:
+		return len(self._files)
+
+	def track(self, paths: Iterable[Path]) -> None:
+		"""Record the files written or removed by one unit of work."""
+
+		if self._first_pending_at is None:
+			self._first_pending_at = self._clock()
+		self._files.update(paths)
+		self._units += 1
+
+	def should_flush(self) -> bool:
+		if self._first_pending_at is None:
+			return False
+		if self._units >= self._max_units:
+			return True
+		return self._clock() - self._first_pending_at >= self._max_delay
+
+	def flush(self) -> None:
+		files = self._files
+		self._files = set()
+		self._units = 0
+		self._first_pending_at = None
+
+		dirs = {path.parent for path in files}
+
+		# one syncfs per filesystem covers file data and directory entries alike
+		synced_devices: set[int] = set()
+		unsynced_dirs: list[Path] = []
+		for dir_path in sorted(dirs):
+			try:
+				device = dir_path.stat().st_dev
+			except FileNotFoundError:
+				continue
+			if device in synced_devices:
+				continue
+			if _sync_filesystem(dir_path):
+				synced_devices.add(device)
+			else:
+				unsynced_dirs.append(dir_path)
+
+		if not unsynced_dirs:
+			return
+
+		pending_dirs = set(unsynced_dirs)
+		for path in sorted(files):
+			if path.parent in pending_dirs:
+				_fsync_file(path)
+		for dir_path in unsynced_dirs:
+			fsync_dir(dir_path)
@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+from collections.abc import Sequence
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from app.config.environments import DatabaseBackend, SQLiteProfile
+from app.databases.database import create_sqlite3_engine
+from app.databases.metadata import metadata
+from app.databases.sqlite_profile import checkpoint_wal, defer_secondary_indexes
+from app.models.enums import ImageKind
+from app.models.image import Image
+from app.models.ingest import MAX_EXECUTIONS
+from app.models.types import VariantEntry
+from app.persist.images.implementation import create_image_repository
+from app.persist.ingests.factory import create_ingest_repository_from_backend
+from app.persist.ingests.protocol import IngestCreateInput
+from app.persist.stats.implementation import create_stats_repository
+from app.persist.stats.protocol import StatsCreateInput
+
+# stand-ins for the secondary indexes the server migrations put on the imported tables
+_SECONDARY_INDEXES = (
+	'CREATE INDEX ix_images_latest ON images (ingested_at DESC, ingest_id DESC)',
+	'CREATE INDEX ix_ingests_chronological ON ingests (captured_at DESC, id DESC)',
+	'CREATE INDEX ix_stats_engaged ON stats (score_evaluated DESC, ingest_id DESC)',
+)
+_TABLES = ('ingests', 'images', 'stats')
+
+
+def parse_args() -> argparse.Namespace:
+	parser = argparse.ArgumentParser(
+		description='Measure how many ingest rows per second each SQLite pragma profile writes.',
+	)
+	parser.add_argument('--rows', type=int, default=20000, help='Images to write per profile.')
+	parser.add_argument('--batch-size', type=int, default=64, help='Images written per transaction.')
+	parser.add_argument(
+		'--directory',
+		type=Path,
+		default=None,
+		help='Directory for the database files (defaults to a temporary one); use the real disk to be meaningful.',
+	)
+	return parser.parse_args()
+
+
+def _build_variant(width: int, *, layer_id: int = 1) -> VariantEntry:
+	return {
+		'rel': f'l{layer_id}w{width}/bench.webp',
+		'layer_id': layer_id,
+		'format': 'webp',
+		'codecs': None,
+		'bytes': width * 40,
+		'width': width,
+		'height': round(width * 0.75),
+		'quality': 80,
+	}
+
+
+def _build_ingests(start: int, count: int, now: datetime) -> list[IngestCreateInput]:
+	return [
+		IngestCreateInput(
+			relative_path=f'l0orig/bench/{index:08d}.webp',
+			fingerprint=hashlib.sha256(index.to_bytes(8, 'big')).hexdigest(),
+			ingested_at=now,
+			captured_at=now - timedelta(seconds=index),
+		)
+		for index in range(start, start + count)
+	]
+
+
+def _write_batch(session: Session, entries: Sequence[IngestCreateInput], now: datetime) -> None:
+	ingest_ids = create_ingest_repository_from_backend(
+		session,
+		backend=DatabaseBackend.SQLITE,
+		max_executions=MAX_EXECUTIONS,
+	).create_many(entries)
+	create_stats_repository(session).create_many(
+		[StatsCreateInput(ingest_id=ingest_id, initial_score=100) for ingest_id in ingest_ids],
+	)
+	create_image_repository(session).create_many(
+		[
+			Image(
+				ingest_id=ingest_id,
+				ingested_at=now,
+				kind=ImageKind.PHOTO,
+				original=_build_variant(2048, layer_id=0),
+				fallback=None,
+				variants=[_build_variant(width) for width in (320, 480, 640, 960)],
+			)
+			for ingest_id in ingest_ids
+		],
+	)
+
+
+def _prepare_engine(path: Path, profile: SQLiteProfile) -> Engine:
+	engine = create_sqlite3_engine(f'sqlite:///{path}', profile=profile)
+	metadata.create_all(engine)
+	with engine.begin() as conn:
+		for sql in _SECONDARY_INDEXES:
+			conn.execute(text(sql))
+	return engine
+
+
+def benchmark_profile(path: Path, profile: SQLiteProfile, *, rows: int, batch_size: int) -> float:
+	"""Write rows images in batches the way the importer does and return the elapsed seconds."""
+
+	engine = _prepare_engine(path, profile)
+	now = datetime.now(timezone.utc)
+	bulk = profile == SQLiteProfile.BULK
+
+	def create_session() -> Session:
+		return Session(engine)
+
+	start = perf_counter()
+	with defer_secondary_indexes(create_session, _TABLES) if bulk else nullcontext():
+		with create_session() as session:
+			for offset in range(0, rows, batch_size):
+				_write_batch(session, _build_ingests(offset, min(batch_size, rows - offset), now), now)
+				session.commit()
+				if bulk:
+					checkpoint_wal(session)
+	engine.dispose()
+	return perf_counter() - start
+
+
+def main() -> None:
+	args = parse_args()
+	with TemporaryDirectory(dir=args.directory, prefix='miruzo-bench-') as directory:
+		for profile in SQLiteProfile:
+			seconds = benchmark_profile(
+				Path(directory) / f'{profile.value}.sqlite',
+				profile,
+				rows=args.rows,
+				batch_size=args.batch_size,
+			)
+			# every image writes an ingests, a stats and an images row
+			print(
+				f'[benchmark] profile={profile.value}: images={args.rows}, seconds={seconds:.2f}, '
+				f'images/s={args.rows / seconds:.0f}, rows/s={3 * args.rows / seconds:.0f}',
+			)
+
+
+if __name__ == '__main__':
+	main()
@@ -1,8 +1,11 @@
 import argparse
 
-from scripts.importers.common.importer import import_jsonl
+from scripts.importers.common.importer import DEFAULT_MEMORY_BUDGET, import_jsonl
+from scripts.importers.common.ordering import IdOrder, ImportOrder
 
+from app.databases.database import close_engine
 from app.models.enums import IngestMode
+from app.services.images.variants.types import DurableWrite
 
 _MODE_MAP = {
 	'copy': IngestMode.COPY,
@@ -17,6 +20,44 @@ def parse_ingest_mode(value: str) -> IngestMode:
 		raise argparse.ArgumentTypeError(f'Invalid mode: {value}') from exc
 
 
+_DURABLE_WRITE_MAP: dict[str, DurableWrite] = {
+	'off': False,
+	'on': True,
+	'batch': 'batch',
+}
+
+
+def parse_durable_write(value: str) -> DurableWrite:
+	try:
+		return _DURABLE_WRITE_MAP[value]
+	except KeyError as exc:
+		raise argparse.ArgumentTypeError(f'Invalid durable write mode: {value}') from exc
+
+
+def parse_import_order(value: str) -> ImportOrder:
+	try:
+		return ImportOrder(value)
+	except ValueError as exc:
+		raise argparse.ArgumentTypeError(f'Invalid order: {value}') from exc
+
+
+def parse_id_order(value: str) -> IdOrder:
+	try:
+		return IdOrder(value)
+	except ValueError as exc:
+		raise argparse.ArgumentTypeError(f'Invalid id order: {value}') from exc
+
+
+def parse_ssim_target(value: str) -> float:
+	try:
+		target = float(value)
+	except ValueError as exc:
+		raise argparse.ArgumentTypeError(f'Invalid SSIM target: {value}') from exc
+	if not 0 < target < 1:
+		raise argparse.ArgumentTypeError(f'SSIM target must be between 0 and 1: {value}')
+	return target
+
+
 def parse_args() -> argparse.Namespace:
 	parser = argparse.ArgumentParser(description='Import miruzo images from gataku JSONL outputs.')
 	parser.add_argument(
@@ -31,6 +72,122 @@ def parse_args() -> argparse.Namespace:
 		default=IngestMode.SYMLINK,
 		help='How to place images into the media directory. (copy|symlink)',
 	)
+	parser.add_argument(
+		'--order',
+		type=parse_import_order,
+		default=ImportOrder.JSONL,
+		help='Processing order. (jsonl|inode|extent; extent uses FIEMAP when available)',
+	)
+	parser.add_argument(
+		'--order-window',
+		type=int,
+		default=256,
+		help='With --id-order processing, number of resolved records buffered and reordered at a time.',
+	)
+	parser.add_argument(
+		'--id-order',
+		type=parse_id_order,
+		default=IdOrder.JSONL,
+		help=(
+			'Order ingest ids are assigned in. '
+			'(jsonl keeps the listing order and reorders within each batch; '
+			'processing follows --order across windows of --order-window)'
+		),
+	)
+	parser.add_argument(
+		'--workers',
+		type=int,
+		default=1,
+		help='Number of images whose variants are generated in parallel.',
+	)
+	parser.add_argument(
+		'--memory-budget-mb',
+		type=int,
+		default=DEFAULT_MEMORY_BUDGET // 1024**2,
+		help='Cap on estimated decoded image memory in flight across parallel workers.',
+	)
+	parser.add_argument(
+		'--batch-size',
+		type=int,
+		default=64,
+		help='Number of images processed and written to the database together.',
+	)
+	parser.add_argument(
+		'--bulk-load',
+		action='store_true',
+		help='Write each batch with the database bulk loader (PostgreSQL COPY, MySQL multi-row or LOAD DATA).',
+	)
+	parser.add_argument(
+		'--pipeline',
+		action='store_true',
+		help='Send each batch of row writes in psycopg pipeline mode (PostgreSQL only; not with --bulk-load).',
+	)
+	parser.add_argument(
+		'--defer-indexes',
+		action='store_true',
+		help=(
+			'Drop the secondary indexes of the imported tables for the run and rebuild them at the end '
+			'(SQLite only; readers go without them meanwhile).'
+		),
+	)
+	parser.add_argument(
+		'--image-timeout',
+		type=float,
+		default=None,
+		help='Generate variants in isolated worker processes, killing any image that takes longer (seconds).',
+	)
+	parser.add_argument(
+		'--image-memory-limit-mb',
+		type=int,
+		default=None,
+		help='With --image-timeout, also kill a worker whose RSS exceeds this limit (Linux only).',
+	)
+	parser.add_argument(
+		'--downscale-first',
+		action='store_true',
+		help='Resize before orientation, alpha flattening and sRGB conversion to cut peak memory.',
+	)
+	parser.add_argument(
+		'--durable-write',
+		type=parse_durable_write,
+		default=False,
+		help=(
+			'How written files are made crash-safe. '
+			'(off|on|batch; batch syncs files in groups and commits the database after each group)'
+		),
+	)
+	parser.add_argument(
+		'--sync-batch-images',
+		type=int,
+		default=64,
+		help='With --durable-write batch, flush after this many images.',
+	)
+	parser.add_argument(
+		'--sync-interval',
+		type=float,
+		default=5.0,
+		help='With --durable-write batch, flush at least this often (seconds).',
+	)
+	parser.add_argument(
+		'--ssim-target',
+		type=parse_ssim_target,
+		default=None,
+		help='Encode lossy WebP at the lowest quality reaching this SSIM (e.g. 0.95) instead of fixed qualities.',
+	)
+	parser.add_argument(
+		'--prune-threshold',
+		type=float,
+		default=None,
+		help=(
+			'Skip optional variants whose pixels-per-byte ratio against the next smaller variant '
+			'falls under this value (e.g. 0.5).'
+		),
+	)
+	parser.add_argument(
+		'--fast-encode',
+		action='store_true',
+		help='Encode with the fast profile and flag the variants for scripts/optimize_variants.py.',
+	)
 	parser.add_argument('--force', action='store_true', help='Skip confirmation prompts during import.')
 	parser.add_argument(
 		'--report-variants',
@@ -48,7 +205,29 @@ def main() -> None:
 		mode=args.mode,
 		force=args.force,
 		report_variants=args.report_variants,
+		order=args.order,
+		order_window=args.order_window,
+		id_order=args.id_order,
+		workers=args.workers,
+		memory_budget=args.memory_budget_mb * 1024**2,
+		batch_size=args.batch_size,
+		bulk_load=args.bulk_load,
+		pipeline=args.pipeline,
+		defer_indexes=args.defer_indexes,
+		image_timeout=args.image_timeout,
+		downscale_first=args.downscale_first,
+		durable_write=args.durable_write,
+		sync_batch_images=args.sync_batch_images,
+		sync_interval=args.sync_interval,
+		quality_target=args.ssim_target,
+		prune_threshold=args.prune_threshold,
+		fast_encode=args.fast_encode,
+		image_memory_limit=(
+			args.image_memory_limit_mb * 1024**2 if args.image_memory_limit_mb is not None else None
+		),
 	)
+	# closing the pool lets the SQLite bulk profile run PRAGMA optimize
+	close_engine()
 
 
 if __name__ == '__main__':
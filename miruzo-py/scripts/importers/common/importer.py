@@ -1,21 +1,46 @@
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import ExitStack, contextmanager
+from dataclasses import replace
 from pathlib import Path
 from shutil import rmtree
 
 from scripts.importers.common.ingest_time import resolve_captured_at
-from scripts.importers.common.origin import OriginResolver
+from scripts.importers.common.latency import LatencyHistogram
+from scripts.importers.common.models import GatakuImageRow
+from scripts.importers.common.ordering import (
+	IdOrder,
+	ImportOrder,
+	reorder_for_locality,
+	sort_indices_for_locality,
+)
+from scripts.importers.common.origin import OriginResolution, OriginResolver
 from scripts.importers.common.readers.jsonl import JsonlReader
 from scripts.importers.common.report import ImportStats, ProgressReporter
 
-from app.config.environments import Settings
+from app.config.environments import DatabaseBackend, Settings, SQLiteProfile
 from app.config.environments import env as global_env
+from app.config.variant import ARCHIVAL_ENCODER_PROFILE, FAST_ENCODER_PROFILE
 from app.databases.database import create_session
+from app.databases.sqlite_profile import defer_secondary_indexes, restore_secondary_indexes
 from app.domain.clock.system import create_system_clock
 from app.models.enums import IngestMode
 from app.persist.uow import UnitOfWork
-from app.services.images.ingest import ImageIngestService
+from app.services.images.ingest import ImageIngestOutcome, ImageIngestRequest, ImageIngestService
 from app.services.images.variants.bootstrap import configure_pillow
-from app.services.images.variants.types import DEFAULT_VARIANT_POLICY
+from app.services.images.variants.executors.executor import VariantExecutor
+from app.services.images.variants.executors.isolated import IsolatedVariantExecutor
+from app.services.images.variants.executors.local import LocalVariantExecutor
+from app.services.images.variants.icc import get_icc_transform_cache_stats
+from app.services.images.variants.scheduler import VariantScheduler
+from app.services.images.variants.types import DEFAULT_VARIANT_POLICY, DurableWrite
 from app.services.ingests.bootstrap import ensure_ingest_layout
+from app.utils.files.group_sync import GroupSync
+
+DEFAULT_MEMORY_BUDGET = 2 * 1024**3
+
+# tables written by the importer whose plain indexes the SQLite bulk profile rebuilds afterwards
+_DEFERRED_INDEX_TABLES = ('ingests', 'images', 'stats', 'ingest_executions')
 
 
 def confirm_overwrite(path: Path, *, force: bool) -> None:
@@ -74,6 +99,102 @@ def prepare_original_directory(
 	print(f'[importer] linked {original_dir} -> {gataku_assets_root}')
 
 
+def _read_resolved_rows(
+	reader: JsonlReader,
+	resolver: OriginResolver,
+	stats: ImportStats,
+	*,
+	limit: int,
+) -> Iterator[tuple[GatakuImageRow, OriginResolution]]:
+	for row in reader.read(limit=limit):
+		stats.read += 1
+
+		if row is None:
+			stats.invalid += 1
+			continue  # skip invalid JSON
+
+		resolution = resolver.resolve(row)
+		if resolution is None:
+			stats.missing += 1
+			continue  # image not found or invalid path
+
+		yield row, resolution
+
+
+def _locate_origin(resolution: OriginResolution) -> tuple[Path, os.stat_result]:
+	return resolution.src_path, resolution.src_stat
+
+
+def _ingest_batch(
+	ingest: ImageIngestService,
+	batch: Sequence[ImageIngestRequest],
+	resolutions: Sequence[OriginResolution],
+	*,
+	scheduler: VariantScheduler | None,
+	order: ImportOrder,
+	id_order: IdOrder,
+) -> Sequence[ImageIngestOutcome]:
+	# with JSONL id order the batch is read in locality order but written as listed
+	process_order = (
+		sort_indices_for_locality(resolutions, order=order, locate=_locate_origin)
+		if id_order == IdOrder.JSONL
+		else None
+	)
+	return ingest.ingest_many(
+		batch,
+		scheduler=scheduler,
+		skip_existing=True,
+		process_order=process_order,
+	)
+
+
+def _report_outcomes(
+	outcomes: Sequence[ImageIngestOutcome],
+	*,
+	requested: int,
+	stats: ImportStats,
+	reporter: ProgressReporter,
+	limit: int,
+) -> None:
+	# images already in the database are left out of the outcomes
+	stats.existing += requested - len(outcomes)
+
+	for outcome in outcomes:
+		stats.ingested += 1
+
+		reporter.maybe_report_variants(outcome)
+		reporter.report_progress(stats, force=stats.read == limit)
+
+
+def _end_batch(group_sync: GroupSync | None, uow: UnitOfWork, *, checkpoint: bool) -> None:
+	"""
+	Commit at a batch boundary when something asks for it.
+
+	A due group of written files is flushed before the rows that reference
+	them are committed. With checkpoint set, every batch is committed and the
+	WAL is checkpointed right after, so it never grows past one batch.
+	"""
+
+	if group_sync is not None:
+		if not group_sync.should_flush():
+			return
+		group_sync.flush()
+	elif not checkpoint:
+		return
+
+	uow.commit()
+	if checkpoint:
+		uow.checkpoint()
+
+
+@contextmanager
+def _measure_store(uow: UnitOfWork, latency: LatencyHistogram) -> Iterator[None]:
+	"""Time one batch of row writes, pipelined when the unit of work allows it."""
+
+	with latency.measure(), uow.pipeline():
+		yield
+
+
 def import_jsonl(
 	jsonl_path: str,
 	limit: int,
@@ -81,8 +202,36 @@ def import_jsonl(
 	force: bool,
 	report_variants: bool = False,
 	env: Settings = global_env,
+	order: ImportOrder = ImportOrder.JSONL,
+	order_window: int = 256,
+	id_order: IdOrder = IdOrder.JSONL,
+	workers: int = 1,
+	memory_budget: int = DEFAULT_MEMORY_BUDGET,
+	batch_size: int = 64,
+	bulk_load: bool = False,
+	pipeline: bool = False,
+	defer_indexes: bool = False,
+	image_timeout: float | None = None,
+	image_memory_limit: int | None = None,
+	downscale_first: bool = False,
+	durable_write: DurableWrite = False,
+	sync_batch_images: int = 64,
+	sync_interval: float = 5.0,
+	quality_target: float | None = None,
+	prune_threshold: float | None = None,
+	fast_encode: bool = False,
 ) -> None:
-	"""Read gataku JSONL data, populate the database, and copy/symlink assets plus thumbnails."""
+	"""
+	Read gataku JSONL data, populate the database, and copy/symlink assets plus thumbnails.
+
+	order decides the order images are read and processed in. With JSONL
+	id_order, ingest ids still follow the JSONL listing and each batch is
+	reordered on its own; with PROCESSING id_order, rows are reordered in
+	windows of order_window and ids follow the processing order.
+
+	defer_indexes drops the secondary indexes of the imported SQLite tables
+	for the run; readers go without them until the rebuild at the end.
+	"""
 
 	gataku_assets_root = env.gataku_assets_root
 
@@ -98,6 +247,7 @@ def import_jsonl(
 
 	clock = create_system_clock()
 	stats = ImportStats()
+	write_latency = LatencyHistogram()
 	warned_created_at_fallback = False
 	reporter = ProgressReporter(report_variants=report_variants)
 	reader = JsonlReader(Path(jsonl_path))
@@ -105,27 +255,80 @@ def import_jsonl(
 		gataku_root=env.gataku_root,
 		gataku_assets_root=gataku_assets_root,
 	)
+	resolved_rows: Iterable[tuple[GatakuImageRow, OriginResolution]] = _read_resolved_rows(
+		reader,
+		resolver,
+		stats,
+		limit=limit,
+	)
+	if id_order == IdOrder.PROCESSING:
+		resolved_rows = reorder_for_locality(
+			resolved_rows,
+			order=order,
+			window=order_window,
+			locate=lambda item: _locate_origin(item[1]),
+		)
+	scheduler = VariantScheduler(max_workers=workers, memory_budget=memory_budget) if workers > 1 else None
+
+	executor: VariantExecutor
+	if image_timeout is not None:
+		executor = IsolatedVariantExecutor(
+			timeout=image_timeout,
+			memory_limit=image_memory_limit,
+			downscale_first=downscale_first,
+		)
+	else:
+		executor = LocalVariantExecutor(downscale_first=downscale_first)
+
+	policy = replace(
+		DEFAULT_VARIANT_POLICY,
+		durable_write=durable_write,
+		quality_target=quality_target,
+		prune_threshold=prune_threshold,
+		encoder_profile=FAST_ENCODER_PROFILE if fast_encode else ARCHIVAL_ENCODER_PROFILE,
+	)
+	sqlite_bulk = (
+		env.database_backend == DatabaseBackend.SQLITE and env.sqlite_profile == SQLiteProfile.BULK
+	)
+	group_sync = (
+		GroupSync(max_units=sync_batch_images, max_delay=sync_interval)
+		if durable_write == 'batch'
+		else None
+	)
+
+	with (
+		ExitStack() as stack,
+		UnitOfWork(
+			session_factory=create_session,
+			bulk_load=bulk_load,
+			pipeline=pipeline,
+		) as uow,
+	):
+		if isinstance(executor, IsolatedVariantExecutor):
+			stack.enter_context(executor)
+		with create_session() as session:
+			# a previous run killed with deferred indexes left them dropped
+			restore_secondary_indexes(session.connection())
+			session.commit()
+		if defer_indexes:
+			# the unit of work has not touched the database yet, and it
+			# commits before the stack rebuilds the indexes
+			stack.enter_context(defer_secondary_indexes(create_session, _DEFERRED_INDEX_TABLES))
 
-	with UnitOfWork(session_factory=create_session) as uow:
 		ingest = ImageIngestService(
 			repos=uow.repositories,
 			clock=clock,
-			policy=DEFAULT_VARIANT_POLICY,
+			policy=policy,
 			initial_score=env.score.initial_score,
+			executor=executor,
+			group_sync=group_sync,
+			log_executions=env.ingest_execution_log,
+			store_scope=lambda: _measure_store(uow, write_latency),
 		)
 
-		for row in reader.read(limit=limit):
-			stats.read += 1
-
-			if row is None:
-				stats.invalid += 1
-				continue  # skip invalid JSON
-
-			resolution = resolver.resolve(row)
-			if resolution is None:
-				stats.missing += 1
-				continue  # image not found or invalid path
-
+		batch: list[ImageIngestRequest] = []
+		resolutions: list[OriginResolution] = []
+		for row, resolution in resolved_rows:
 			src_path = resolution.src_path
 			origin_relative_path = resolution.origin_relative_path
 
@@ -133,19 +336,65 @@ def import_jsonl(
 				created_at_value=row.created_at,
 				src_path=src_path,
 				warned_fallback=warned_created_at_fallback,
+				src_stat=resolution.src_stat,
 			)
 			if used_fallback:
 				stats.fallback += 1
 
-			entry = ingest.ingest(
+			request = ImageIngestRequest(
 				origin_path=origin_relative_path,
 				fingerprint=row.sha256,
 				captured_at=captured_at,
 				ingest_mode=mode,
+				origin_stat=resolution.src_stat,
+			)
+
+			# rows are written once per batch, so buffer even without a scheduler
+			batch.append(request)
+			resolutions.append(resolution)
+			if len(batch) >= batch_size:
+				outcomes = _ingest_batch(
+					ingest,
+					batch,
+					resolutions,
+					scheduler=scheduler,
+					order=order,
+					id_order=id_order,
+				)
+				_report_outcomes(
+					outcomes,
+					requested=len(batch),
+					stats=stats,
+					reporter=reporter,
+					limit=limit,
+				)
+				_end_batch(group_sync, uow, checkpoint=sqlite_bulk)
+				batch = []
+				resolutions = []
+
+		if batch:
+			outcomes = _ingest_batch(
+				ingest,
+				batch,
+				resolutions,
+				scheduler=scheduler,
+				order=order,
+				id_order=id_order,
+			)
+			_report_outcomes(
+				outcomes,
+				requested=len(batch),
+				stats=stats,
+				reporter=reporter,
+				limit=limit,
 			)
-			stats.ingested += 1
 
-			reporter.maybe_report_variants(entry)
-			reporter.report_progress(stats, force=stats.read == limit)
+		# the unit of work commits on exit; make the remaining files durable first
+		if group_sync is not None:
+			group_sync.flush()
 
 	reporter.report_summary(stats)
+	reporter.report_latency('database write', write_latency)
+	if not isinstance(executor, IsolatedVariantExecutor):
+		# isolated workers keep their own caches, which are not visible here
+		reporter.report_icc_cache(get_icc_transform_cache_stats())
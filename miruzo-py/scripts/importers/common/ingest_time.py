@@ -1,3 +1,4 @@
+import os
 from datetime import datetime, timezone
 from logging import getLogger
 from pathlib import Path
@@ -5,17 +6,24 @@ from pathlib import Path
 log = getLogger(__name__)
 
 
+def _read_mtime(src_path: Path, src_stat: os.stat_result | None) -> datetime:
+	if src_stat is None:
+		src_stat = src_path.stat()
+	return datetime.fromtimestamp(src_stat.st_mtime, tz=timezone.utc)
+
+
 def resolve_captured_at(
 	*,
 	created_at_value: str | None,
 	src_path: Path,
 	warned_fallback: bool,
+	src_stat: os.stat_result | None = None,
 ) -> tuple[datetime, bool, bool]:
 	if created_at_value:
 		try:
 			return datetime.fromisoformat(created_at_value), False, warned_fallback
 		except Exception:
-			captured_at = datetime.fromtimestamp(src_path.stat().st_mtime, tz=timezone.utc)
+			captured_at = _read_mtime(src_path, src_stat)
 			if not warned_fallback:
 				log.warning(
 					'invalid created_at detected; falling back to file mtime for subsequent entries',
@@ -23,7 +31,7 @@ def resolve_captured_at(
 				warned_fallback = True
 			return captured_at, True, warned_fallback
 
-	captured_at = datetime.fromtimestamp(src_path.stat().st_mtime, tz=timezone.utc)
+	captured_at = _read_mtime(src_path, src_stat)
 	if not warned_fallback:
 		log.warning('missing created_at detected; falling back to file mtime for subsequent entries')
 		warned_fallback = True
@@ -0,0 +1,47 @@
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import monotonic
+
+# upper bounds in milliseconds; anything slower lands in the last bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+	samples: list[float] = field(default_factory=list)
+	"""Recorded latencies in seconds."""
+
+	def record(self, seconds: float) -> None:
+		self.samples.append(seconds)
+
+	@contextmanager
+	def measure(self) -> Iterator[None]:
+		"""Record how long the block takes, unless it raises."""
+
+		start = monotonic()
+		yield
+		self.record(monotonic() - start)
+
+	@property
+	def count(self) -> int:
+		return len(self.samples)
+
+	def percentile(self, fraction: float) -> float:
+		"""Return the nearest-rank percentile in seconds."""
+
+		if not self.samples:
+			raise ValueError('histogram is empty')
+
+		ordered = sorted(self.samples)
+		rank = max(1, round(fraction * len(ordered)))
+		return ordered[min(rank, len(ordered)) - 1]
+
+	def bucket_counts(self) -> list[int]:
+		"""Count samples per LATENCY_BUCKETS_MS bucket, plus one overflow bucket."""
+
+		counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+		for seconds in self.samples:
+			counts[bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+		return counts
@@ -0,0 +1,131 @@
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar, final
+
+_T = TypeVar('_T')
+
+_NO_PHYSICAL_OFFSET = sys.maxsize
+
+
+@final
+class ImportOrder(str, Enum):
+	JSONL = 'jsonl'
+	INODE = 'inode'
+	EXTENT = 'extent'
+
+
+@final
+class IdOrder(str, Enum):
+	JSONL = 'jsonl'
+	PROCESSING = 'processing'
+
+
+if sys.platform == 'linux':
+	import fcntl
+	import struct
+
+	# _IOWR('f', 11, struct fiemap)
+	_FS_IOC_FIEMAP = 0xC020660B
+	_FIEMAP_MAX_OFFSET = 0xFFFFFFFFFFFFFFFF
+
+	# struct fiemap: fm_start, fm_length, fm_flags, fm_mapped_extents, fm_extent_count, fm_reserved
+	_FIEMAP_HEADER = struct.Struct('=QQIIII')
+	# struct fiemap_extent: fe_logical, fe_physical, fe_length, fe_reserved64[2], fe_flags, fe_reserved[3]
+	_FIEMAP_EXTENT = struct.Struct('=QQQ2QI3I')
+
+	def _read_physical_offset(path: Path) -> int | None:
+		"""Return the physical byte offset of the first extent, or None when unknown."""
+
+		buffer = bytearray(_FIEMAP_HEADER.size + _FIEMAP_EXTENT.size)
+		_FIEMAP_HEADER.pack_into(buffer, 0, 0, _FIEMAP_MAX_OFFSET, 0, 0, 1, 0)
+
+		try:
+			fd = os.open(path, os.O_RDONLY)
+		except OSError:
+			return None
+
+		try:
+			fcntl.ioctl(fd, _FS_IOC_FIEMAP, buffer)
+		except OSError:
+			# e.g. tmpfs / network filesystems without FIEMAP support
+			return None
+		finally:
+			os.close(fd)
+
+		mapped_extents = _FIEMAP_HEADER.unpack_from(buffer)[3]
+		if mapped_extents == 0:
+			return None
+
+		return _FIEMAP_EXTENT.unpack_from(buffer, _FIEMAP_HEADER.size)[1]
+else:
+
+	def _read_physical_offset(path: Path) -> int | None:  # noqa: ARG001
+		return None
+
+
+def _build_locality_key(
+	src_path: Path,
+	src_stat: os.stat_result,
+	*,
+	order: ImportOrder,
+) -> tuple[int, int, str, int]:
+	if order == ImportOrder.EXTENT:
+		offset = _read_physical_offset(src_path)
+		physical = offset if offset is not None else _NO_PHYSICAL_OFFSET
+	else:
+		physical = _NO_PHYSICAL_OFFSET
+
+	return (src_stat.st_dev, physical, src_path.parent.as_posix(), src_stat.st_ino)
+
+
+def sort_indices_for_locality(
+	items: Sequence[_T],
+	*,
+	order: ImportOrder,
+	locate: Callable[[_T], tuple[Path, os.stat_result]],
+) -> list[int]:
+	"""
+	Return the indices of items in the order they are best read in.
+
+	Unlike reorder_for_locality the items stay where they are, so callers can
+	read them in locality order and still write them in their original order.
+	"""
+
+	if order == ImportOrder.JSONL:
+		return list(range(len(items)))
+
+	keys = [_build_locality_key(*locate(item), order=order) for item in items]
+	return sorted(range(len(items)), key=keys.__getitem__)
+
+
+def reorder_for_locality(
+	items: Iterable[_T],
+	*,
+	order: ImportOrder,
+	window: int,
+	locate: Callable[[_T], tuple[Path, os.stat_result]],
+) -> Iterator[_T]:
+	"""
+	Reorder items within fixed-size windows to improve read locality.
+
+	Items are buffered `window` at a time and sorted by device, physical extent
+	(EXTENT order, when FIEMAP is available), parent directory and inode.
+	JSONL order passes items through untouched.
+	"""
+
+	if order == ImportOrder.JSONL or window <= 1:
+		yield from items
+		return
+
+	iterator = iter(items)
+	while True:
+		chunk = list(islice(iterator, window))
+		if not chunk:
+			return
+
+		chunk.sort(key=lambda item: _build_locality_key(*locate(item), order=order))
+		yield from chunk
@@ -1,3 +1,6 @@
+import os
+import stat
+from collections import OrderedDict
 from dataclasses import dataclass
 from logging import getLogger
 from pathlib import Path
@@ -6,24 +9,73 @@ from scripts.importers.common.models import GatakuImageRow
 
 log = getLogger(__name__)
 
+# directory entries kept across listings; the most recently used directory stays cached even when larger
+DEFAULT_MAX_CACHED_ENTRIES = 65536
+
 
 @dataclass(frozen=True, slots=True)
-class _OriginResolution:
+class OriginResolution:
 	src_path: Path
+	src_stat: os.stat_result
 	origin_relative_path: Path
 
 
 class OriginResolver:
-	def __init__(self, *, gataku_root: Path, gataku_assets_root: Path) -> None:
+	def __init__(
+		self,
+		*,
+		gataku_root: Path,
+		gataku_assets_root: Path,
+		max_cached_entries: int = DEFAULT_MAX_CACHED_ENTRIES,
+	) -> None:
 		self._gataku_root = gataku_root
 		self._gataku_assets_root = gataku_assets_root
+		self._max_cached_entries = max_cached_entries
+		self._entries_by_dir: OrderedDict[Path, dict[str, os.DirEntry[str]]] = OrderedDict()
+		self._cached_entries = 0
+
+	def _list_directory(self, dir_path: Path) -> dict[str, os.DirEntry[str]]:
+		"""
+		List a directory once and cache its entries by name.
+
+		Listings are evicted least recently used first once more than
+		max_cached_entries entries are cached, so memory stays bounded while
+		rows from the same directory keep hitting the cache.
+		"""
+
+		entries = self._entries_by_dir.get(dir_path)
+		if entries is not None:
+			self._entries_by_dir.move_to_end(dir_path)
+			return entries
+
+		try:
+			with os.scandir(dir_path) as it:
+				entries = {entry.name: entry for entry in it}
+		except OSError:
+			entries = {}
+
+		self._entries_by_dir[dir_path] = entries
+		self._cached_entries += len(entries)
+		while self._cached_entries > self._max_cached_entries and len(self._entries_by_dir) > 1:
+			_, evicted = self._entries_by_dir.popitem(last=False)
+			self._cached_entries -= len(evicted)
+
+		return entries
+
+	def _stat_origin(self, src_path: Path) -> os.stat_result | None:
+		entry = self._list_directory(src_path.parent).get(src_path.name)
+		if entry is None:
+			return None
 
-	def resolve(self, row: GatakuImageRow) -> _OriginResolution | None:
+		# DirEntry caches the result, so each origin is stat'ed at most once.
+		try:
+			return entry.stat()
+		except OSError:
+			return None
+
+	def resolve(self, row: GatakuImageRow) -> OriginResolution | None:
 		raw_path = row.filepath
 		src_path = raw_path if raw_path.is_absolute() else self._gataku_root / raw_path
-		if not src_path.exists():
-			log.warning(f'missing file: {src_path}')
-			return None
 
 		try:
 			origin_relative_path = src_path.relative_to(self._gataku_assets_root)
@@ -31,7 +83,17 @@ class OriginResolver:
 			log.warning(f'file outside assets root: {src_path}')
 			return None
 
-		return _OriginResolution(
+		src_stat = self._stat_origin(src_path)
+		if src_stat is None:
+			log.warning(f'missing file: {src_path}')
+			return None
+
+		if not stat.S_ISREG(src_stat.st_mode):
+			log.warning(f'not a file: {src_path}')
+			return None
+
+		return OriginResolution(
 			src_path=src_path,
+			src_stat=src_stat,
 			origin_relative_path=origin_relative_path,
 		)
@@ -1,14 +1,18 @@
 from dataclasses import dataclass
 from typing import IO
 
+from scripts.importers.common.latency import LATENCY_BUCKETS_MS, LatencyHistogram
+
 from app.models.image import Image
 from app.models.ingest import Ingest
+from app.services.images.variants.icc import IccTransformCacheStats
 
 
 @dataclass(slots=True)
 class ImportStats:
 	read: int = 0
 	ingested: int = 0
+	existing: int = 0
 	invalid: int = 0
 	missing: int = 0
 	fallback: int = 0
@@ -43,6 +47,7 @@ class ProgressReporter:
 		self._report_variants = report_variants
 		self._stream = stream
 		self._progress_interval = progress_interval
+		self._last_progress_read: int | None = None
 
 	def _write(self, line: str) -> None:
 		if self._stream is None:
@@ -50,11 +55,14 @@ class ProgressReporter:
 			return
 		print(line, file=self._stream)
 
-	def maybe_report_variants(self, entry: tuple[Ingest, Image]) -> None:
+	def maybe_report_variants(self, entry: tuple[Ingest, Image | None]) -> None:
 		if not self._report_variants:
 			return
 
 		ingest, image = entry
+		if image is None:
+			self._write(f'[importer] variant report ({ingest.relative_path}): failed')
+			return
 
 		self._write(f'[importer] variant report ({ingest.relative_path}):')
 		header = f'{"Label":<10} {"Resolution":<12} {"Size":>10} {"Ratio":<12}'
@@ -91,9 +99,13 @@ class ProgressReporter:
 	def report_progress(self, stats: ImportStats, *, force: bool = False) -> None:
 		if not force and stats.read % self._progress_interval != 0:
 			return
+		# reordered imports may ingest several rows per read count
+		if stats.read == self._last_progress_read:
+			return
+		self._last_progress_read = stats.read
 		line = (
 			'[importer] progress: '
-			f'read={stats.read}, ingested={stats.ingested}, invalid={stats.invalid}, '
+			f'read={stats.read}, ingested={stats.ingested}, existing={stats.existing}, invalid={stats.invalid}, '
 			f'missing={stats.missing}, fallback={stats.fallback}'
 		)
 		self._write(line)
@@ -101,7 +113,30 @@ class ProgressReporter:
 	def report_summary(self, stats: ImportStats) -> None:
 		line = (
 			'[importer] summary: '
-			f'read={stats.read}, ingested={stats.ingested}, invalid={stats.invalid}, '
+			f'read={stats.read}, ingested={stats.ingested}, existing={stats.existing}, invalid={stats.invalid}, '
 			f'missing={stats.missing}, fallback={stats.fallback}'
 		)
 		self._write(line)
+
+	def report_latency(self, label: str, histogram: LatencyHistogram) -> None:
+		if histogram.count == 0:
+			return
+
+		percentiles = ', '.join(
+			f'{name}={histogram.percentile(fraction) * 1000:.1f}ms'
+			for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))
+		)
+		self._write(f'[importer] {label} latency: count={histogram.count}, {percentiles}')
+
+		bounds = [f'<={bound}ms' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms']
+		buckets = ', '.join(
+			f'{bound}: {count}'
+			for bound, count in zip(bounds, histogram.bucket_counts(), strict=True)
+			if count > 0
+		)
+		self._write(f'[importer] {label} histogram: {buckets}')
+
+	def report_icc_cache(self, stats: IccTransformCacheStats) -> None:
+		self._write(
+			f'[importer] icc transforms: hits={stats.hits}, misses={stats.misses}, cached={stats.size}',
+		)
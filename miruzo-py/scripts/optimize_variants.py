@@ -0,0 +1,57 @@
+import argparse
+
+from app.databases.database import create_session
+from app.persist.uow import UnitOfWork
+from app.services.images.optimize import ImageOptimizeService
+from app.services.images.variants.bootstrap import configure_pillow
+from app.services.images.variants.types import DEFAULT_VARIANT_POLICY
+
+
+def parse_args() -> argparse.Namespace:
+	parser = argparse.ArgumentParser(
+		description='Re-encode fast-profile variants of the most served images with the archival profile.',
+	)
+	parser.add_argument(
+		'--limit',
+		type=int,
+		default=1000,
+		help='Maximum number of images to scan, by score.',
+	)
+	parser.add_argument(
+		'--batch-size',
+		type=int,
+		default=64,
+		help='Images to scan per query; the database is committed after each batch.',
+	)
+	return parser.parse_args()
+
+
+def optimize_variants(*, limit: int, batch_size: int) -> None:
+	configure_pillow()
+
+	scanned = 0
+	optimized = 0
+	with UnitOfWork(session_factory=create_session) as uow:
+		service = ImageOptimizeService(uow.repositories.image, policy=DEFAULT_VARIANT_POLICY)
+
+		while scanned < limit:
+			entries = service.list_candidates(limit=min(batch_size, limit - scanned), offset=scanned)
+			if not entries:
+				break
+
+			for entry in entries:
+				if service.optimize(entry):
+					optimized += 1
+			scanned += len(entries)
+
+			uow.commit()
+			print(f'[optimizer] scanned={scanned} optimized={optimized}')
+
+
+def main() -> None:
+	args = parse_args()
+	optimize_variants(limit=args.limit, batch_size=args.batch_size)
+
+
+if __name__ == '__main__':
+	main()
@@ -6,8 +6,9 @@ from types import ModuleType
 from typing import Any
 
 import pytest
-from sqlalchemy import URL
+from sqlalchemy import URL, text
 from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
 
 import app.databases.database as database_module
 
@@ -204,10 +205,18 @@ def test_create_postgres_engine_raises_runtime_error_when_psycopg_missing(
 	],
 )
 def test_create_sqlite_engine_accepts_supported_dsn(dsn: str) -> None:
-	engine = database_module._create_sqlite3_engine(dsn, pool_size=1)
+	engine = database_module.create_sqlite3_engine(dsn, pool_size=1)
 	assert engine is not None
 
 
+def test_open_pipeline_is_noop_for_sqlite() -> None:
+	engine = database_module.create_sqlite3_engine('sqlite:///:memory:', pool_size=1)
+
+	with Session(engine) as session, database_module.open_pipeline(session) as pipeline:
+		assert pipeline is None
+		assert session.execute(text('SELECT 1')).scalar_one() == 1
+
+
 def test_create_sqlite_engine_rejects_unsupported_dsn() -> None:
 	with pytest.raises(RuntimeError, match='Unsupported SQLite DSN'):
-		database_module._create_sqlite3_engine('sqlite+aiosqlite:///:memory:')
+		database_module.create_sqlite3_engine('sqlite+aiosqlite:///:memory:')
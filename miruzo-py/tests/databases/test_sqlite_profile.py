@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from app.config.environments import SQLiteProfile
+from app.databases.database import create_sqlite3_engine
+from app.databases.sqlite_profile import checkpoint_wal, defer_secondary_indexes, restore_secondary_indexes
+
+
+def _list_indexes(session: Session) -> list[str]:
+	rows = session.execute(text("SELECT name FROM sqlite_master WHERE type='index' AND sql IS NOT NULL"))
+	return sorted(rows.scalars())
+
+
+@pytest.mark.parametrize(
+	('profile', 'expected_autocheckpoint', 'expected_mmap_size'),
+	[
+		(SQLiteProfile.SERVE, 100, 268435456),
+		(SQLiteProfile.BULK, 10000, 0),
+	],
+)
+def test_create_sqlite_engine_applies_profile_pragmas(
+	tmp_path: Path,
+	profile: SQLiteProfile,
+	expected_autocheckpoint: int,
+	expected_mmap_size: int,
+) -> None:
+	engine = create_sqlite3_engine(f'sqlite:///{tmp_path / "profile.sqlite"}', profile=profile)
+
+	with engine.connect() as conn:
+		assert conn.exec_driver_sql('PRAGMA foreign_keys').scalar_one() == 1
+		assert conn.exec_driver_sql('PRAGMA synchronous').scalar_one() == 1  # NORMAL
+		assert conn.exec_driver_sql('PRAGMA temp_store').scalar_one() == 2  # MEMORY
+		assert conn.exec_driver_sql('PRAGMA wal_autocheckpoint').scalar_one() == expected_autocheckpoint
+		assert conn.exec_driver_sql('PRAGMA mmap_size').scalar_one() == expected_mmap_size
+
+	engine.dispose()
+
+
+def test_checkpoint_wal_truncates_the_wal(tmp_path: Path) -> None:
+	path = tmp_path / 'checkpoint.sqlite'
+	engine = create_sqlite3_engine(f'sqlite:///{path}', profile=SQLiteProfile.BULK)
+
+	with Session(engine) as session:
+		session.execute(text('CREATE TABLE t (v INTEGER)'))
+		session.execute(text('INSERT INTO t VALUES (1)'))
+		session.commit()
+		assert Path(f'{path}-wal').stat().st_size > 0
+
+		checkpoint_wal(session)
+
+		assert Path(f'{path}-wal').stat().st_size == 0
+
+	engine.dispose()
+
+
+def _create_schema(engine: Engine, *, migration_version: int | None = None) -> None:
+	with engine.begin() as conn:
+		conn.exec_driver_sql('CREATE TABLE images (ingest_id INTEGER PRIMARY KEY, ingested_at TEXT)')
+		conn.exec_driver_sql(
+			'CREATE TABLE ingests (id INTEGER PRIMARY KEY, fingerprint TEXT, captured_at TEXT)',
+		)
+		conn.exec_driver_sql(
+			'CREATE TABLE stats (ingest_id INTEGER PRIMARY KEY, score_evaluated INTEGER, '
+			'last_viewed_at TEXT, first_loved_at TEXT, hall_of_fame_at TEXT)',
+		)
+		conn.exec_driver_sql(
+			'CREATE TABLE ingest_executions (ingest_id INTEGER, status INTEGER, executed_at TEXT)',
+		)
+		conn.exec_driver_sql('CREATE UNIQUE INDEX uq_ingests_fingerprint ON ingests (fingerprint)')
+		conn.exec_driver_sql('CREATE INDEX ix_images_latest ON images (ingested_at DESC, ingest_id DESC)')
+		conn.exec_driver_sql('CREATE INDEX ix_ingests_chronological ON ingests (captured_at DESC, id DESC)')
+		conn.exec_driver_sql('CREATE INDEX ix_images_custom ON images (ingested_at)')
+		if migration_version is not None:
+			conn.exec_driver_sql('CREATE TABLE schema_migrations (version uint64, dirty bool)')
+			conn.exec_driver_sql(f'INSERT INTO schema_migrations VALUES ({migration_version}, 0)')
+
+
+def test_defer_secondary_indexes_rebuilds_known_indexes(tmp_path: Path) -> None:
+	engine = create_sqlite3_engine(f'sqlite:///{tmp_path / "indexes.sqlite"}')
+	_create_schema(engine)
+
+	def create_session() -> Session:
+		return Session(engine)
+
+	with defer_secondary_indexes(create_session, ['images', 'ingests']):
+		with create_session() as session:
+			# unknown and unique indexes are never dropped
+			assert _list_indexes(session) == ['ix_images_custom', 'uq_ingests_fingerprint']
+
+	with create_session() as session:
+		assert _list_indexes(session) == [
+			'ix_images_custom',
+			'ix_images_latest',
+			'ix_ingests_chronological',
+			'uq_ingests_fingerprint',
+		]
+
+	engine.dispose()
+
+
+def test_defer_secondary_indexes_rebuilds_after_failure(tmp_path: Path) -> None:
+	engine = create_sqlite3_engine(f'sqlite:///{tmp_path / "failure.sqlite"}')
+	_create_schema(engine)
+
+	def create_session() -> Session:
+		return Session(engine)
+
+	with pytest.raises(RuntimeError, match='boom'), defer_secondary_indexes(create_session, ['images']):
+		raise RuntimeError('boom')
+
+	with create_session() as session:
+		assert 'ix_images_latest' in _list_indexes(session)
+
+	engine.dispose()
+
+
+@pytest.mark.parametrize(
+	('migration_version', 'restored'),
+	[(4, True), (None, False)],
+)
+def test_engine_start_restores_indexes_of_a_killed_import(
+	tmp_path: Path,
+	migration_version: int | None,
+	restored: bool,
+) -> None:
+	dsn = f'sqlite:///{tmp_path / "killed.sqlite"}'
+	engine = create_sqlite3_engine(dsn)
+	_create_schema(engine, migration_version=migration_version)
+	with engine.begin() as conn:
+		# what a run killed inside defer_secondary_indexes leaves behind
+		conn.exec_driver_sql('DROP INDEX ix_images_latest')
+		conn.exec_driver_sql('DROP INDEX ix_ingests_chronological')
+	engine.dispose()
+
+	engine = create_sqlite3_engine(dsn)
+	with Session(engine) as session:
+		indexes = _list_indexes(session)
+		assert ('ix_images_latest' in indexes) is restored
+		assert ('ix_ingests_chronological' in indexes) is restored
+
+		# replaying the pass is a no-op
+		restore_secondary_indexes(session.connection())
+		session.commit()
+
+	engine.dispose()
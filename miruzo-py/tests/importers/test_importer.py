@@ -2,7 +2,8 @@ import argparse
 
 import pytest
 
-from scripts.gataku_import import parse_ingest_mode
+from scripts.gataku_import import parse_id_order, parse_import_order, parse_ingest_mode
+from scripts.importers.common.ordering import IdOrder, ImportOrder
 
 from app.models.enums import IngestMode
 
@@ -15,3 +16,24 @@ def test_parse_ingest_mode_accepts_known_values() -> None:
 def test_parse_ingest_mode_rejects_invalid_value() -> None:
 	with pytest.raises(argparse.ArgumentTypeError, match='Invalid mode'):
 		parse_ingest_mode('bogus')
+
+
+def test_parse_import_order_accepts_known_values() -> None:
+	assert parse_import_order('jsonl') == ImportOrder.JSONL
+	assert parse_import_order('inode') == ImportOrder.INODE
+	assert parse_import_order('extent') == ImportOrder.EXTENT
+
+
+def test_parse_import_order_rejects_invalid_value() -> None:
+	with pytest.raises(argparse.ArgumentTypeError, match='Invalid order'):
+		parse_import_order('random')
+
+
+def test_parse_id_order_accepts_known_values() -> None:
+	assert parse_id_order('jsonl') == IdOrder.JSONL
+	assert parse_id_order('processing') == IdOrder.PROCESSING
+
+
+def test_parse_id_order_rejects_invalid_value() -> None:
+	with pytest.raises(argparse.ArgumentTypeError, match='Invalid id order'):
+		parse_id_order('inode')
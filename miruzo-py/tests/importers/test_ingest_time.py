@@ -67,3 +67,21 @@ def test_resolve_captured_at_falls_back_on_missing_created_at(
 	assert used_fallback is True
 	assert warned_fallback is True
 	assert 'missing created_at detected' in caplog.text
+
+
+def test_resolve_captured_at_uses_given_stat(tmp_path: Path) -> None:
+	target = tmp_path / 'sample.jpg'
+	target.write_text('x', encoding='utf-8')
+	os.utime(target, (1_700_000_789, 1_700_000_789))
+	src_stat = target.stat()
+	target.unlink()
+
+	captured_at, used_fallback, _ = resolve_captured_at(
+		created_at_value=None,
+		src_path=target,
+		warned_fallback=True,
+		src_stat=src_stat,
+	)
+
+	assert captured_at == datetime.fromtimestamp(1_700_000_789, tz=timezone.utc)
+	assert used_fallback is True
@@ -0,0 +1,41 @@
+import pytest
+
+from scripts.importers.common.latency import LATENCY_BUCKETS_MS, LatencyHistogram
+
+
+def test_latency_histogram_percentiles_use_nearest_rank() -> None:
+	histogram = LatencyHistogram([0.004, 0.001, 0.003, 0.002])
+
+	assert histogram.count == 4
+	assert histogram.percentile(0.5) == 0.002
+	assert histogram.percentile(0.75) == 0.003
+	assert histogram.percentile(1.0) == 0.004
+	assert histogram.percentile(0.0) == 0.001
+
+
+def test_latency_histogram_percentile_rejects_empty() -> None:
+	with pytest.raises(ValueError, match='empty'):
+		LatencyHistogram().percentile(0.5)
+
+
+def test_latency_histogram_bucket_counts_include_overflow() -> None:
+	histogram = LatencyHistogram([0.001, 0.0011, 0.05, 60.0])
+
+	counts = histogram.bucket_counts()
+
+	assert len(counts) == len(LATENCY_BUCKETS_MS) + 1
+	assert counts[0] == 1
+	assert counts[1] == 1
+	assert counts[LATENCY_BUCKETS_MS.index(50)] == 1
+	assert counts[-1] == 1
+
+
+def test_latency_histogram_measure_skips_failed_blocks() -> None:
+	histogram = LatencyHistogram()
+
+	with histogram.measure():
+		pass
+	with pytest.raises(RuntimeError), histogram.measure():
+		raise RuntimeError('boom')
+
+	assert histogram.count == 1
@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts.importers.common import ordering
+from scripts.importers.common.ordering import (
+	ImportOrder,
+	reorder_for_locality,
+	sort_indices_for_locality,
+)
+
+
+def _build_stat(*, ino: int, dev: int = 1) -> os.stat_result:
+	return os.stat_result((0o100644, ino, dev, 1, 0, 0, 1, 0, 0, 0))
+
+
+def _locate(item: tuple[Path, os.stat_result]) -> tuple[Path, os.stat_result]:
+	return item
+
+
+def test_reorder_for_locality_keeps_jsonl_order() -> None:
+	items = [
+		(Path('b/2.jpg'), _build_stat(ino=2)),
+		(Path('a/1.jpg'), _build_stat(ino=1)),
+	]
+
+	result = list(reorder_for_locality(items, order=ImportOrder.JSONL, window=16, locate=_locate))
+
+	assert result == items
+
+
+def test_reorder_for_locality_sorts_by_directory_and_inode() -> None:
+	items = [
+		(Path('b/3.jpg'), _build_stat(ino=3)),
+		(Path('a/9.jpg'), _build_stat(ino=9)),
+		(Path('b/1.jpg'), _build_stat(ino=1)),
+		(Path('a/4.jpg'), _build_stat(ino=4)),
+	]
+
+	result = list(reorder_for_locality(items, order=ImportOrder.INODE, window=16, locate=_locate))
+
+	assert [path.as_posix() for path, _ in result] == ['a/4.jpg', 'a/9.jpg', 'b/1.jpg', 'b/3.jpg']
+
+
+def test_reorder_for_locality_sorts_within_each_window() -> None:
+	items = [
+		(Path('a/3.jpg'), _build_stat(ino=3)),
+		(Path('a/2.jpg'), _build_stat(ino=2)),
+		(Path('a/1.jpg'), _build_stat(ino=1)),
+	]
+
+	result = list(reorder_for_locality(items, order=ImportOrder.INODE, window=2, locate=_locate))
+
+	assert [path.as_posix() for path, _ in result] == ['a/2.jpg', 'a/3.jpg', 'a/1.jpg']
+
+
+def test_reorder_for_locality_prefers_physical_extent(monkeypatch: pytest.MonkeyPatch) -> None:
+	offsets = {'a/1.jpg': 300, 'b/2.jpg': 100, 'c/3.jpg': None}
+	monkeypatch.setattr(ordering, '_read_physical_offset', lambda path: offsets[path.as_posix()])
+
+	items = [
+		(Path('a/1.jpg'), _build_stat(ino=1)),
+		(Path('c/3.jpg'), _build_stat(ino=3)),
+		(Path('b/2.jpg'), _build_stat(ino=2)),
+	]
+
+	result = list(reorder_for_locality(items, order=ImportOrder.EXTENT, window=16, locate=_locate))
+
+	assert [path.as_posix() for path, _ in result] == ['b/2.jpg', 'a/1.jpg', 'c/3.jpg']
+
+
+def test_sort_indices_for_locality_leaves_items_in_place() -> None:
+	items = [
+		(Path('b/3.jpg'), _build_stat(ino=3)),
+		(Path('a/9.jpg'), _build_stat(ino=9)),
+		(Path('b/1.jpg'), _build_stat(ino=1)),
+	]
+
+	indices = sort_indices_for_locality(items, order=ImportOrder.INODE, locate=_locate)
+
+	assert indices == [1, 2, 0]
+	assert sort_indices_for_locality(items, order=ImportOrder.JSONL, locate=_locate) == [0, 1, 2]
+
+
+def test_read_physical_offset_returns_none_or_offset(tmp_path: Path) -> None:
+	target = tmp_path / 'sample.bin'
+	target.write_bytes(b'x' * 8192)
+
+	offset = ordering._read_physical_offset(target)
+
+	assert offset is None or offset >= 0
@@ -1,4 +1,8 @@
+import os
 from pathlib import Path
+from typing import Any
+
+import pytest
 
 from scripts.importers.common.models import GatakuImageRow
 from scripts.importers.common.origin import OriginResolver
@@ -87,3 +91,94 @@ def test_origin_resolver_rejects_asset_outside_root(tmp_path: Path) -> None:
 	resolution = resolver.resolve(row)
 
 	assert resolution is None
+
+
+def test_origin_resolver_carries_stat_of_resolved_asset(tmp_path: Path) -> None:
+	assets_root = tmp_path / 'gataku' / 'out' / 'downloads'
+	assets_root.mkdir(parents=True)
+
+	asset_path = assets_root / 'sample.jpg'
+	asset_path.write_bytes(b'data')
+
+	row = GatakuImageRow(
+		filepath=asset_path,
+		sha256='x' * 64,
+		created_at=None,
+	)
+
+	resolver = OriginResolver(gataku_root=tmp_path, gataku_assets_root=assets_root)
+	resolution = resolver.resolve(row)
+
+	assert resolution is not None
+	assert resolution.src_stat.st_size == 4
+	assert resolution.src_stat.st_ino == asset_path.stat().st_ino
+
+
+def test_origin_resolver_lists_each_directory_once(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+) -> None:
+	assets_root = tmp_path / 'gataku' / 'out' / 'downloads'
+	assets_root.mkdir(parents=True)
+	for name in ('a.jpg', 'b.jpg'):
+		(assets_root / name).write_bytes(b'x')
+
+	scanned: list[str] = []
+	original_scandir = os.scandir
+
+	def _counting_scandir(path: str) -> Any:
+		scanned.append(os.fspath(path))
+		return original_scandir(path)
+
+	monkeypatch.setattr(os, 'scandir', _counting_scandir)
+
+	resolver = OriginResolver(gataku_root=tmp_path, gataku_assets_root=assets_root)
+	for name in ('a.jpg', 'b.jpg', 'missing.jpg'):
+		row = GatakuImageRow(filepath=assets_root / name, sha256='x' * 64, created_at=None)
+		resolver.resolve(row)
+
+	assert scanned == [os.fspath(assets_root)]
+
+
+def test_origin_resolver_evicts_least_recently_listed_directory(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+) -> None:
+	assets_root = tmp_path / 'gataku' / 'out' / 'downloads'
+	for dirname in ('a', 'b', 'c'):
+		(assets_root / dirname).mkdir(parents=True)
+		for name in ('1.jpg', '2.jpg'):
+			(assets_root / dirname / name).write_bytes(b'x')
+
+	scanned: list[str] = []
+	original_scandir = os.scandir
+
+	def _counting_scandir(path: str) -> Any:
+		scanned.append(Path(path).name)
+		return original_scandir(path)
+
+	monkeypatch.setattr(os, 'scandir', _counting_scandir)
+
+	resolver = OriginResolver(gataku_root=tmp_path, gataku_assets_root=assets_root, max_cached_entries=4)
+	for dirname in ('a', 'b', 'a', 'c', 'a', 'b'):
+		row = GatakuImageRow(filepath=assets_root / dirname / '1.jpg', sha256='x' * 64, created_at=None)
+		assert resolver.resolve(row) is not None
+
+	# listing c evicts b, the least recently used listing, but keeps a
+	assert scanned == ['a', 'b', 'c', 'b']
+
+
+def test_origin_resolver_rejects_directory(tmp_path: Path) -> None:
+	assets_root = tmp_path / 'gataku' / 'out' / 'downloads'
+	(assets_root / 'subdir').mkdir(parents=True)
+
+	row = GatakuImageRow(
+		filepath=assets_root / 'subdir',
+		sha256='x' * 64,
+		created_at=None,
+	)
+
+	resolver = OriginResolver(gataku_root=tmp_path, gataku_assets_root=assets_root)
+	resolution = resolver.resolve(row)
+
+	assert resolution is None
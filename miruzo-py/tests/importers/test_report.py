@@ -2,10 +2,13 @@ import io
 
 import pytest
 
+from scripts.importers.common.latency import LatencyHistogram
 from scripts.importers.common.report import ImportStats, ProgressReporter, _format_bytes
 from tests.fixtures.image import make_image_fixture
 from tests.fixtures.ingest import make_ingest_fixture
 
+from app.services.images.variants.icc import IccTransformCacheStats
+
 
 @pytest.mark.parametrize(
 	('size', 'expected'),
@@ -47,6 +50,19 @@ def test_progress_reporter_writes_progress_and_summary() -> None:
 	assert 'ingested=1' in lines[1]
 
 
+def test_progress_reporter_skips_repeated_read_count() -> None:
+	stream = io.StringIO()
+	reporter = ProgressReporter(report_variants=False, stream=stream, progress_interval=2)
+	stats = ImportStats(read=2, ingested=1)
+
+	reporter.report_progress(stats)
+	stats.ingested = 2
+	reporter.report_progress(stats, force=True)
+
+	lines = stream.getvalue().strip().splitlines()
+	assert len(lines) == 1
+
+
 def test_progress_reporter_writes_variant_report() -> None:
 	stream = io.StringIO()
 	reporter = ProgressReporter(report_variants=True, stream=stream)
@@ -65,3 +81,28 @@ def test_progress_reporter_writes_variant_report() -> None:
 	assert output[6].startswith('l1w640     640x480')
 	assert output[7].startswith('l1w960     960x720')
 	assert output[8].startswith('l9w320     320x240')
+
+
+def test_progress_reporter_reports_icc_cache() -> None:
+	stream = io.StringIO()
+	reporter = ProgressReporter(report_variants=False, stream=stream)
+
+	reporter.report_icc_cache(IccTransformCacheStats(hits=9, misses=2, size=2))
+
+	assert stream.getvalue().strip() == '[importer] icc transforms: hits=9, misses=2, cached=2'
+
+
+def test_progress_reporter_reports_latency_histogram() -> None:
+	stream = io.StringIO()
+	reporter = ProgressReporter(report_variants=False, stream=stream)
+
+	reporter.report_latency('database write', LatencyHistogram())
+	assert stream.getvalue() == ''
+
+	reporter.report_latency('database write', LatencyHistogram([0.0015, 0.004, 0.004, 7.0]))
+
+	lines = stream.getvalue().strip().splitlines()
+	assert lines == [
+		'[importer] database write latency: count=4, p50=4.0ms, p90=7000.0ms, p99=7000.0ms, max=7000.0ms',
+		'[importer] database write histogram: <=2ms: 1, <=5ms: 2, >5000ms: 1',
+	]
@@ -16,7 +16,9 @@ MYSQL_IMAGE = 'mysql:9-oracle'
 MYSQL_DB = 'miruzo_py_test'
 MYSQL_USER = 'm'
 MYSQL_PASSWORD = 'miruzo1234'
-MYSQL_COMMAND = f'--character-set-server={MYSQL_CHARSET} --collation-server={MYSQL_COLLATION}'
+MYSQL_COMMAND = (
+	f'--character-set-server={MYSQL_CHARSET} --collation-server={MYSQL_COLLATION} --local-infile=1'
+)
 
 
 @pytest.fixture(scope='session')
@@ -53,7 +55,7 @@ def mysql_dsn(request: pytest.FixtureRequest) -> Iterator[str]:
 @pytest.fixture()
 def mysql_session(request: pytest.FixtureRequest) -> Iterator[Session]:
 	dsn = request.getfixturevalue('mysql_dsn')
-	engine = _create_mysql_engine(dsn, pool_size=1, max_overflow=2)
+	engine = _create_mysql_engine(dsn, pool_size=1, max_overflow=2, local_infile=True)
 	metadata.create_all(engine)
 	with Session(engine) as session:
 		yield session
@@ -0,0 +1,31 @@
+import pytest
+
+from app.config.environments import DatabaseBackend, env
+from app.persist.bulk import resolve_bulk_loader
+
+
+def test_resolve_bulk_loader_returns_none_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(env, 'database_backend', DatabaseBackend.POSTGRE_SQL)
+
+	assert resolve_bulk_loader(False) is None
+
+
+@pytest.mark.parametrize(
+	('backend', 'local_infile', 'expected'),
+	[
+		(DatabaseBackend.POSTGRE_SQL, False, 'copy'),
+		(DatabaseBackend.MYSQL, True, 'load_data'),
+		(DatabaseBackend.MYSQL, False, None),
+		(DatabaseBackend.SQLITE, True, None),
+	],
+)
+def test_resolve_bulk_loader_picks_backend_loader(
+	monkeypatch: pytest.MonkeyPatch,
+	backend: DatabaseBackend,
+	local_infile: bool,
+	expected: str | None,
+) -> None:
+	monkeypatch.setattr(env, 'database_backend', backend)
+	monkeypatch.setattr(env, 'mysql_local_infile', local_infile)
+
+	assert resolve_bulk_loader(True) == expected
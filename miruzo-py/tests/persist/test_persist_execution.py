@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from tests.persist.utils import add_ingest_row
+
+from app.databases.tables import execution_table
+from app.models.enums import ExecutionStatus
+from app.models.ingest import Execution
+from app.persist.executions.implementation import create_execution_repository
+from app.persist.executions.protocol import ExecutionCreateInput
+
+
+def test_create_many_persists_execution_rows(session: Session) -> None:
+	now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+	ingest_id = add_ingest_row(session, ingested_at=now)
+
+	create_execution_repository(session).create_many(
+		[
+			ExecutionCreateInput(
+				ingest_id=ingest_id,
+				execution=Execution(
+					status=ExecutionStatus.IO_ERROR,
+					error_type='OSError',
+					error_message='boom',
+					executed_at=now,
+					inspect=timedelta(milliseconds=5),
+					collect=None,
+					plan=None,
+					execute=None,
+					store=None,
+					overall=timedelta(seconds=1.5),
+				),
+			),
+			ExecutionCreateInput(
+				ingest_id=ingest_id,
+				execution=Execution(
+					status=ExecutionStatus.SUCCESS,
+					error_type=None,
+					error_message=None,
+					executed_at=now + timedelta(minutes=1),
+					inspect=None,
+					collect=None,
+					plan=None,
+					execute=timedelta(seconds=2),
+					store=None,
+					overall=timedelta(seconds=3),
+				),
+			),
+		],
+	)
+
+	rows = (
+		session.execute(
+			select(execution_table)
+			.where(execution_table.c.ingest_id == ingest_id)
+			.order_by(execution_table.c.executed_at),
+		)
+		.mappings()
+		.all()
+	)
+	assert [row['status'] for row in rows] == [ExecutionStatus.IO_ERROR, ExecutionStatus.SUCCESS]
+	assert rows[0]['error_type'] == 'OSError'
+	assert rows[0]['inspect_seconds'] == 0.005
+	assert rows[0]['collect_seconds'] is None
+	assert rows[0]['overall_seconds'] == 1.5
+	assert rows[1]['execute_seconds'] == 2.0
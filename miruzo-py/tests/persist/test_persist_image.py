@@ -10,6 +10,8 @@ from app.models.enums import ImageKind
 from app.models.image import Image
 from app.models.types import VariantEntry
 from app.persist.images.implementation import create_image_repository
+from app.persist.stats.implementation import create_stats_repository
+from app.persist.stats.protocol import StatsCreateInput
 
 
 @pytest.mark.parametrize(
@@ -51,3 +53,74 @@ def test_create_persists_image_row(
 	assert row['original'] == original
 	assert row['fallback'] == fallback
 	assert row['variants'] == variants
+
+
+def test_create_many_persists_image_rows(session: Session) -> None:
+	now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+	ingest_ids = [
+		add_ingest_row(session, ingested_at=now, relative_path=f'l0orig/many{index}.png')
+		for index in range(2)
+	]
+
+	create_image_repository(session).create_many(
+		[
+			Image(
+				ingest_id=ingest_id,
+				ingested_at=now,
+				kind=ImageKind.PHOTO,
+				original=build_variant('webp', 1024),
+				fallback=None,
+				variants=[build_variant('webp', 320 * (index + 1), layer_id=1)],
+				placeholder='data:image/webp;base64,AAAA' if index == 0 else None,
+			)
+			for index, ingest_id in enumerate(ingest_ids)
+		],
+	)
+
+	first = get_image_row(session, ingest_id=ingest_ids[0])
+	second = get_image_row(session, ingest_id=ingest_ids[1])
+	assert first['variants'] == [build_variant('webp', 320, layer_id=1)]
+	assert first['placeholder'] == 'data:image/webp;base64,AAAA'
+	assert second['variants'] == [build_variant('webp', 640, layer_id=1)]
+	assert second['placeholder'] is None
+
+
+def _add_image_row(session: Session, *, score: int, relative_path: str) -> int:
+	now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+	ingest_id = add_ingest_row(session, ingested_at=now, relative_path=relative_path)
+	create_stats_repository(session).create(StatsCreateInput(ingest_id=ingest_id, initial_score=score))
+	create_image_repository(session).create(
+		Image(
+			ingest_id=ingest_id,
+			ingested_at=now,
+			kind=ImageKind.PHOTO,
+			original=build_variant('webp', 1024),
+			fallback=None,
+			variants=[build_variant('webp', 320, layer_id=1)],
+		),
+	)
+	return ingest_id
+
+
+def test_list_by_score_orders_by_score(session: Session) -> None:
+	low = _add_image_row(session, score=10, relative_path='l0orig/low.png')
+	high = _add_image_row(session, score=90, relative_path='l0orig/high.png')
+	repository = create_image_repository(session)
+
+	entries = repository.list_by_score(limit=10)
+	second_page = repository.list_by_score(limit=1, offset=1)
+
+	assert [entry.ingest_id for entry in entries] == [high, low]
+	assert entries[0].relative_path == 'l0orig/high.png'
+	assert entries[0].kind == ImageKind.PHOTO
+	assert [entry.ingest_id for entry in second_page] == [low]
+
+
+def test_update_variants_replaces_variants(session: Session) -> None:
+	ingest_id = _add_image_row(session, score=10, relative_path='l0orig/sample.png')
+	variants = [build_variant('webp', 320, layer_id=1), build_variant('webp', 640, layer_id=1)]
+
+	create_image_repository(session).update_variants(ingest_id, variants)
+
+	row = get_image_row(session, ingest_id=ingest_id)
+	assert row['variants'] == variants
@@ -1,17 +1,18 @@
-from collections.abc import Iterator
+import importlib
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import final
+from typing import Any, final
 
 import pytest
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.exc import IntegrityError, NoResultFound
 
 from tests.persist.utils import get_ingest_dto, get_ingest_row
 
 from app.config.environments import DatabaseBackend
-from app.models.enums import ExecutionStatus
+from app.models.enums import ExecutionStatus, ProcessStatus
 from app.models.ingest import MAX_EXECUTIONS, Execution
-from app.persist.ingests.factory import _create_ingest_repository_from_backend
+from app.persist.ingests.factory import create_ingest_repository_from_backend
 from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput, IngestRepository
 
 
@@ -21,21 +22,21 @@ def ingest_repo(request: pytest.FixtureRequest) -> Iterator[IngestRepository]:
 	match backend:
 		case DatabaseBackend.MYSQL:
 			with request.getfixturevalue('mysql_session') as session:
-				yield _create_ingest_repository_from_backend(
+				yield create_ingest_repository_from_backend(
 					session,
 					backend=backend,
 					max_executions=MAX_EXECUTIONS,
 				)
 		case DatabaseBackend.POSTGRE_SQL:
 			with request.getfixturevalue('postgres_session') as session:
-				yield _create_ingest_repository_from_backend(
+				yield create_ingest_repository_from_backend(
 					session,
 					backend=backend,
 					max_executions=MAX_EXECUTIONS,
 				)
 		case DatabaseBackend.SQLITE:
 			with request.getfixturevalue('sqlite_session') as session:
-				yield _create_ingest_repository_from_backend(
+				yield create_ingest_repository_from_backend(
 					session,
 					backend=backend,
 					max_executions=MAX_EXECUTIONS,
@@ -99,6 +100,284 @@ def test_create_returns_id_and_persists_row(ingest_repo: IngestRepository) -> No
 	assert row['fingerprint'] == '2' * 64
 
 
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_create_many_returns_ids_in_input_order(ingest_repo: IngestRepository) -> None:
+	now = datetime.now(timezone.utc)
+	entries = [
+		IngestCreateInput(
+			relative_path=f'l0orig/batch{index}.webp',
+			fingerprint=f'{index + 5}' * 64,
+			ingested_at=now,
+			captured_at=now,
+		)
+		for index in range(3)
+	]
+
+	ingest_ids = ingest_repo.create_many(entries)
+
+	assert len(ingest_ids) == 3
+	assert len(set(ingest_ids)) == 3
+	for ingest_id, entry in zip(ingest_ids, entries, strict=True):
+		row = get_ingest_row(ingest_repo, ingest_id=ingest_id)
+		assert row['relative_path'] == entry.relative_path
+		assert row['fingerprint'] == entry.fingerprint
+
+	assert ingest_repo.create_many([]) == []
+
+
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_create_many_if_absent_reports_existing_rows(ingest_repo: IngestRepository) -> None:
+	now = datetime.now(timezone.utc)
+
+	def build(name: str, fingerprint: str) -> IngestCreateInput:
+		return IngestCreateInput(
+			relative_path=f'l0orig/{name}.webp',
+			fingerprint=fingerprint * 64,
+			ingested_at=now,
+			captured_at=now,
+		)
+
+	(stored_id,) = ingest_repo.create_many([build('stored', 'a')])
+
+	results = ingest_repo.create_many_if_absent(
+		[build('moved', 'a'), build('new', 'b'), build('repeated', 'b')],
+	)
+
+	assert [(result.relative_path, result.created) for result in results] == [
+		('l0orig/stored.webp', False),
+		('l0orig/new.webp', True),
+		('l0orig/new.webp', False),
+	]
+	assert results[0].id == stored_id
+	assert results[1].id == results[2].id
+	assert get_ingest_row(ingest_repo, ingest_id=results[1].id)['fingerprint'] == 'b' * 64
+
+	assert ingest_repo.create_many_if_absent([]) == []
+
+
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_find_existing_fingerprints_returns_stored_ones(ingest_repo: IngestRepository) -> None:
+	now = datetime.now(timezone.utc)
+	ingest_repo.create(
+		IngestCreateInput(
+			relative_path='l0orig/stored.webp',
+			fingerprint='a' * 64,
+			ingested_at=now,
+			captured_at=now,
+		),
+	)
+
+	assert ingest_repo.find_existing_fingerprints(['a' * 64, 'b' * 64, 'a' * 64]) == {'a' * 64}
+	assert ingest_repo.find_existing_fingerprints([]) == set()
+
+
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_create_many_if_absent_raises_for_relative_path_conflict(ingest_repo: IngestRepository) -> None:
+	now = datetime.now(timezone.utc)
+	ingest_repo.create_many(
+		[
+			IngestCreateInput(
+				relative_path='l0orig/taken.webp',
+				fingerprint='c' * 64,
+				ingested_at=now,
+				captured_at=now,
+			),
+		],
+	)
+
+	with pytest.raises(IntegrityError):
+		ingest_repo.create_many_if_absent(
+			[
+				IngestCreateInput(
+					relative_path='l0orig/taken.webp',
+					fingerprint='d' * 64,
+					ingested_at=now,
+					captured_at=now,
+				),
+			],
+		)
+
+
+@pytest.mark.parametrize('local_infile', [False, True])
+def test_create_many_bulk_load_on_mysql(request: pytest.FixtureRequest, local_infile: bool) -> None:
+	now = datetime.now(timezone.utc)
+	entries = [
+		IngestCreateInput(
+			relative_path=f'l0orig/load{index}\tname.webp',
+			fingerprint=f'{index + 1}' * 64,
+			ingested_at=now,
+			captured_at=now,
+			execution=_build_execution(ExecutionStatus.SUCCESS, offset=index),
+		)
+		for index in range(3)
+	]
+
+	with request.getfixturevalue('mysql_session') as session:
+		ingest_repo = create_ingest_repository_from_backend(
+			session,
+			backend=DatabaseBackend.MYSQL,
+			max_executions=MAX_EXECUTIONS,
+			bulk_load=True,
+			local_infile=local_infile,
+		)
+
+		ingest_ids = ingest_repo.create_many(entries)
+
+		assert len(set(ingest_ids)) == 3
+		for index, (ingest_id, entry) in enumerate(zip(ingest_ids, entries, strict=True)):
+			ingest = get_ingest_dto(ingest_repo, ingest_id=ingest_id)
+			assert ingest.relative_path == entry.relative_path
+			assert ingest.fingerprint == entry.fingerprint
+			assert ingest.process == ProcessStatus.FINISHED
+			_assert_execution(ingest.executions[0], offset=index)
+
+		# LOCAL loads skip duplicates with a warning; the row count catches it
+		with pytest.raises(IntegrityError):
+			ingest_repo.create_many([entries[0]])
+
+
+def test_create_many_bulk_load_copies_rows_on_postgres(request: pytest.FixtureRequest) -> None:
+	now = datetime.now(timezone.utc)
+	entries = [
+		IngestCreateInput(
+			relative_path=f'l0orig/copy{index}.webp',
+			fingerprint=f'{index + 1}' * 64,
+			ingested_at=now,
+			captured_at=now,
+			execution=_build_execution(ExecutionStatus.SUCCESS, offset=index),
+		)
+		for index in range(3)
+	]
+
+	with request.getfixturevalue('postgres_session') as session:
+		ingest_repo = create_ingest_repository_from_backend(
+			session,
+			backend=DatabaseBackend.POSTGRE_SQL,
+			max_executions=MAX_EXECUTIONS,
+			bulk_load=True,
+		)
+
+		ingest_ids = ingest_repo.create_many(entries)
+
+		assert len(set(ingest_ids)) == 3
+		for index, (ingest_id, entry) in enumerate(zip(ingest_ids, entries, strict=True)):
+			ingest = get_ingest_dto(ingest_repo, ingest_id=ingest_id)
+			assert ingest.relative_path == entry.relative_path
+			assert ingest.process == ProcessStatus.FINISHED
+			_assert_execution(ingest.executions[0], offset=index)
+
+		# the COPY is rejected as a whole, so the fallback insert reports the conflict
+		with pytest.raises(IntegrityError):
+			ingest_repo.create_many([entries[0]])
+
+
+@pytest.mark.parametrize(
+	('backend', 'fixture', 'loader'),
+	[
+		(DatabaseBackend.MYSQL, 'mysql_session', 'app.persist.ingests.mysql.load_rows'),
+		(DatabaseBackend.POSTGRE_SQL, 'postgres_session', 'app.persist.ingests.postgres.copy_rows'),
+	],
+)
+def test_create_many_if_absent_bulk_load_reaches_bulk_loader(
+	request: pytest.FixtureRequest,
+	monkeypatch: pytest.MonkeyPatch,
+	backend: DatabaseBackend,
+	fixture: str,
+	loader: str,
+) -> None:
+	now = datetime.now(timezone.utc)
+
+	def build(name: str, fingerprint: str) -> IngestCreateInput:
+		return IngestCreateInput(
+			relative_path=f'l0orig/{name}.webp',
+			fingerprint=fingerprint * 64,
+			ingested_at=now,
+			captured_at=now,
+		)
+
+	module_name, function_name = loader.rsplit('.', 1)
+	module = importlib.import_module(module_name)
+	load = getattr(module, function_name)
+	loaded_tables: list[str] = []
+
+	def record_load(session: Any, table_name: str, *args: Any) -> None:
+		loaded_tables.append(table_name)
+		load(session, table_name, *args)
+
+	monkeypatch.setattr(module, function_name, record_load)
+
+	with request.getfixturevalue(fixture) as session:
+		ingest_repo = create_ingest_repository_from_backend(
+			session,
+			backend=backend,
+			max_executions=MAX_EXECUTIONS,
+			bulk_load=True,
+			local_infile=True,
+		)
+
+		results = ingest_repo.create_many_if_absent([build('first', 'a'), build('second', 'b')])
+
+		assert loaded_tables == ['ingests']
+		assert [result.created for result in results] == [True, True]
+		assert get_ingest_row(ingest_repo, ingest_id=results[1].id)['fingerprint'] == 'b' * 64
+
+		# a row stored meanwhile makes the bulk insert fail; the row-aware path reports it
+		results = ingest_repo.create_many_if_absent([build('moved', 'a'), build('third', 'c')])
+
+		assert [(result.relative_path, result.created) for result in results] == [
+			('l0orig/first.webp', False),
+			('l0orig/third.webp', True),
+		]
+
+
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_create_many_writes_initial_execution(ingest_repo: IngestRepository) -> None:
+	now = datetime.now(timezone.utc)
+	statuses = [ExecutionStatus.SUCCESS, ExecutionStatus.IMAGE_ERROR]
+	ingest_ids = ingest_repo.create_many(
+		[
+			IngestCreateInput(
+				relative_path=f'l0orig/exec{index}.webp',
+				fingerprint=f'{index + 3}' * 64,
+				ingested_at=now,
+				captured_at=now,
+				execution=_build_execution(status, offset=index),
+			)
+			for index, status in enumerate(statuses)
+		],
+	)
+
+	succeeded = get_ingest_dto(ingest_repo, ingest_id=ingest_ids[0])
+	assert succeeded.process == ProcessStatus.FINISHED
+	assert [execution.status for execution in succeeded.executions] == [ExecutionStatus.SUCCESS]
+	_assert_execution(succeeded.executions[0])
+
+	failed = get_ingest_dto(ingest_repo, ingest_id=ingest_ids[1])
+	assert failed.process == ProcessStatus.PROCESSING
+	assert [execution.status for execution in failed.executions] == [ExecutionStatus.IMAGE_ERROR]
+	_assert_execution(failed.executions[0], offset=1)
+
+
 @pytest.mark.parametrize(
 	'ingest_repo',
 	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
@@ -245,6 +524,85 @@ def test_append_execution_trims_to_maximum(ingest_repo: IngestRepository) -> Non
 	_assert_execution(dto2.executions[2], offset=MAX_EXECUTIONS + EXTRA_EXECUTION_COUNT + 2)
 
 
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_append_executions_matches_sequential_appends(ingest_repo: IngestRepository) -> None:
+	now = datetime(2026, 1, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+	ingest_ids = ingest_repo.create_many(
+		[
+			IngestCreateInput(
+				relative_path=f'l0orig/bulk{index}.webp',
+				fingerprint=f'{index}' * 64,
+				ingested_at=now,
+				captured_at=now,
+			)
+			for index in range(4)
+		],
+	)
+	bulk_ids, sequential_ids = ingest_ids[:2], ingest_ids[2:]
+
+	# (ingest index, status) in append order, with repeats for the first ingest
+	plan = [
+		(0, ExecutionStatus.SUCCESS),
+		(1, ExecutionStatus.IO_ERROR),
+		(0, ExecutionStatus.UNKNOWN_ERROR),
+		(0, ExecutionStatus.SUCCESS),
+		(1, ExecutionStatus.UNKNOWN_ERROR),
+		*[(1, ExecutionStatus.IMAGE_ERROR)] * MAX_EXECUTIONS,
+	]
+
+	def build_entries(ids: Sequence[int]) -> list[IngestAppendExecutionInput]:
+		return [
+			IngestAppendExecutionInput(
+				ingest_id=ids[target],
+				updated_at=now + timedelta(seconds=offset),
+				execution=_build_execution(status, offset=offset),
+			)
+			for offset, (target, status) in enumerate(plan)
+		]
+
+	ingest_repo.append_executions(build_entries(bulk_ids))
+	for entry in build_entries(sequential_ids):
+		ingest_repo.append_execution(entry)
+
+	for bulk_id, sequential_id in zip(bulk_ids, sequential_ids, strict=True):
+		bulk = get_ingest_dto(ingest_repo, ingest_id=bulk_id)
+		sequential = get_ingest_dto(ingest_repo, ingest_id=sequential_id)
+		assert bulk.process == sequential.process
+		assert bulk.updated_at == sequential.updated_at
+		assert bulk.executions == sequential.executions
+
+	first = get_ingest_dto(ingest_repo, ingest_id=bulk_ids[0])
+	assert first.process == ProcessStatus.FINISHED
+	assert [execution.status for execution in first.executions] == [
+		ExecutionStatus.UNKNOWN_ERROR,
+		ExecutionStatus.SUCCESS,
+	]
+	assert len(get_ingest_dto(ingest_repo, ingest_id=bulk_ids[1]).executions) == MAX_EXECUTIONS
+
+
+@pytest.mark.parametrize(
+	'ingest_repo',
+	[DatabaseBackend.MYSQL, DatabaseBackend.POSTGRE_SQL, DatabaseBackend.SQLITE],
+	indirect=True,
+)
+def test_append_executions_raises_for_missing_ingest(ingest_repo: IngestRepository) -> None:
+	now = datetime.now(timezone.utc)
+	with pytest.raises(NoResultFound, match='No row was found when one was required'):
+		ingest_repo.append_executions(
+			[
+				IngestAppendExecutionInput(
+					ingest_id=999,
+					updated_at=now,
+					execution=_build_execution(ExecutionStatus.SUCCESS),
+				),
+			],
+		)
+
+
 @pytest.mark.parametrize('status', [ExecutionStatus.SUCCESS, ExecutionStatus.UNKNOWN_ERROR])
 @pytest.mark.parametrize(
 	'ingest_repo',
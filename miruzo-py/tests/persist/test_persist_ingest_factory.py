@@ -2,10 +2,10 @@ import pytest
 from sqlalchemy.orm import Session
 
 from app.config.environments import DatabaseBackend, env
-from app.persist.ingests.base import _IngestRepositoryBaseImpl
 from app.persist.ingests.factory import create_ingest_repository
 from app.persist.ingests.mysql import _IngestRepositoryMySQLImpl
 from app.persist.ingests.postgres import _IngestRepositoryPostgreSQLImpl
+from app.persist.ingests.sqlite import _IngestRepositorySQLiteImpl
 
 
 def test_create_ingest_repository_uses_mysql(session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -26,7 +26,7 @@ def test_create_ingest_repository_uses_sqlite(session: Session, monkeypatch: pyt
 	monkeypatch.setattr(env, 'database_backend', DatabaseBackend.SQLITE)
 
 	repo = create_ingest_repository(session)
-	assert isinstance(repo, _IngestRepositoryBaseImpl)
+	assert isinstance(repo, _IngestRepositorySQLiteImpl)
 
 
 def test_create_ingest_repository_rejects_unknown_backend(
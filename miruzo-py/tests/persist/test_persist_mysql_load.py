@@ -0,0 +1,31 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.persist.mysql_load import _format_value
+
+
+def test_format_value_writes_null_marker() -> None:
+	assert _format_value('text', None) == '\\N'
+	assert _format_value('json', None) == '\\N'
+
+
+def test_format_value_escapes_text() -> None:
+	assert _format_value('text', 'a\tb\\c\nd\r\0') == 'a\\tb\\\\c\\nd\\r\\0'
+
+
+def test_format_value_writes_naive_utc_datetime() -> None:
+	value = datetime(2026, 1, 2, 12, 30, tzinfo=timezone(timedelta(hours=9)))
+
+	assert _format_value('datetime', value) == '2026-01-02 03:30:00.000000'
+
+
+def test_format_value_writes_compact_json() -> None:
+	assert _format_value('json', {'a': [1, 'x\ty']}) == '{"a":[1,"x\\\\ty"]}'
+
+
+@pytest.mark.parametrize('value', ['text', 1, {'a': math.nan}, [object()]])
+def test_format_value_rejects_invalid_json(value: object) -> None:
+	with pytest.raises(ValueError):
+		_format_value('json', value)
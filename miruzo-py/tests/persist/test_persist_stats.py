@@ -23,3 +23,23 @@ def test_create_persists_stats_row(session: Session) -> None:
 	assert row['ingest_id'] == ingest_id
 	assert row['score'] == 42
 	assert row['score_evaluated'] == 42
+
+
+def test_create_many_persists_stats_rows(session: Session) -> None:
+	now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+	ingest_ids = [
+		add_ingest_row(session, ingested_at=now, relative_path=f'l0orig/stats{index}.webp')
+		for index in range(2)
+	]
+
+	create_stats_repository(session).create_many(
+		[
+			StatsCreateInput(ingest_id=ingest_id, initial_score=10 + index)
+			for index, ingest_id in enumerate(ingest_ids)
+		],
+	)
+
+	for index, ingest_id in enumerate(ingest_ids):
+		row = get_stats_row(session, ingest_id=ingest_id)
+		assert row['score'] == 10 + index
+		assert row['score_evaluated'] == 10 + index
@@ -27,6 +27,25 @@ def test_repos_raises_before_enter() -> None:
 		_ = uow.repositories
 
 
+def test_rejects_bulk_load_with_pipeline() -> None:
+	with pytest.raises(ValueError, match='bulk_load cannot be combined with pipeline'):
+		UnitOfWork(session_factory=DummySession, bulk_load=True, pipeline=True)  # pyright: ignore[reportArgumentType]
+
+
+def test_pipeline_is_noop_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+	session = DummySession()
+	monkeypatch.setattr(uow_module, 'create_ingest_repository', lambda _, **__: object())
+	monkeypatch.setattr(uow_module, 'create_image_repository', lambda _, **__: object())
+	monkeypatch.setattr(uow_module, 'create_stats_repository', lambda _, **__: object())
+
+	with UnitOfWork(session_factory=lambda: session) as uow:  # pyright: ignore[reportArgumentType]
+		with uow.pipeline() as scope:
+			assert scope is None
+
+	with pytest.raises(RuntimeError, match='UnitOfWork is not active'):
+		uow.pipeline()
+
+
 def test_commit_and_rollback_raise_before_enter() -> None:
 	uow = UnitOfWork(session_factory=DummySession)  # pyright: ignore[reportArgumentType]
 
@@ -42,9 +61,9 @@ def test_enter_initializes_repositories(monkeypatch: pytest.MonkeyPatch) -> None
 	image_repo = object()
 	stats_repo = object()
 
-	monkeypatch.setattr(uow_module, 'create_ingest_repository', lambda _: ingest_repo)
-	monkeypatch.setattr(uow_module, 'create_image_repository', lambda _: image_repo)
-	monkeypatch.setattr(uow_module, 'create_stats_repository', lambda _: stats_repo)
+	monkeypatch.setattr(uow_module, 'create_ingest_repository', lambda _, **__: ingest_repo)
+	monkeypatch.setattr(uow_module, 'create_image_repository', lambda _, **__: image_repo)
+	monkeypatch.setattr(uow_module, 'create_stats_repository', lambda _, **__: stats_repo)
 
 	with UnitOfWork(session_factory=lambda: session) as uow:  # pyright: ignore[reportArgumentType]
 		assert uow.repositories.ingest is ingest_repo
@@ -58,9 +77,9 @@ def test_enter_initializes_repositories(monkeypatch: pytest.MonkeyPatch) -> None
 
 def test_exit_rolls_back_and_closes_on_exception(monkeypatch: pytest.MonkeyPatch) -> None:
 	session = DummySession()
-	monkeypatch.setattr(uow_module, 'create_ingest_repository', lambda _: object())
-	monkeypatch.setattr(uow_module, 'create_image_repository', lambda _: object())
-	monkeypatch.setattr(uow_module, 'create_stats_repository', lambda _: object())
+	monkeypatch.setattr(uow_module, 'create_ingest_repository', lambda _, **__: object())
+	monkeypatch.setattr(uow_module, 'create_image_repository', lambda _, **__: object())
+	monkeypatch.setattr(uow_module, 'create_stats_repository', lambda _, **__: object())
 
 	with pytest.raises(RuntimeError, match='boom'):
 		with UnitOfWork(session_factory=lambda: session):  # pyright: ignore[reportArgumentType]
@@ -1,4 +1,7 @@
-from collections.abc import Iterator, Sequence
+import os
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import cast
@@ -10,48 +13,143 @@ from tests.fixtures.ingest import make_ingest_fixture
 from tests.services.images.utils import build_variant_spec
 from tests.services.images.variants.utils import build_variant_file
 from tests.stubs.clock import FixedClockProvider
+from tests.stubs.execution import StubExecutionRepository
 from tests.stubs.image import StubImageRepository
 from tests.stubs.stats import StubStatsRepository
 
 from app.config.variant import VariantLayerSpec
-from app.models.enums import ExecutionStatus, IngestMode
+from app.models.enums import ExecutionStatus, ImageKind, IngestMode
 from app.models.ingest import Execution, Ingest
+from app.persist.ingests.protocol import IngestCreateInput
 from app.persist.uow import Repositories
-from app.services.images.ingest import ImageIngestService
+from app.services.images.ingest import ImageIngestRequest, ImageIngestService
+from app.services.images.variants.scheduler import VariantScheduler
 from app.services.images.variants.types import (
 	OriginalFile,
 	VariantCommitResult,
+	VariantExecution,
 	VariantPolicy,
 	VariantReport,
 )
+from app.services.ingests.service import PendingIngest
+from app.utils.files.content_hash import compute_file_content_hash
+from app.utils.files.group_sync import GroupSync
 
 
 class DummyIngestCore:
 	def __init__(self, dto: Ingest) -> None:
 		self.entry = dto
 		self.created_args: dict[str, object] | None = None
+		self.created_batches: list[int] = []
+		self.executions: list[Execution] = []
 		self.appended: tuple[int, Execution] | None = None
+		self.existing: set[str] = set()
 
-	def create_ingest(
+	def resolve_fingerprint(
+		self,
+		*,
+		origin_path: Path,  # noqa: ARG002
+		fingerprint: str | None,
+		origin_stat: os.stat_result | None = None,  # noqa: ARG002
+	) -> str:
+		return fingerprint if fingerprint is not None else self.entry.fingerprint
+
+	def find_existing_fingerprints(self, fingerprints: Sequence[str]) -> set[str]:
+		return self.existing.intersection(fingerprints)
+
+	def prepare_ingest(
 		self,
 		*,
 		origin_path: Path,
 		fingerprint: str | None,
 		captured_at: datetime,
 		ingest_mode: IngestMode,
-	) -> Ingest:
+		origin_stat: os.stat_result | None = None,
+	) -> PendingIngest:
 		self.created_args = {
 			'origin_path': origin_path,
 			'fingerprint': fingerprint,
 			'captured_at': captured_at,
 			'ingest_mode': ingest_mode,
+			'origin_stat': origin_stat,
 		}
-		return self.entry
+		return PendingIngest(
+			entry=IngestCreateInput(
+				relative_path=self.entry.relative_path,
+				fingerprint=self.entry.fingerprint,
+				ingested_at=self.entry.ingested_at,
+				captured_at=self.entry.captured_at,
+			),
+			output_path=origin_path,
+			ingest_mode=ingest_mode,
+		)
+
+	def discard_ingest(self, pending: PendingIngest) -> None:
+		pass
+
+	def create_ingests(
+		self,
+		pending: Sequence[PendingIngest],
+		*,
+		executions: Sequence[Execution] | None = None,
+	) -> list[Ingest]:
+		self.created_batches.append(len(pending))
+		self.executions.extend(executions or [])
+		return [self.entry for _ in pending]
+
+	def create_missing_ingests(
+		self,
+		pending: Sequence[PendingIngest],
+		*,
+		executions: Sequence[Execution] | None = None,
+		discard: Callable[[int], None] | None = None,
+	) -> list[Ingest | None]:
+		# every other ingest is reported as stored under another path meanwhile
+		ingests = self.create_ingests(pending, executions=executions)
+		for index in range(1, len(ingests), 2):
+			if discard is not None:
+				discard(index)
+		return [ingest if index % 2 == 0 else None for index, ingest in enumerate(ingests)]
 
 	def append_execution(self, ingest_id: int, entry: Execution) -> None:
 		self.appended = (ingest_id, entry)
 
 
+class OrderRecordingIngestCore(DummyIngestCore):
+	def __init__(self, dto: Ingest) -> None:
+		super().__init__(dto)
+		self.prepared: list[str | None] = []
+		self.stored: list[str | None] = []
+
+	def prepare_ingest(
+		self,
+		*,
+		origin_path: Path,
+		fingerprint: str | None,
+		captured_at: datetime,
+		ingest_mode: IngestMode,
+		origin_stat: os.stat_result | None = None,
+	) -> PendingIngest:
+		self.prepared.append(fingerprint)
+		pending = super().prepare_ingest(
+			origin_path=origin_path,
+			fingerprint=fingerprint,
+			captured_at=captured_at,
+			ingest_mode=ingest_mode,
+			origin_stat=origin_stat,
+		)
+		return replace(pending, entry=pending.entry.model_copy(update={'fingerprint': fingerprint}))
+
+	def create_ingests(
+		self,
+		pending: Sequence[PendingIngest],
+		*,
+		executions: Sequence[Execution] | None = None,
+	) -> list[Ingest]:
+		self.stored.extend(item.entry.fingerprint for item in pending)
+		return super().create_ingests(pending, executions=executions)
+
+
 class DummyPipeline:
 	def __init__(
 		self,
@@ -69,13 +167,13 @@ class DummyPipeline:
 		origin_relative_path: Path,
 		file: OriginalFile,
 		session: object,
-	) -> Iterator[VariantCommitResult]:
+	) -> VariantExecution:
 		self.run_args = {
 			'origin_relative_path': origin_relative_path,
 			'file': file,
 			'session': session,
 		}
-		return iter(self._results)
+		return VariantExecution(kind=ImageKind.PHOTO, results=self._results)
 
 
 class FailingPipeline:
@@ -88,11 +186,16 @@ class FailingPipeline:
 		origin_relative_path: Path,  # noqa: ARG002
 		file: OriginalFile,  # noqa: ARG002
 		session: object,  # noqa: ARG002
-	) -> Iterator[VariantCommitResult]:
+	) -> VariantExecution:
 		raise ValueError('boom')
 
 
-def _new_image_ingest_service_fixture(now: datetime) -> ImageIngestService:
+def _new_image_ingest_service_fixture(
+	now: datetime,
+	*,
+	log_executions: bool = False,
+	store_scope: Callable[[], AbstractContextManager[object]] = nullcontext,
+) -> ImageIngestService:
 	policy = VariantPolicy(
 		durable_write=False,
 		regenerate_mismatched=False,
@@ -105,10 +208,13 @@ def _new_image_ingest_service_fixture(now: datetime) -> ImageIngestService:
 			ingest=object(),  # pyright: ignore[reportArgumentType]
 			image=StubImageRepository(),
 			stats=StubStatsRepository(),
+			execution=StubExecutionRepository(),
 		),
 		clock=FixedClockProvider(now),
 		policy=policy,
 		initial_score=100,
+		log_executions=log_executions,
+		store_scope=store_scope,
 	)
 	return service
 
@@ -146,6 +252,7 @@ def test_image_ingest_service_records_image(tmp_path: Path) -> None:
 	assert image.original['width'] == 10
 	assert image.original['height'] == 8
 	assert image.original['bytes'] == image_pathes.path.stat().st_size
+	assert image.original.get('hash') == compute_file_content_hash(image_pathes.path)
 	assert len(image.variants) == 1
 	assert image.variants[0]['format'] == 'webp'
 
@@ -154,11 +261,8 @@ def test_image_ingest_service_records_image(tmp_path: Path) -> None:
 	assert stats.ingest_id == ingest_id
 	assert stats.initial_score == 100
 
-	appended = ingest_core.appended
-	assert appended is not None
-	appended_ingest_id, entry = appended
-	assert appended_ingest_id == ingest_id
-	assert entry.status == ExecutionStatus.SUCCESS
+	assert [execution.status for execution in ingest_core.executions] == [ExecutionStatus.SUCCESS]
+	assert ingest_core.appended is None
 
 
 def test_image_ingest_service_records_failure_entry(tmp_path: Path) -> None:
@@ -180,8 +284,279 @@ def test_image_ingest_service_records_failure_entry(tmp_path: Path) -> None:
 			ingest_mode=IngestMode.COPY,
 		)
 
-	appended = ingest_core.appended
-	assert appended is not None
-	appended_ingest_id, entry = appended
-	assert appended_ingest_id == ingest_id
-	assert entry.status == ExecutionStatus.UNKNOWN_ERROR
+	assert ingest_core.created_batches == [1]
+	assert [execution.status for execution in ingest_core.executions] == [ExecutionStatus.UNKNOWN_ERROR]
+	assert ingest_core.appended is None
+
+
+def test_image_ingest_service_logs_executions_when_enabled(tmp_path: Path) -> None:
+	ingest_id = 8
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(ingest_id)
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now, log_executions=True)
+	service._ingest_core = DummyIngestCore(ingest)  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = FailingPipeline(tmp_path, [])  # pyright: ignore[reportAttributeAccessIssue]
+
+	with pytest.raises(ValueError, match='boom'):
+		service.ingest(
+			origin_path=image_pathes.relpath,
+			fingerprint=None,
+			captured_at=now,
+			ingest_mode=IngestMode.COPY,
+		)
+
+	created = cast(StubExecutionRepository, service._execution_repo).created
+	assert [entry.ingest_id for entry in created] == [ingest_id]
+	assert created[0].execution.status == ExecutionStatus.UNKNOWN_ERROR
+
+	assert _new_image_ingest_service_fixture(now)._execution_repo is None
+
+
+def test_image_ingest_service_ingest_many_keeps_request_order(tmp_path: Path) -> None:
+	ingest_id = 9
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(ingest_id)
+
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	layer = VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))
+	variant_file = build_variant_file(spec, width=320)
+	results = [VariantCommitResult.success('generate', VariantReport(spec, variant_file))]
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now)
+	ingest_core = DummyIngestCore(ingest)
+	service._ingest_core = ingest_core  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = DummyPipeline(tmp_path, [layer], results)  # pyright: ignore[reportAttributeAccessIssue]
+
+	requests = [
+		ImageIngestRequest(
+			origin_path=image_pathes.relpath,
+			fingerprint=f'fp-{index}',
+			captured_at=now,
+			ingest_mode=IngestMode.COPY,
+		)
+		for index in range(3)
+	]
+	outcomes = service.ingest_many(
+		requests,
+		scheduler=VariantScheduler(max_workers=2, memory_budget=1024),
+	)
+
+	assert len(outcomes) == 3
+	for outcome in outcomes:
+		assert outcome[0] is ingest
+		image = outcome[1]
+		assert image is not None
+		assert len(image.variants) == 1
+	assert ingest_core.created_batches == [3]
+
+
+def test_image_ingest_service_ingest_many_writes_rows_in_request_order(tmp_path: Path) -> None:
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(11)
+
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	layer = VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))
+	variant_file = build_variant_file(spec, width=320)
+	results = [VariantCommitResult.success('generate', VariantReport(spec, variant_file))]
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now)
+	ingest_core = OrderRecordingIngestCore(ingest)
+	service._ingest_core = ingest_core  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = DummyPipeline(tmp_path, [layer], results)  # pyright: ignore[reportAttributeAccessIssue]
+
+	requests = [
+		ImageIngestRequest(
+			origin_path=image_pathes.relpath,
+			fingerprint=f'fp-{index}',
+			captured_at=now,
+			ingest_mode=IngestMode.COPY,
+		)
+		for index in range(3)
+	]
+	service.ingest_many(requests, process_order=[2, 0, 1])
+
+	assert ingest_core.prepared == ['fp-2', 'fp-0', 'fp-1']
+	assert ingest_core.stored == ['fp-0', 'fp-1', 'fp-2']
+
+
+def test_image_ingest_service_ingest_many_writes_rows_once_per_batch(tmp_path: Path) -> None:
+	ingest_id = 10
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(ingest_id)
+
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	layer = VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))
+	variant_file = build_variant_file(spec, width=320)
+	results = [VariantCommitResult.success('generate', VariantReport(spec, variant_file))]
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now)
+	ingest_core = DummyIngestCore(ingest)
+	service._ingest_core = ingest_core  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = DummyPipeline(tmp_path, [layer], results)  # pyright: ignore[reportAttributeAccessIssue]
+
+	request = ImageIngestRequest(
+		origin_path=image_pathes.relpath,
+		fingerprint=None,
+		captured_at=now,
+		ingest_mode=IngestMode.COPY,
+	)
+	outcomes = service.ingest_many([request, request])
+
+	assert ingest_core.created_batches == [2]
+	assert [outcome[0].id for outcome in outcomes] == [ingest_id, ingest_id]
+
+	stats = cast(StubStatsRepository, service._stats_repo).created
+	assert [entry.ingest_id for entry in stats] == [ingest_id, ingest_id]
+
+	images = cast(StubImageRepository, service._image_repo).created
+	assert [image.ingest_id for image in images] == [ingest_id, ingest_id]
+	assert all(image.ingested_at == ingest.ingested_at for image in images)
+
+
+def test_image_ingest_service_ingest_many_writes_rows_inside_store_scope(tmp_path: Path) -> None:
+	ingest_id = 12
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(ingest_id)
+
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	layer = VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))
+	variant_file = build_variant_file(spec, width=320)
+	results = [VariantCommitResult.success('generate', VariantReport(spec, variant_file))]
+
+	events: list[str] = []
+
+	@contextmanager
+	def store_scope() -> Iterator[None]:
+		events.append('enter')
+		yield
+		events.append(f'exit:{len(stats_repo.created)}')
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now, store_scope=store_scope)
+	stats_repo = cast(StubStatsRepository, service._stats_repo)
+	service._ingest_core = DummyIngestCore(ingest)  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = DummyPipeline(tmp_path, [layer], results)  # pyright: ignore[reportAttributeAccessIssue]
+
+	request = ImageIngestRequest(
+		origin_path=image_pathes.relpath,
+		fingerprint=None,
+		captured_at=now,
+		ingest_mode=IngestMode.COPY,
+	)
+	service.ingest_many([request, request])
+
+	assert events == ['enter', 'exit:2']
+
+
+def test_image_ingest_service_ingest_many_skips_existing_ingests(tmp_path: Path) -> None:
+	ingest_id = 13
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(ingest_id)
+
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	layer = VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))
+	variant_file = build_variant_file(spec, width=320)
+	results = [VariantCommitResult.success('generate', VariantReport(spec, variant_file))]
+	variant_path = tmp_path / variant_file.file_info.relative_path
+	variant_path.parent.mkdir(parents=True)
+	variant_path.touch()
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now, log_executions=True)
+	ingest_core = OrderRecordingIngestCore(ingest)
+	ingest_core.existing = {'b' * 64}
+	service._ingest_core = ingest_core  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = DummyPipeline(tmp_path, [layer], results)  # pyright: ignore[reportAttributeAccessIssue]
+
+	requests = [
+		ImageIngestRequest(
+			origin_path=image_pathes.relpath,
+			fingerprint=fingerprint,
+			captured_at=now,
+			ingest_mode=IngestMode.COPY,
+		)
+		for fingerprint in ('a' * 64, 'b' * 64, 'a' * 64, 'c' * 64, 'd' * 64)
+	]
+	outcomes = service.ingest_many(requests, skip_existing=True)
+
+	# stored and repeated fingerprints are dropped before anything is processed
+	assert ingest_core.prepared == ['a' * 64, 'c' * 64, 'd' * 64]
+	# the second one lost a race to a row of another path, so its variants are gone
+	assert not variant_path.exists()
+	assert len(outcomes) == 2
+	assert len(cast(StubStatsRepository, service._stats_repo).created) == 2
+	assert len(cast(StubImageRepository, service._image_repo).created) == 2
+	assert len(cast(StubExecutionRepository, service._execution_repo).created) == 2
+
+
+def test_image_ingest_service_ingest_many_raises_after_recording_failures(tmp_path: Path) -> None:
+	ingest_id = 11
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(ingest_id)
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service = _new_image_ingest_service_fixture(now)
+	ingest_core = DummyIngestCore(ingest)
+	service._ingest_core = ingest_core  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = FailingPipeline(tmp_path, [])  # pyright: ignore[reportAttributeAccessIssue]
+
+	request = ImageIngestRequest(
+		origin_path=image_pathes.relpath,
+		fingerprint=None,
+		captured_at=now,
+		ingest_mode=IngestMode.COPY,
+	)
+	with pytest.raises(ValueError, match='boom'):
+		service.ingest_many(
+			[request, request],
+			scheduler=VariantScheduler(max_workers=2, memory_budget=1024),
+		)
+
+	assert [execution.status for execution in ingest_core.executions] == [
+		ExecutionStatus.UNKNOWN_ERROR,
+		ExecutionStatus.UNKNOWN_ERROR,
+	]
+
+
+def test_image_ingest_service_tracks_written_files_for_group_sync(tmp_path: Path) -> None:
+	image_pathes = new_image_file_fixture(tmp_path)
+	ingest = make_ingest_fixture(13, relative_path=image_pathes.relpath_str)
+
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	layer = VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))
+	variant_file = build_variant_file(spec, width=320)
+	marker_path = tmp_path / 'l1w640' / 'sample.pruned'
+	orphan_path = tmp_path / 'l1w960' / 'sample.webp'
+	results = [
+		VariantCommitResult.success('reuse', VariantReport(spec, variant_file)),
+		VariantCommitResult.success('generate', VariantReport(spec, variant_file)),
+		VariantCommitResult.success('prune', None, touched_path=marker_path),
+		VariantCommitResult.success('delete', None, touched_path=orphan_path),
+	]
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	group_sync = GroupSync(max_units=1, max_delay=60)
+	service = _new_image_ingest_service_fixture(now)
+	service._group_sync = group_sync
+	service._ingest_core = DummyIngestCore(ingest)  # pyright: ignore[reportAttributeAccessIssue]
+	service._pipeline = DummyPipeline(tmp_path, [layer], results)  # pyright: ignore[reportAttributeAccessIssue]
+
+	service.ingest(
+		origin_path=image_pathes.relpath,
+		fingerprint=None,
+		captured_at=now,
+		ingest_mode=IngestMode.COPY,
+	)
+
+	assert group_sync._files == {
+		variant_file.file_info.absolute_path,
+		image_pathes.path,
+		marker_path,
+		orphan_path,
+	}
+	assert group_sync.should_flush()
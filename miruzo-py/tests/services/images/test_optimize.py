@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+from tests.fixtures.image_file import new_image_file_fixture
+from tests.services.images.utils import build_variant
+from tests.stubs.image import StubImageRepository
+
+from app.config.variant import (
+	FAST_ENCODER_PROFILE,
+	WEBP_FORMAT,
+	VariantLayerSpec,
+	VariantSlot,
+	VariantSpec,
+)
+from app.models.enums import ImageKind
+from app.persist.images.protocol import ImageVariantsEntry
+from app.services.images.optimize import ImageOptimizeService
+from app.services.images.variants.generate import generate_variant
+from app.services.images.variants.mapper import map_commit_result_to_variant_record
+from app.services.images.variants.path import VariantRelativePath
+from app.services.images.variants.pipeline import VariantPipeline
+from app.services.images.variants.types import DEFAULT_VARIANT_POLICY, OriginalImage, VariantPlanFile
+from app.services.images.variants.utils import get_image_info_from_file
+from app.utils.files.content_hash import compute_file_content_hash
+
+
+def _new_service(
+	tmp_path: Path,
+	repository: StubImageRepository,
+	spec: VariantSpec,
+) -> ImageOptimizeService:
+	service = ImageOptimizeService(repository, policy=DEFAULT_VARIANT_POLICY)
+	service._pipeline = VariantPipeline(  # pyright: ignore[reportPrivateUsage]
+		media_root=tmp_path,
+		policy=DEFAULT_VARIANT_POLICY,
+		spec=[VariantLayerSpec(name='primary', layer_id=1, specs=(spec,))],
+	)
+	return service
+
+
+def test_optimize_reencodes_fast_variants(tmp_path: Path) -> None:
+	image_pathes = new_image_file_fixture(tmp_path, image_size=(128, 96))
+	spec = VariantSpec(slot=VariantSlot(1, 64), layer_id=1, width=64, format=WEBP_FORMAT, quality=80)
+	relative_path = VariantRelativePath(Path(spec.slot.key) / 'sample.webp')
+	(tmp_path / relative_path).parent.mkdir(parents=True)
+
+	with PILImage.open(image_pathes.path) as image:
+		original = OriginalImage(
+			image=image.convert('RGB'),
+			info=get_image_info_from_file(image_pathes.path),
+		)
+	report = generate_variant(
+		tmp_path,
+		VariantPlanFile(relative_path, spec),
+		original,
+		durable_write=False,
+		profile=FAST_ENCODER_PROFILE,
+	)
+	assert report is not None
+	fast_variant = map_commit_result_to_variant_record(report)
+	other_variant = build_variant('jpeg', 320, layer_id=9, label='fallback')
+
+	entry = ImageVariantsEntry(
+		ingest_id=3,
+		relative_path=image_pathes.relpath_str,
+		kind=ImageKind.PHOTO,
+		variants=[fast_variant, other_variant],
+	)
+	repository = StubImageRepository([entry])
+	service = _new_service(tmp_path, repository, spec)
+
+	assert service.list_candidates(limit=10) == [entry]
+	assert service.optimize(entry) is True
+
+	updated = repository.updated[3]
+	assert updated[0]['rel'] == fast_variant['rel']
+	assert updated[0]['encoder'] == 'archival'
+	# kept variants recorded without a hash get it backfilled once
+	assert updated[1] == {**other_variant, 'hash': compute_file_content_hash(Path(other_variant['rel']))}
+
+
+def test_optimize_skips_images_without_fast_variants(tmp_path: Path) -> None:
+	spec = VariantSpec(slot=VariantSlot(1, 64), layer_id=1, width=64, format=WEBP_FORMAT, quality=80)
+	entry = ImageVariantsEntry(
+		ingest_id=4,
+		relative_path='l0orig/missing.png',
+		kind=ImageKind.PHOTO,
+		variants=[build_variant('webp', 320)],
+	)
+	repository = StubImageRepository([entry])
+
+	assert _new_service(tmp_path, repository, spec).optimize(entry) is False
+	assert repository.updated == {}
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.fixtures.image_file import new_image_file_fixture
+from tests.services.images.utils import build_variant_spec
+
+from app.models.enums import ImageKind
+from app.services.images.variants.executors.isolated import (
+	IsolatedVariantExecutor,
+	VariantMemoryLimitError,
+	VariantTimeoutError,
+)
+from app.services.images.variants.path import VariantRelativePath
+from app.services.images.variants.types import (
+	FileInfo,
+	OriginalFile,
+	VariantPlan,
+	VariantPlanFile,
+	VariantPolicy,
+)
+from app.services.images.variants.utils import get_image_info_from_file
+
+_POLICY = VariantPolicy(
+	durable_write=False,
+	regenerate_mismatched=False,
+	generate_missing=True,
+	delete_orphaned=False,
+)
+
+
+def _build_request(tmp_path: Path) -> tuple[OriginalFile, VariantPlan]:
+	image_pathes = new_image_file_fixture(tmp_path, image_size=(64, 48))
+	file_info = FileInfo.from_relative_path(VariantRelativePath(image_pathes.relpath), under=tmp_path)
+	file = OriginalFile(
+		file_info=file_info,
+		image_info=get_image_info_from_file(image_pathes.path),
+	)
+
+	spec = build_variant_spec(1, 32, container='webp', codecs='vp8')
+	plan = VariantPlan(
+		matched=[],
+		mismatched=[],
+		missing=[VariantPlanFile(path=VariantRelativePath(Path('l1w32/sample.webp')), spec=spec)],
+		orphaned=[],
+	)
+	return file, plan
+
+
+def test_isolated_executor_generates_variants_in_worker(tmp_path: Path) -> None:
+	file, plan = _build_request(tmp_path)
+	(tmp_path / 'l1w32').mkdir()
+
+	with IsolatedVariantExecutor(timeout=60) as executor:
+		execution = executor.execute(media_root=tmp_path, file=file, plan=plan, policy=_POLICY)
+
+	assert [(result.action, result.result) for result in execution.results] == [('generate', 'success')]
+	assert execution.kind != ImageKind.UNSPECIFIED
+	assert (tmp_path / 'l1w32' / 'sample.webp').is_file()
+
+
+def test_isolated_executor_kills_worker_on_timeout_and_recovers(tmp_path: Path) -> None:
+	file, plan = _build_request(tmp_path)
+	(tmp_path / 'l1w32').mkdir()
+
+	# A fresh worker is still importing when a 1 ms budget runs out.
+	with IsolatedVariantExecutor(timeout=0.001) as executor:
+		with pytest.raises(VariantTimeoutError):
+			executor.execute(media_root=tmp_path, file=file, plan=plan, policy=_POLICY)
+		assert executor._idle == []
+
+		executor._timeout = 60
+		execution = executor.execute(media_root=tmp_path, file=file, plan=plan, policy=_POLICY)
+
+	assert [result.result for result in execution.results] == ['success']
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='RSS is only sampled on Linux')
+def test_isolated_executor_kills_worker_over_memory_limit(tmp_path: Path) -> None:
+	file, plan = _build_request(tmp_path)
+
+	with IsolatedVariantExecutor(timeout=60, memory_limit=1) as executor:
+		with pytest.raises(VariantMemoryLimitError):
+			executor.execute(media_root=tmp_path, file=file, plan=plan, policy=_POLICY)
+
+
+@pytest.mark.parametrize(
+	('timeout', 'memory_limit'),
+	[(0, None), (1, 0)],
+)
+def test_isolated_executor_rejects_invalid_budgets(timeout: float, memory_limit: int | None) -> None:
+	with pytest.raises(ValueError, match='must be greater'):
+		IsolatedVariantExecutor(timeout=timeout, memory_limit=memory_limit)
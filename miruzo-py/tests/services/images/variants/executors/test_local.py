@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from tests.fixtures.image_file import new_image_file_fixture
+
+from app.config.variant import LOSSLESS_WEBP_FORMAT, WEBP_FORMAT, VariantSlot, VariantSpec
+from app.models.enums import ImageKind
+from app.services.images.variants.executors.local import LocalVariantExecutor
+from app.services.images.variants.path import VariantRelativePath
+from app.services.images.variants.types import (
+	FileInfo,
+	OriginalFile,
+	VariantPlan,
+	VariantPlanFile,
+	VariantPolicy,
+)
+from app.services.images.variants.utils import get_image_info_from_file
+
+_POLICY = VariantPolicy(
+	durable_write=False,
+	regenerate_mismatched=True,
+	generate_missing=True,
+	delete_orphaned=False,
+)
+
+
+def _build_request(tmp_path: Path, *, kind: ImageKind) -> tuple[OriginalFile, VariantPlan]:
+	image_pathes = new_image_file_fixture(tmp_path, image_size=(64, 48))
+	file_info = FileInfo.from_relative_path(VariantRelativePath(image_pathes.relpath), under=tmp_path)
+	file = OriginalFile(
+		file_info=file_info,
+		image_info=get_image_info_from_file(image_pathes.path),
+		kind=kind,
+	)
+
+	spec = VariantSpec(slot=VariantSlot(1, 32), layer_id=1, width=32, format=WEBP_FORMAT, quality=80)
+	plan = VariantPlan(
+		matched=[],
+		mismatched=[],
+		missing=[VariantPlanFile(path=VariantRelativePath(Path('l1w32/sample.webp')), spec=spec)],
+		orphaned=[],
+	)
+	(tmp_path / 'l1w32').mkdir()
+	return file, plan
+
+
+def test_local_executor_classifies_and_encodes_for_the_kind(tmp_path: Path) -> None:
+	file, plan = _build_request(tmp_path, kind=ImageKind.UNSPECIFIED)
+
+	execution = LocalVariantExecutor().execute(media_root=tmp_path, file=file, plan=plan, policy=_POLICY)
+
+	# a single flat color is a graphic, which is encoded losslessly
+	assert execution.kind == ImageKind.GRAPHIC
+	report = execution.results[0].report
+	assert report is not None
+	assert report.spec.format == LOSSLESS_WEBP_FORMAT
+	assert (tmp_path / 'l1w32' / 'sample.webp').read_bytes()[12:16] == b'VP8L'
+
+
+def test_local_executor_keeps_a_known_kind(tmp_path: Path) -> None:
+	file, plan = _build_request(tmp_path, kind=ImageKind.PHOTO)
+
+	execution = LocalVariantExecutor().execute(media_root=tmp_path, file=file, plan=plan, policy=_POLICY)
+
+	assert execution.kind == ImageKind.PHOTO
+	report = execution.results[0].report
+	assert report is not None
+	assert report.spec.format == WEBP_FORMAT
@@ -0,0 +1,67 @@
+import io
+import random
+
+from PIL import Image as PILImage
+from PIL import ImageDraw, ImageFilter
+
+from app.models.enums import ImageKind
+from app.services.images.variants.classify import (
+	ImageFeatures,
+	classify_features,
+	classify_image,
+)
+
+
+def _new_graphic() -> PILImage.Image:
+	image = PILImage.new('RGB', (800, 600), 'white')
+	draw = ImageDraw.Draw(image)
+	for i in range(10):
+		draw.rectangle((i * 60, i * 40, i * 60 + 200, i * 40 + 100), fill=(i * 20, 100, 200 - i * 10))
+	return image
+
+
+def _new_photo() -> PILImage.Image:
+	noise = PILImage.effect_noise((800, 600), 40).convert('RGB')
+	gradient = PILImage.linear_gradient('L').resize((800, 600)).convert('RGB')
+	return PILImage.blend(noise, gradient, 0.5).filter(ImageFilter.GaussianBlur(1))
+
+
+def _new_illust() -> PILImage.Image:
+	rng = random.Random(1)
+	image = PILImage.new('RGB', (800, 600), (250, 240, 230))
+	draw = ImageDraw.Draw(image)
+	for _ in range(25):
+		x, y = rng.randint(0, 700), rng.randint(0, 500)
+		fill = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+		box = (x, y, x + rng.randint(40, 200), y + rng.randint(40, 200))
+		draw.ellipse(box, fill=fill, outline='black', width=3)
+
+	# lossy compression spreads the flat fills over many nearby colors
+	buffer = io.BytesIO()
+	image.save(buffer, format='JPEG', quality=90)
+	return PILImage.open(buffer)
+
+
+def test_classify_image_detects_flat_graphic() -> None:
+	assert classify_image(_new_graphic()) == ImageKind.GRAPHIC
+
+
+def test_classify_image_detects_photo() -> None:
+	assert classify_image(_new_photo()) == ImageKind.PHOTO
+
+
+def test_classify_image_detects_illustration() -> None:
+	assert classify_image(_new_illust()) == ImageKind.ILLUST
+
+
+def test_classify_features_needs_edges_for_illustration() -> None:
+	features = ImageFeatures(color_ratio=0.1, flat_ratio=0.8, edge_ratio=0.0)
+
+	assert classify_features(features) == ImageKind.PHOTO
+
+
+def test_classify_image_samples_palette_images_without_converting_first() -> None:
+	graphic = _new_graphic().quantize(colors=16)
+
+	assert graphic.mode == 'P'
+	assert classify_image(graphic) == ImageKind.GRAPHIC
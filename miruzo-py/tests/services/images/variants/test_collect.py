@@ -4,12 +4,18 @@ import pytest
 
 from tests.services.images.variants.utils import build_jpeg_info
 
+from app.config.variant import VariantSlot
 from app.services.images.variants.collect import (
+	collect_pruned_slots,
 	collect_variant_directories,
 	collect_variant_files,
 	normalize_media_relative_paths,
 )
-from app.services.images.variants.path import VariantRelativePath, map_origin_to_variant_basepath
+from app.services.images.variants.path import (
+	PRUNED_MARKER_SUFFIX,
+	VariantRelativePath,
+	map_origin_to_variant_basepath,
+)
 from app.services.images.variants.types import FileInfo, VariantFile
 
 
@@ -91,3 +97,15 @@ def test_normalize_media_relative_paths_filters_invalid() -> None:
 	paths = list(normalize_media_relative_paths(basepath, under=valid + invalid))
 
 	assert [str(path) for path in paths] == [f'{name}/foo/bar' for name in valid]
+
+
+def test_collect_pruned_slots_reads_markers_and_skips_them_as_files(tmp_path: Path) -> None:
+	for dirname in ('l1w200', 'l1w400'):
+		(tmp_path / dirname / 'foo').mkdir(parents=True)
+	(tmp_path / 'l1w400' / 'foo' / f'bar{PRUNED_MARKER_SUFFIX}').write_bytes(b'')
+
+	basepath = map_origin_to_variant_basepath(Path('l0orig/foo/bar.webp'))
+	media_relpaths = list(normalize_media_relative_paths(basepath, under=['l1w200', 'l1w400']))
+
+	assert list(collect_pruned_slots(media_relpaths, under=tmp_path)) == [VariantSlot(1, 400)]
+	assert list(collect_variant_files(media_relpaths, under=tmp_path)) == []
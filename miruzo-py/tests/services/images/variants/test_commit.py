@@ -1,11 +1,26 @@
+from dataclasses import replace
 from pathlib import Path
 
-from tests.services.images.variants.utils import build_webp_info
+from PIL import Image as PILImage
+
+from tests.services.images.utils import build_variant_spec
+from tests.services.images.variants.utils import build_png_info, build_webp_info
 
 from app.config.variant import WEBP_FORMAT, VariantSlot, VariantSpec
-from app.services.images.variants.commit import _delete_variant_file
-from app.services.images.variants.path import VariantRelativePath
-from app.services.images.variants.types import FileInfo, VariantFile
+from app.services.images.variants.commit import _delete_variant_file, commit_variant_plan
+from app.services.images.variants.generate import generate_variant
+from app.services.images.variants.path import PRUNED_MARKER_SUFFIX, VariantRelativePath
+from app.services.images.variants.types import (
+	FileInfo,
+	OriginalImage,
+	VariantComparison,
+	VariantFile,
+	VariantPlan,
+	VariantPlanFile,
+	VariantPolicy,
+	VariantRegeneratePlan,
+)
+from app.utils.files.content_hash import compute_content_hash
 
 
 def _build_variant_file(file_path: Path, file_name: Path) -> VariantFile:
@@ -38,9 +53,38 @@ def test_delete_variant_file_succeeds_when_file_exists(tmp_path: Path) -> None:
 
 	assert result.action == 'delete'
 	assert result.result == 'success'
+	assert result.touched_path == file_path
 	assert not file_path.exists()
 
 
+def test_commit_variant_plan_reuses_variant_without_reading_it(tmp_path: Path) -> None:
+	file_name = Path('reused.webp')
+	file_path = tmp_path / file_name
+	file_path.write_bytes(b'reused')
+	variant_file = _build_variant_file(file_path, file_name)
+	spec = build_variant_spec(1, 200, container='webp', codecs='vp8')
+	plan = VariantPlan(
+		matched=[VariantComparison(expected_spec=spec, actual_file=variant_file)],
+		mismatched=[],
+		missing=[],
+		orphaned=[],
+	)
+	original = OriginalImage(image=PILImage.new('RGB', (8, 8)), info=build_png_info(width=8, height=8))
+
+	results = commit_variant_plan(
+		plan=plan,
+		policy=_REGENERATE_POLICY,
+		original=original,
+		media_root=tmp_path,
+	)
+
+	assert [(result.action, result.result) for result in results] == [('reuse', 'success')]
+	report = results[0].report
+	assert report is not None
+	# the hash is only taken from encoded buffers, never by reading files back
+	assert report.file.file_info.content_hash is None
+
+
 def test_delete_variant_file_returns_missing_when_file_absent(tmp_path: Path) -> None:
 	file_name = Path('missing.webp')
 	file_path = tmp_path / file_name
@@ -50,3 +94,135 @@ def test_delete_variant_file_returns_missing_when_file_absent(tmp_path: Path) ->
 
 	assert result.result == 'failure'
 	assert result.reason == 'file_already_missing'
+
+
+def _build_regenerate_plan(
+	tmp_path: Path,
+	*,
+	existing_quality: int,
+) -> tuple[VariantPlan, OriginalImage, Path]:
+	spec = build_variant_spec(1, 40, container='webp', codecs='vp8', quality=80)
+	original = OriginalImage(
+		image=PILImage.linear_gradient('L').convert('RGB').resize((80, 60)),
+		info=build_png_info(width=80, height=60),
+	)
+	relative_path = VariantRelativePath(Path(spec.slot.key) / 'sample.webp')
+	absolute_path = tmp_path / relative_path
+	absolute_path.parent.mkdir(parents=True)
+
+	existing_spec = build_variant_spec(1, 40, container='webp', codecs='vp8', quality=existing_quality)
+	report = generate_variant(
+		tmp_path,
+		VariantPlanFile(relative_path, existing_spec),
+		original,
+		durable_write=False,
+	)
+	assert report is not None
+
+	plan = VariantPlan(
+		matched=[],
+		mismatched=[
+			VariantRegeneratePlan(
+				actual_file=report.file,
+				planning_file=VariantPlanFile(relative_path, spec),
+			),
+		],
+		missing=[],
+		orphaned=[],
+	)
+	return plan, original, absolute_path
+
+
+_REGENERATE_POLICY = VariantPolicy(
+	durable_write=False,
+	regenerate_mismatched=True,
+	generate_missing=False,
+	delete_orphaned=False,
+)
+
+
+def test_commit_variant_plan_skips_byte_identical_regeneration(tmp_path: Path) -> None:
+	plan, original, absolute_path = _build_regenerate_plan(tmp_path, existing_quality=80)
+	before = absolute_path.stat()
+
+	results = commit_variant_plan(
+		plan=plan,
+		policy=_REGENERATE_POLICY,
+		original=original,
+		media_root=tmp_path,
+	)
+
+	assert [(result.action, result.result) for result in results] == [('unchanged', 'success')]
+	report = results[0].report
+	assert report is not None
+	assert report.file.file_info.absolute_path == absolute_path
+	after = absolute_path.stat()
+	assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+def test_commit_variant_plan_rewrites_changed_regeneration(tmp_path: Path) -> None:
+	plan, original, absolute_path = _build_regenerate_plan(tmp_path, existing_quality=20)
+	before = absolute_path.read_bytes()
+
+	results = commit_variant_plan(
+		plan=plan,
+		policy=_REGENERATE_POLICY,
+		original=original,
+		media_root=tmp_path,
+	)
+
+	assert [(result.action, result.result) for result in results] == [('regenerate', 'success')]
+	assert absolute_path.read_bytes() != before
+
+
+def _build_missing_plan() -> tuple[VariantPlan, OriginalImage]:
+	original = OriginalImage(
+		image=PILImage.effect_noise((200, 150), 60).convert('RGB'),
+		info=build_png_info(width=200, height=150),
+	)
+	missing: list[VariantPlanFile] = []
+	for width, required in ((40, True), (80, False)):
+		spec = build_variant_spec(1, width, container='webp', codecs='vp8', quality=80, required=required)
+		relative_path = VariantRelativePath(Path(spec.slot.key) / 'sample.webp')
+		missing.append(VariantPlanFile(relative_path, spec))
+
+	plan = VariantPlan(matched=[], mismatched=[], missing=missing, orphaned=[])
+	return plan, original
+
+
+_GENERATE_POLICY = VariantPolicy(
+	durable_write=False,
+	regenerate_mismatched=False,
+	generate_missing=True,
+	delete_orphaned=False,
+)
+
+
+def test_commit_variant_plan_prunes_variant_below_threshold(tmp_path: Path) -> None:
+	plan, original = _build_missing_plan()
+	policy = replace(_GENERATE_POLICY, prune_threshold=100.0)
+
+	results = commit_variant_plan(plan=plan, policy=policy, original=original, media_root=tmp_path)
+
+	assert [(result.action, result.result) for result in results] == [
+		('generate', 'success'),
+		('prune', 'success'),
+	]
+	assert (tmp_path / 'l1w40' / 'sample.webp').exists()
+	assert not (tmp_path / 'l1w80' / 'sample.webp').exists()
+	assert (tmp_path / 'l1w80' / f'sample{PRUNED_MARKER_SUFFIX}').exists()
+	assert results[1].touched_path == tmp_path / 'l1w80' / f'sample{PRUNED_MARKER_SUFFIX}'
+
+
+def test_commit_variant_plan_keeps_variants_without_threshold(tmp_path: Path) -> None:
+	plan, original = _build_missing_plan()
+
+	results = commit_variant_plan(
+		plan=plan,
+		policy=_GENERATE_POLICY,
+		original=original,
+		media_root=tmp_path,
+	)
+
+	assert [result.action for result in results] == ['generate', 'generate']
+	assert (tmp_path / 'l1w80' / 'sample.webp').exists()
@@ -1,25 +1,31 @@
+import io
 from pathlib import Path
 
 import pytest
 from PIL import Image as PILImage
+from PIL import JpegImagePlugin
 
 from tests.services.images.utils import build_variant_spec
 from tests.services.images.variants.utils import build_png_info
 
-from app.services.images.variants.generate import _save_variant, generate_variant
+from app.config.variant import ARCHIVAL_ENCODER_PROFILE, FAST_ENCODER_PROFILE, VariantEncoderProfile
+from app.services.images.variants.generate import generate_variant, render_variant, write_variant
 from app.services.images.variants.path import VariantRelativePath
 from app.services.images.variants.types import OriginalImage, VariantPlanFile
+from app.utils.files.content_hash import compute_content_hash
 
 
-def test_save_variant_writes_jpeg(tmp_path: Path) -> None:
-	spec = build_variant_spec(1, 200, quality=80)
+def test_write_variant_writes_jpeg(tmp_path: Path) -> None:
+	spec = build_variant_spec(1, 50, quality=80)
 	image = PILImage.new('RGB', (50, 40), color='green')
+	original = OriginalImage(image=image, info=build_png_info(width=50, height=40))
 	file = Path('foo.jpg')
 	target = tmp_path / file
 
-	file = _save_variant(
-		spec,
-		image,
+	encoded = render_variant(spec, original)
+	assert encoded is not None
+	file = write_variant(
+		encoded,
 		media_root=tmp_path,
 		variant_relpath=VariantRelativePath(file),
 		durable_write=False,
@@ -28,23 +34,19 @@ def test_save_variant_writes_jpeg(tmp_path: Path) -> None:
 	assert file is not None
 	assert target.exists()
 	assert file.file_info.bytes > 0
+	assert file.file_info.content_hash == compute_content_hash(target.read_bytes())
 	assert file.image_info.container == 'jpeg'
 	assert file.image_info.width == 50
 	assert file.image_info.height == 40
 
 
-def test_save_variant_raises_for_unsupported_format(tmp_path: Path) -> None:
+def test_render_variant_raises_for_unsupported_format() -> None:
 	spec = build_variant_spec(1, 200, container='gif', codecs=None)
 	image = PILImage.new('RGB', (10, 10))
+	original = OriginalImage(image=image, info=build_png_info(width=10, height=10))
 
 	with pytest.raises(ValueError, match='Unsupported variant spec'):
-		_save_variant(
-			spec,
-			image,
-			media_root=tmp_path,
-			variant_relpath=VariantRelativePath(Path('foo.gif')),
-			durable_write=False,
-		)
+		render_variant(spec, original)
 
 
 def test_generate_variant_writes_relative_path(tmp_path: Path) -> None:
@@ -67,3 +69,40 @@ def test_generate_variant_writes_relative_path(tmp_path: Path) -> None:
 	output_path = tmp_path / group_path
 	assert report.file.file_info.absolute_path == output_path
 	assert output_path.exists()
+
+
+def test_generate_variant_records_searched_quality(tmp_path: Path) -> None:
+	spec = build_variant_spec(1, 64, container='webp', codecs='vp8', quality=80)
+	image = PILImage.new('RGB', (128, 96), color='blue')
+	original = OriginalImage(image=image, info=build_png_info(width=128, height=96))
+	path = Path(spec.slot.key) / f'flat{spec.format.file_extension}'
+	(tmp_path / path.parent).mkdir(parents=True)
+	plan_file = VariantPlanFile(VariantRelativePath(path), spec)
+
+	report = generate_variant(tmp_path, plan_file, original, durable_write=False, quality_target=0.95)
+
+	# a flat image reaches the target at the lowest probed quality
+	assert report is not None
+	assert report.spec.quality is not None
+	assert report.spec.quality < 80
+	assert report.spec.slot == spec.slot
+
+
+@pytest.mark.parametrize(
+	('profile', 'progressive'),
+	[(FAST_ENCODER_PROFILE, False), (ARCHIVAL_ENCODER_PROFILE, True)],
+)
+def test_render_variant_applies_encoder_profile(profile: VariantEncoderProfile, progressive: bool) -> None:
+	spec = build_variant_spec(1, 64, quality=80)
+	original = OriginalImage(
+		image=PILImage.new('RGB', (128, 96), color='red'),
+		info=build_png_info(width=128, height=96),
+	)
+
+	encoded = render_variant(spec, original, profile=profile)
+
+	assert encoded is not None
+	assert encoded.profile is profile
+	with PILImage.open(io.BytesIO(encoded.data)) as image:
+		assert isinstance(image, JpegImagePlugin.JpegImageFile)
+		assert bool(image.info.get('progressive')) is progressive
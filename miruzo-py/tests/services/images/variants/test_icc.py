@@ -0,0 +1,67 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageCms
+
+from tests.services.images.variants.utils import build_png_info
+
+from app.services.images.variants.icc import (
+	clear_icc_transform_cache,
+	get_icc_transform_cache_stats,
+	get_srgb_transform,
+)
+from app.services.images.variants.preprocess import preprocess_original
+
+_DISPLAY_P3 = (Path(__file__).parent / 'icc' / 'display_p3.icc').read_bytes()
+
+
+def _srgb_profile_bytes() -> bytes:
+	profile = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))  # pyright: ignore[reportUnknownArgumentType, reportUnknownMemberType]
+	return profile.tobytes()
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache() -> Iterator[None]:
+	clear_icc_transform_cache()
+	yield
+	clear_icc_transform_cache()
+
+
+def test_get_srgb_transform_caches_by_profile_and_mode() -> None:
+	first = get_srgb_transform(_DISPLAY_P3, 'RGB')
+	second = get_srgb_transform(bytes(_DISPLAY_P3), 'RGB')
+
+	assert first is not None
+	assert second is first
+
+	stats = get_icc_transform_cache_stats()
+	assert stats.hits == 1
+	assert stats.misses == 1
+	assert stats.size == 1
+
+
+def test_get_srgb_transform_skips_srgb_equivalent_profile() -> None:
+	assert get_srgb_transform(_srgb_profile_bytes(), 'RGB') is None
+	assert get_srgb_transform(_srgb_profile_bytes(), 'RGB') is None
+
+	stats = get_icc_transform_cache_stats()
+	assert stats.hits == 1
+	assert stats.misses == 1
+
+
+def test_get_srgb_transform_raises_for_broken_profile() -> None:
+	with pytest.raises((ImageCms.PyCMSError, OSError)):
+		get_srgb_transform(b'not a profile', 'RGB')
+
+	assert get_icc_transform_cache_stats().size == 0
+
+
+def test_preprocess_original_drops_srgb_profile_without_changing_pixels() -> None:
+	image = Image.new('RGB', (1, 1), (200, 120, 40))
+	image.info['icc_profile'] = _srgb_profile_bytes()
+
+	result = preprocess_original(image, build_png_info(width=1))
+
+	assert 'icc_profile' not in result.info
+	assert result.getpixel((0, 0)) == (200, 120, 40)
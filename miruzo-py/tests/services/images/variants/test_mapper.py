@@ -1,11 +1,13 @@
 from collections.abc import Sequence
+from dataclasses import replace
 from pathlib import Path
 
 from tests.services.images.utils import build_variant_spec
 
-from app.config.variant import VariantLayerSpec, VariantSpec
+from app.config.variant import FAST_ENCODER_PROFILE, VariantLayerSpec, VariantSpec
 from app.models.types import VariantEntry
 from app.services.images.variants.mapper import (
+	map_commit_result_to_variant_record,
 	map_commit_results_to_variants,
 	map_original_info_to_variant_record,
 	map_variants_to_layers,
@@ -244,3 +246,44 @@ def test_map_variants_to_layers_sorts_widths() -> None:
 	mapped = map_variants_to_layers(variants, spec=[layer])
 
 	assert [entry['width'] for entry in mapped[0]] == [320, 640]
+
+
+def test_map_commit_result_to_variant_record_includes_content_hash(tmp_path: Path) -> None:
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	file = _build_variant_file(
+		tmp_path,
+		spec,
+		bytes=100,
+		width=320,
+		height=240,
+		container='webp',
+		codecs='vp8',
+	)
+	file = VariantFile(
+		file_info=replace(file.file_info, content_hash='0123456789abcdef'),
+		image_info=file.image_info,
+		variant_dir=file.variant_dir,
+	)
+
+	record = map_commit_result_to_variant_record(VariantReport(spec, file))
+
+	assert record['hash'] == '0123456789abcdef'
+
+
+def test_map_commit_result_to_variant_record_includes_encoder_profile(tmp_path: Path) -> None:
+	spec = build_variant_spec(1, 320, container='webp', codecs='vp8')
+	file = _build_variant_file(
+		tmp_path,
+		spec,
+		bytes=100,
+		width=320,
+		height=240,
+		container='webp',
+		codecs='vp8',
+	)
+
+	fast = map_commit_result_to_variant_record(VariantReport(spec, file, profile=FAST_ENCODER_PROFILE))
+	reused = map_commit_result_to_variant_record(VariantReport(spec, file))
+
+	assert fast['encoder'] == 'fast'
+	assert 'encoder' not in reused
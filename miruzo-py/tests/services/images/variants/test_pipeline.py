@@ -7,6 +7,7 @@ import pytest
 from tests.services.images.utils import build_variant_spec
 
 from app.config.variant import VariantLayerSpec, VariantSpec
+from app.models.enums import ImageKind
 from app.services.images.variants.path import (
 	VariantBasePath,
 	VariantRelativePath,
@@ -111,9 +112,12 @@ def test_pipeline_run_builds_plan_and_executes(
 	def fake_emit_variant_specs(
 		layers_arg: list[VariantLayerSpec],
 		image_info_arg: ImageInfo,
+		*,
+		kind: ImageKind,
 	) -> list[VariantSpec]:
 		assert layers_arg == layers
 		assert image_info_arg == image_info
+		assert kind == ImageKind.UNSPECIFIED
 		return [spec]
 
 	def fake_build_variant_plan(
@@ -9,6 +9,7 @@ from sqlalchemy.exc import DataError
 from tests.stubs.clock import FixedClockProvider
 
 from app.models.enums import ExecutionStatus
+from app.services.images.variants.executors.isolated import VariantTimeoutError
 from app.services.images.variants.pipeline_execution import VariantPipelineExecutionSession
 from app.services.images.variants.types import (
 	OriginalFile,
@@ -67,6 +68,13 @@ def test_execution_session_to_entry_records_success() -> None:
 			None,
 			True,
 		),
+		(
+			VariantTimeoutError('variant generation exceeded 1s'),
+			ExecutionStatus.RESOURCE_ERROR,
+			'VariantTimeoutError',
+			'variant generation exceeded 1s',
+			True,
+		),
 		(
 			ValueError('boom'),
 			ExecutionStatus.UNKNOWN_ERROR,
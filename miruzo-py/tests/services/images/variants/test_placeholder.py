@@ -0,0 +1,81 @@
+import base64
+import io
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+from tests.services.images.utils import build_variant_spec
+from tests.services.images.variants.utils import build_variant_file
+
+from app.services.images.variants.placeholder import (
+	PLACEHOLDER_SIZE,
+	create_placeholder,
+	create_placeholder_from_file,
+	select_placeholder_source,
+)
+from app.services.images.variants.types import VariantCommitResult, VariantReport
+
+
+def _decode_data_uri(data_uri: str) -> PILImage.Image:
+	prefix = 'data:image/webp;base64,'
+	assert data_uri.startswith(prefix)
+	image = PILImage.open(io.BytesIO(base64.b64decode(data_uri.removeprefix(prefix))))
+	image.load()
+	return image
+
+
+def test_create_placeholder_fits_within_placeholder_size() -> None:
+	image = PILImage.new('RGB', (640, 160), (200, 40, 40))
+
+	placeholder = create_placeholder(image)
+
+	decoded = _decode_data_uri(placeholder.data_uri)
+	assert decoded.format == 'WEBP'
+	assert decoded.size == (PLACEHOLDER_SIZE, 4)
+
+
+def test_create_placeholder_finds_dominant_color() -> None:
+	image = PILImage.new('RGB', (100, 100), (0, 0, 255))
+	image.paste((255, 255, 0), (0, 0, 30, 30))
+
+	placeholder = create_placeholder(image)
+
+	assert placeholder.dominant_color == 0x0000FF
+
+
+def test_create_placeholder_keeps_small_images() -> None:
+	image = PILImage.new('RGBA', (3, 5), (10, 20, 30, 128))
+
+	placeholder = create_placeholder(image)
+
+	assert _decode_data_uri(placeholder.data_uri).size == (3, 5)
+	assert placeholder.dominant_color == 0x0A141E
+
+
+def test_create_placeholder_from_file(tmp_path: Path) -> None:
+	path = tmp_path / 'variant.webp'
+	PILImage.new('RGB', (320, 240), (0, 128, 0)).save(path, format='WEBP')
+
+	placeholder = create_placeholder_from_file(path)
+
+	assert _decode_data_uri(placeholder.data_uri).size == (PLACEHOLDER_SIZE, 12)
+
+
+def test_select_placeholder_source_prefers_smallest_existing_variant() -> None:
+	small = build_variant_spec(1, 320)
+	large = build_variant_spec(1, 640)
+	small_file = build_variant_file(small, width=320)
+	large_file = build_variant_file(large, width=640)
+
+	results = [
+		VariantCommitResult.success('reuse', VariantReport(large, large_file)),
+		VariantCommitResult.success('delete', VariantReport(small, build_variant_file(small, width=120))),
+		VariantCommitResult.success('generate', VariantReport(small, small_file)),
+		VariantCommitResult.failure('generate', 'save_failed'),
+	]
+
+	assert select_placeholder_source(results) is small_file
+
+
+def test_select_placeholder_source_returns_none_without_variants() -> None:
+	assert select_placeholder_source([VariantCommitResult.failure('generate', 'save_failed')]) is None
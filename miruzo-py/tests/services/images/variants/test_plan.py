@@ -3,17 +3,33 @@ from pathlib import Path
 from tests.services.images.utils import build_variant_spec
 from tests.services.images.variants.utils import build_png_info, build_variant_file
 
-from app.config.variant import VariantLayerSpec
+from app.config.variant import (
+	LOSSLESS_WEBP_FORMAT,
+	WEBP_FORMAT,
+	VariantLayerSpec,
+	VariantSlot,
+	VariantSpec,
+)
+from app.models.enums import ImageKind
 from app.services.images.variants.path import map_origin_to_variant_basepath
 from app.services.images.variants.plan import (
 	_classify_variant_diff,
 	_compare_variant_specs,
 	_prepare_variant_plan,
 	_should_emit_variant,
+	apply_variant_kind_to_plan,
 	build_variant_plan,
 	emit_variant_specs,
+	exclude_pruned_specs,
+	force_regenerate,
+)
+from app.services.images.variants.types import (
+	VariantComparison,
+	VariantDiff,
+	VariantPlan,
+	VariantPlanFile,
+	VariantRegeneratePlan,
 )
-from app.services.images.variants.types import VariantComparison, VariantDiff
 
 
 def test_should_emit_variant_respects_required_flag() -> None:
@@ -42,6 +58,51 @@ def test_emit_variant_specs_keeps_order_and_filters_by_width() -> None:
 	assert [spec.width for spec in result] == [320, 640]
 
 
+def test_emit_variant_specs_applies_kind_preset() -> None:
+	layer = VariantLayerSpec(
+		name='primary',
+		layer_id=1,
+		specs=(
+			VariantSpec(slot=VariantSlot(1, 320), layer_id=1, width=320, format=WEBP_FORMAT, quality=80),
+		),
+	)
+	original = build_png_info(width=700)
+
+	graphic = list(emit_variant_specs([layer], original, kind=ImageKind.GRAPHIC))
+	photo = list(emit_variant_specs([layer], original, kind=ImageKind.PHOTO))
+
+	assert [spec.format for spec in graphic] == [LOSSLESS_WEBP_FORMAT]
+	assert graphic[0].slot == layer.specs[0].slot
+	assert graphic[0].quality == 80
+	assert photo == list(layer.specs)
+
+
+def test_exclude_pruned_specs_keeps_required_specs() -> None:
+	required = build_variant_spec(1, 320, required=True)
+	optional = build_variant_spec(1, 640)
+	kept = build_variant_spec(1, 960)
+
+	result = exclude_pruned_specs([required, optional, kept], {required.slot, optional.slot})
+
+	assert list(result) == [required, kept]
+
+
+def test_force_regenerate_moves_matched_slots() -> None:
+	kept_spec = build_variant_spec(1, 320)
+	forced_spec = build_variant_spec(1, 640)
+	kept = VariantComparison(kept_spec, build_variant_file(kept_spec, width=320))
+	forced = VariantComparison(forced_spec, build_variant_file(forced_spec, width=640))
+	plan = VariantPlan(matched=[kept, forced], mismatched=[], missing=[], orphaned=[])
+
+	result = force_regenerate(plan, {forced_spec.slot})
+
+	assert result.matched == [kept]
+	assert len(result.mismatched) == 1
+	assert result.mismatched[0].actual_file is forced.actual_file
+	assert result.mismatched[0].planning_file.spec is forced_spec
+	assert result.mismatched[0].planning_file.path == forced.actual_file.file_info.relative_path
+
+
 def test_compare_variant_specs_classifies_matches_mismatches_and_orphans() -> None:
 	spec_match = build_variant_spec(1, 320)
 	spec_mismatch = build_variant_spec(1, 640)
@@ -89,9 +150,28 @@ def test_classify_variant_diff_demotes_format_mismatch() -> None:
 	classified = _classify_variant_diff(diff)
 
 	assert classified.mismatched == []
+	assert classified.missing == [spec]
 	assert classified.orphaned == [file_incorrect_format]
 
 
+def test_classify_variant_diff_rewrites_codec_mismatch_in_place() -> None:
+	spec = VariantSpec(slot=VariantSlot(1, 320), layer_id=1, width=320, format=LOSSLESS_WEBP_FORMAT)
+	lossy_spec = VariantSpec(slot=VariantSlot(1, 320), layer_id=1, width=320, format=WEBP_FORMAT)
+	file_lossy = build_variant_file(lossy_spec, width=320, container='webp')
+	diff = VariantDiff(
+		matched=[],
+		mismatched=[VariantComparison(spec, file_lossy)],
+		missing=[],
+		orphaned=[],
+	)
+
+	classified = _classify_variant_diff(diff)
+
+	assert classified.mismatched == [VariantComparison(spec, file_lossy)]
+	assert classified.missing == []
+	assert classified.orphaned == []
+
+
 def test_classify_variant_diff_keeps_valid_mismatch() -> None:
 	spec = build_variant_spec(1, 640, container='webp', codecs='vp8')
 	file_wrong_width = build_variant_file(spec, width=800)
@@ -108,6 +188,42 @@ def test_classify_variant_diff_keeps_valid_mismatch() -> None:
 	assert classified.orphaned == []
 
 
+def test_apply_variant_kind_to_plan_regenerates_variants_of_another_codec() -> None:
+	lossy = VariantSpec(slot=VariantSlot(1, 320), layer_id=1, width=320, format=WEBP_FORMAT)
+	lossy_wide = VariantSpec(slot=VariantSlot(1, 640), layer_id=1, width=640, format=WEBP_FORMAT)
+	missing = VariantSpec(slot=VariantSlot(1, 960), layer_id=1, width=960, format=WEBP_FORMAT)
+	lossless_wide = VariantSpec(
+		slot=VariantSlot(1, 640),
+		layer_id=1,
+		width=640,
+		format=LOSSLESS_WEBP_FORMAT,
+	)
+	file_lossy = build_variant_file(lossy, width=320, container='webp')
+	file_lossless = build_variant_file(lossless_wide, width=640, container='webp')
+	missing_path = VariantPlanFile(path=file_lossy.file_info.relative_path, spec=missing)
+	plan = VariantPlan(
+		matched=[VariantComparison(lossy, file_lossy)],
+		mismatched=[
+			VariantRegeneratePlan(
+				actual_file=file_lossless,
+				planning_file=VariantPlanFile(path=file_lossless.file_info.relative_path, spec=lossy_wide),
+			),
+		],
+		missing=[missing_path],
+		orphaned=[],
+	)
+
+	graphic = apply_variant_kind_to_plan(plan, ImageKind.GRAPHIC)
+
+	# the lossy file is rewritten losslessly, the lossless one is kept as is
+	assert [(cmp.planning_file.path, cmp.planning_file.spec.format) for cmp in graphic.mismatched] == [
+		(file_lossy.file_info.relative_path, LOSSLESS_WEBP_FORMAT),
+	]
+	assert graphic.matched == [VariantComparison(lossless_wide, file_lossless)]
+	assert [plan_file.spec.format for plan_file in graphic.missing] == [LOSSLESS_WEBP_FORMAT]
+	assert apply_variant_kind_to_plan(plan, ImageKind.PHOTO).matched == plan.matched
+
+
 def test_prepare_variant_plan_builds_plan_files() -> None:
 	spec = build_variant_spec(1, 320)
 	diff = VariantDiff(
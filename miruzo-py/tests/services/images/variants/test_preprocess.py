@@ -1,12 +1,17 @@
 import io
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
-from PIL import ExifTags, Image
+from PIL import ExifTags, Image, ImageChops, ImageOps, ImageStat
 
+from tests.services.images.utils import build_variant_spec
 from tests.services.images.variants.utils import build_jpeg_info, build_png_info
 
-from app.services.images.variants.preprocess import preprocess_original
+from app.services.images.variants.generate import _transform_variant
+from app.services.images.variants.preprocess import preprocess_downscaled, preprocess_original
+from app.services.images.variants.types import OriginalImage
+from app.services.images.variants.utils import get_image_info
 
 
 @pytest.mark.parametrize(
@@ -86,3 +91,99 @@ def test_preprocess_original_converts_icc_profile(
 
 	assert 'icc_profile' not in result.info
 	assert result.getpixel((0, 0)) == expected_pixel
+
+
+def _build_gradient_image(mode: str, size: tuple[int, int] = (640, 480)) -> Image.Image:
+	horizontal = Image.linear_gradient('L').rotate(90).resize(size)
+	radial = Image.radial_gradient('L').resize(size)
+	image = Image.merge('RGB', (horizontal, radial, ImageOps.invert(horizontal)))
+	if mode == 'RGBA':
+		image.putalpha(radial)
+	return image
+
+
+def _save_and_open(image: Image.Image, fmt: str, **kwargs: object) -> Image.Image:
+	buffer = io.BytesIO()
+	image.save(buffer, format=fmt, **kwargs)
+	buffer.seek(0)
+	return Image.open(buffer)
+
+
+def _render_both(
+	open_original: Callable[[], Image.Image],
+	widths: tuple[int, ...],
+) -> list[tuple[Image.Image, Image.Image]]:
+	info = get_image_info(open_original())
+	eager = OriginalImage(image=preprocess_original(open_original(), info), info=info)
+	deferred = OriginalImage(
+		image=preprocess_downscaled(open_original(), info, width=max(widths)),
+		info=info,
+	)
+
+	pairs: list[tuple[Image.Image, Image.Image]] = []
+	for width in widths:
+		spec = build_variant_spec(1, width, container='webp', codecs='vp8')
+		pairs.append((_transform_variant(spec, eager), _transform_variant(spec, deferred)))
+	return pairs
+
+
+def _mean_abs_difference(expected: Image.Image, actual: Image.Image) -> float:
+	means = ImageStat.Stat(ImageChops.difference(expected, actual)).mean
+	return sum(means) / len(means)
+
+
+@pytest.mark.parametrize('orientation', [1, 2, 3, 4, 5, 6, 7, 8])
+def test_preprocess_downscaled_matches_eager_preprocess_for_oriented_jpeg(orientation: int) -> None:
+	exif = Image.Exif()
+	exif[ExifTags.Base.Orientation] = orientation
+	data = io.BytesIO()
+	_build_gradient_image('RGB').save(data, format='JPEG', quality=95, exif=exif)
+
+	def open_original() -> Image.Image:
+		return Image.open(io.BytesIO(data.getvalue()))
+
+	for expected, actual in _render_both(open_original, (160, 100)):
+		assert actual.size == expected.size
+		assert actual.mode == expected.mode
+		assert _mean_abs_difference(expected, actual) < 2.0
+
+
+@pytest.mark.parametrize(
+	'build',
+	[
+		lambda: _save_and_open(_build_gradient_image('RGBA'), 'PNG'),
+		lambda: _save_and_open(
+			_build_gradient_image('RGB').quantize(64),
+			'PNG',
+			transparency=0,
+		),
+	],
+	ids=['rgba', 'palette-transparency'],
+)
+def test_preprocess_downscaled_matches_eager_preprocess_for_alpha(
+	build: Callable[[], Image.Image],
+) -> None:
+	for expected, actual in _render_both(build, (200, 120)):
+		assert actual.size == expected.size
+		assert actual.mode == expected.mode == 'RGB'
+		assert _mean_abs_difference(expected, actual) < 2.0
+
+
+def test_preprocess_downscaled_converts_icc_profile() -> None:
+	icc_profile = (Path(__file__).parent / 'icc' / 'display_p3.icc').read_bytes()
+
+	def open_original() -> Image.Image:
+		return _save_and_open(_build_gradient_image('RGB'), 'PNG', icc_profile=icc_profile)
+
+	for expected, actual in _render_both(open_original, (320, 160)):
+		assert 'icc_profile' not in actual.info
+		assert actual.size == expected.size
+		assert _mean_abs_difference(expected, actual) < 2.0
+
+
+def test_preprocess_downscaled_keeps_original_when_not_shrinking() -> None:
+	image = _build_gradient_image('RGB', (100, 80))
+
+	result = preprocess_downscaled(image, build_png_info(width=100, height=80), width=100)
+
+	assert result.size == (100, 80)
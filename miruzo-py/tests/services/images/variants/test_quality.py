@@ -0,0 +1,77 @@
+import io
+
+import pytest
+from PIL import Image as PILImage
+from PIL import ImageFilter
+
+from app.services.images.variants.quality import (
+	MAX_SEARCH_PROBES,
+	MAX_SEARCH_QUALITY,
+	compute_ssim,
+	search_quality,
+)
+
+
+def _new_reference() -> PILImage.Image:
+	noise = PILImage.effect_noise((256, 192), 40).convert('RGB')
+	gradient = PILImage.linear_gradient('L').resize((256, 192)).convert('RGB')
+	return PILImage.blend(noise, gradient, 0.5).filter(ImageFilter.GaussianBlur(1))
+
+
+def _encode_webp(image: PILImage.Image, quality: int) -> io.BytesIO:
+	buffer = io.BytesIO()
+	image.save(buffer, format='WEBP', quality=quality)
+	return buffer
+
+
+def test_compute_ssim_is_one_for_identical_images() -> None:
+	reference = _new_reference()
+
+	assert compute_ssim(reference, reference.copy()) == pytest.approx(1.0)
+
+
+def test_compute_ssim_decreases_with_quality() -> None:
+	reference = _new_reference()
+
+	with (
+		PILImage.open(_encode_webp(reference, 20)) as low,
+		PILImage.open(_encode_webp(reference, 90)) as high,
+	):
+		low_score = compute_ssim(reference, low)
+		high_score = compute_ssim(reference, high)
+
+	assert low_score < high_score < 1.0
+
+
+def test_compute_ssim_rejects_size_mismatch() -> None:
+	reference = _new_reference()
+
+	with pytest.raises(ValueError, match='same size'):
+		compute_ssim(reference, reference.resize((128, 96)))
+
+
+def test_search_quality_finds_lowest_quality_meeting_target() -> None:
+	reference = _new_reference()
+	probed: list[int] = []
+
+	def encode(quality: int) -> io.BytesIO:
+		probed.append(quality)
+		return _encode_webp(reference, quality)
+
+	quality, buffer = search_quality(reference, encode, target=0.9)
+
+	assert len(probed) <= MAX_SEARCH_PROBES
+	with PILImage.open(buffer) as decoded:
+		assert compute_ssim(reference, decoded) >= 0.9
+	for lower in probed:
+		if lower < quality:
+			with PILImage.open(_encode_webp(reference, lower)) as decoded:
+				assert compute_ssim(reference, decoded) < 0.9
+
+
+def test_search_quality_falls_back_to_high_when_target_is_unreachable() -> None:
+	reference = _new_reference()
+
+	quality, _ = search_quality(reference, lambda quality: _encode_webp(reference, quality), target=0.99999)
+
+	assert quality == MAX_SEARCH_QUALITY
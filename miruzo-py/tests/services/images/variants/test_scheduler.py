@@ -0,0 +1,118 @@
+import threading
+from collections.abc import Callable
+
+import pytest
+
+from app.services.images.variants.scheduler import (
+	VariantJob,
+	VariantScheduler,
+	estimate_decoded_bytes,
+)
+from app.services.images.variants.utils import ImageInfo
+
+
+def _info(width: int, height: int) -> ImageInfo:
+	return ImageInfo(container='png', codecs=None, width=width, height=height, lossless=True)
+
+
+def test_estimate_decoded_bytes_uses_four_bytes_per_pixel() -> None:
+	assert estimate_decoded_bytes(_info(10, 8)) == 320
+
+
+@pytest.mark.parametrize(
+	('max_workers', 'memory_budget'),
+	[(0, 1024), (1, 0)],
+)
+def test_variant_scheduler_rejects_invalid_arguments(max_workers: int, memory_budget: int) -> None:
+	with pytest.raises(ValueError, match='greater than or equal to 1'):
+		VariantScheduler(max_workers=max_workers, memory_budget=memory_budget)
+
+
+def test_variant_scheduler_runs_largest_first() -> None:
+	started: list[int] = []
+	sizes = [10, 40, 20, 30]
+	jobs = [
+		VariantJob(image_info=_info(size, size), run=lambda size=size: started.append(size) or size)
+		for size in sizes
+	]
+
+	futures = VariantScheduler(max_workers=1, memory_budget=1 << 20).run(jobs)
+
+	assert started == [40, 30, 20, 10]
+	assert [future.result() for future in futures] == sizes
+
+
+def test_variant_scheduler_keeps_in_flight_bytes_under_budget() -> None:
+	lock = threading.Lock()
+	in_flight = 0
+	peak = 0
+
+	def make_run(cost: int) -> Callable[[], None]:
+		def run() -> None:
+			nonlocal in_flight, peak
+			with lock:
+				in_flight += cost
+				peak = max(peak, in_flight)
+			threading.Event().wait(0.01)
+			with lock:
+				in_flight -= cost
+
+		return run
+
+	sizes = [8, 8, 6, 6, 4, 4, 2, 2]
+	jobs = [
+		VariantJob(image_info=_info(size, 1), run=make_run(estimate_decoded_bytes(_info(size, 1))))
+		for size in sizes
+	]
+
+	futures = VariantScheduler(max_workers=4, memory_budget=64).run(jobs)
+
+	for future in futures:
+		future.result()
+	assert 0 < peak <= 64
+
+
+def test_variant_scheduler_runs_oversized_job_alone() -> None:
+	lock = threading.Lock()
+	active = 0
+	overlapped = False
+
+	def run(*, oversized: bool) -> None:
+		nonlocal active, overlapped
+		with lock:
+			active += 1
+			if oversized and active > 1:
+				overlapped = True
+		threading.Event().wait(0.01)
+		with lock:
+			if oversized and active > 1:
+				overlapped = True
+			active -= 1
+
+	jobs = [
+		VariantJob(image_info=_info(100, 100), run=lambda: run(oversized=True)),
+		VariantJob(image_info=_info(1, 1), run=lambda: run(oversized=False)),
+		VariantJob(image_info=_info(1, 1), run=lambda: run(oversized=False)),
+	]
+
+	futures = VariantScheduler(max_workers=3, memory_budget=1024).run(jobs)
+
+	for future in futures:
+		future.result()
+	assert not overlapped
+
+
+def test_variant_scheduler_surfaces_job_errors_through_futures() -> None:
+	def fail() -> None:
+		raise RuntimeError('boom')
+
+	futures = VariantScheduler(max_workers=2, memory_budget=1024).run(
+		[
+			VariantJob(image_info=_info(1, 1), run=fail),
+			VariantJob(image_info=_info(1, 1), run=lambda: None),
+		],
+	)
+
+	with pytest.raises(RuntimeError, match='boom'):
+		futures[0].result()
+	assert futures[1].result() is None
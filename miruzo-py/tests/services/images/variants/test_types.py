@@ -24,3 +24,14 @@ def test_file_info_from_relative_path_raises_when_missing(tmp_path: Path) -> Non
 
 	with pytest.raises(FileNotFoundError):
 		FileInfo.from_relative_path(relative_path, under=tmp_path)
+
+
+def test_file_info_from_relative_path_uses_given_stat(tmp_path: Path) -> None:
+	source = tmp_path / 'source.webp'
+	source.write_bytes(b'payload')
+	relative_path = VariantRelativePath(Path('l1w320/missing.webp'))
+
+	info = FileInfo.from_relative_path(relative_path, under=tmp_path, stat=source.stat())
+
+	assert info.absolute_path == tmp_path / relative_path
+	assert info.bytes == 7
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Sequence
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import cast
@@ -8,18 +9,20 @@ import pytest
 from tests.stubs.clock import FixedClockProvider
 
 from app.config.environments import env
-from app.models.enums import ExecutionStatus, IngestMode
+from app.models.enums import ExecutionStatus, IngestMode, ProcessStatus
 from app.models.ingest import Execution
-from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput
+from app.persist.ingests.protocol import IngestAppendExecutionInput, IngestCreateInput, IngestCreateResult
 from app.services.ingests.service import IngestService
 from app.services.ingests.utils.fingerprint import compute_fingerprint
 
 
 class _StubIngestRepository:
-	def __init__(self, *, fail: bool = False) -> None:
+	def __init__(self, *, fail: bool = False, existing: dict[str, str] | None = None) -> None:
 		self.fail = fail
+		self.existing = existing or {}
 		self.created: IngestCreateInput | None = None
 		self.appended: IngestAppendExecutionInput | None = None
+		self.appended_many: list[IngestAppendExecutionInput] = []
 
 	def create(self, entry: IngestCreateInput) -> int:
 		self.created = entry
@@ -27,9 +30,26 @@ class _StubIngestRepository:
 			raise RuntimeError('boom')
 		return 1
 
+	def create_many(self, entries: Sequence[IngestCreateInput]) -> Sequence[int]:
+		return [self.create(entry) for entry in entries]
+
+	def create_many_if_absent(self, entries: Sequence[IngestCreateInput]) -> Sequence[IngestCreateResult]:
+		return [
+			IngestCreateResult(id=2, relative_path=self.existing[entry.fingerprint], created=False)
+			if entry.fingerprint in self.existing
+			else IngestCreateResult(id=self.create(entry), relative_path=entry.relative_path, created=True)
+			for entry in entries
+		]
+
+	def find_existing_fingerprints(self, fingerprints: Sequence[str]) -> set[str]:
+		return set(self.existing).intersection(fingerprints)
+
 	def append_execution(self, entry: IngestAppendExecutionInput) -> None:
 		self.appended = entry
 
+	def append_executions(self, entries: Sequence[IngestAppendExecutionInput]) -> None:
+		self.appended_many = list(entries)
+
 
 def _setup_roots(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
 	assets_root = tmp_path / 'assets'
@@ -48,8 +68,9 @@ def _new_ingest_service_fixture(
 	now: datetime,
 	*,
 	fail: bool = False,
+	existing: dict[str, str] | None = None,
 ) -> tuple[IngestService, _StubIngestRepository]:
-	repo = _StubIngestRepository(fail=fail)
+	repo = _StubIngestRepository(fail=fail, existing=existing)
 	service = IngestService(
 		repository=repo,
 		clock=FixedClockProvider(now),
@@ -182,6 +203,112 @@ def test_create_ingest_recomputes_invalid_fingerprint(
 	assert 'invalid fingerprint detected' in caplog.text
 
 
+def test_create_ingests_writes_initial_execution(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+) -> None:
+	assets_root = _setup_roots(tmp_path, monkeypatch)
+	origin_relative = Path('foo') / 'bar.webp'
+	origin = assets_root / origin_relative
+	origin.parent.mkdir(parents=True)
+	origin.write_bytes(b'data')
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service, repo = _new_ingest_service_fixture(now)
+	execution = Execution(
+		status=ExecutionStatus.SUCCESS,
+		error_type=None,
+		error_message=None,
+		executed_at=now,
+		inspect=None,
+		collect=None,
+		plan=None,
+		execute=None,
+		store=None,
+		overall=None,
+	)
+
+	pending = service.prepare_ingest(
+		origin_path=origin_relative,
+		fingerprint=None,
+		captured_at=now,
+		ingest_mode=IngestMode.SYMLINK,
+	)
+	(ingest,) = service.create_ingests([pending], executions=[execution])
+
+	assert repo.created is not None
+	assert repo.created.execution == execution
+	assert repo.appended is None
+	assert ingest.process == ProcessStatus.FINISHED
+	assert list(ingest.executions) == [execution]
+
+
+@pytest.mark.parametrize(
+	('stored_path', 'keeps_copy'),
+	[
+		('l0orig/foo/bar.webp', True),
+		('l0orig/other/bar.webp', False),
+	],
+)
+def test_create_missing_ingests_reports_existing_ingest(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+	stored_path: str,
+	keeps_copy: bool,
+) -> None:
+	assets_root = _setup_roots(tmp_path, monkeypatch)
+	for name in ('bar.webp', 'new.webp'):
+		origin = assets_root / 'foo' / name
+		origin.parent.mkdir(parents=True, exist_ok=True)
+		origin.write_bytes(name.encode('utf-8'))
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service, repo = _new_ingest_service_fixture(now, existing={'a' * 64: stored_path})
+
+	pending = [
+		service.prepare_ingest(
+			origin_path=Path('foo') / name,
+			fingerprint=fingerprint,
+			captured_at=now,
+			ingest_mode=IngestMode.COPY,
+		)
+		for name, fingerprint in (('bar.webp', 'a' * 64), ('new.webp', 'b' * 64))
+	]
+	existing, created = service.create_missing_ingests(pending)
+
+	assert existing is None
+	assert created is not None
+	assert created.relative_path == 'l0orig/foo/new.webp'
+	assert repo.created is not None
+	assert repo.created.fingerprint == 'b' * 64
+	# the copy is only kept when the stored row points at it
+	assert pending[0].output_path.exists() is keeps_copy
+	assert pending[1].output_path.exists()
+
+
+def test_resolve_fingerprint_hashes_original_before_it_is_copied(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+) -> None:
+	assets_root = _setup_roots(tmp_path, monkeypatch)
+	origin = assets_root / 'foo' / 'bar.webp'
+	origin.parent.mkdir(parents=True)
+	origin.write_bytes(b'bar')
+
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service, _ = _new_ingest_service_fixture(now, existing={'a' * 64: 'l0orig/foo/bar.webp'})
+
+	fingerprint = service.resolve_fingerprint(origin_path=Path('foo/bar.webp'), fingerprint=None)
+
+	assert fingerprint == compute_fingerprint(origin)
+	assert (
+		service.resolve_fingerprint(origin_path=Path('foo/bar.webp'), fingerprint=' ' + 'A' * 64)
+		== 'a' * 64
+	)
+	assert service.find_existing_fingerprints(['a' * 64, fingerprint]) == {'a' * 64}
+	assert not (tmp_path / 'media' / 'l0orig').exists()
+
+
 def test_append_execution_uses_clock() -> None:
 	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
 	service, repo = _new_ingest_service_fixture(now)
@@ -203,3 +330,25 @@ def test_append_execution_uses_clock() -> None:
 	assert repo.appended.ingest_id == 10
 	assert repo.appended.updated_at == now
 	assert repo.appended.execution == execution
+
+
+def test_append_executions_uses_clock() -> None:
+	now = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+	service, repo = _new_ingest_service_fixture(now)
+	execution = Execution(
+		status=ExecutionStatus.IO_ERROR,
+		error_type='OSError',
+		error_message='boom',
+		executed_at=now,
+		inspect=None,
+		collect=None,
+		plan=None,
+		execute=None,
+		store=None,
+		overall=None,
+	)
+
+	service.append_executions([(10, execution), (11, execution)])
+	assert [entry.ingest_id for entry in repo.appended_many] == [10, 11]
+	assert all(entry.updated_at == now for entry in repo.appended_many)
+	assert all(entry.execution == execution for entry in repo.appended_many)
@@ -48,3 +48,14 @@ def test_delete_origin_file_rejects_non_file(tmp_path: Path) -> None:
 
 	with pytest.raises(ValueError, match='not a file'):
 		delete_origin_file(target)
+
+
+def test_copy_origin_file_rejects_non_regular_stat(tmp_path: Path) -> None:
+	src = tmp_path / 'src.txt'
+	src.write_bytes(b'hello')
+	dst = tmp_path / 'dst.txt'
+
+	with pytest.raises(ValueError, match='not a file'):
+		copy_origin_file(src, dst, src_stat=tmp_path.stat())
+
+	assert not dst.exists()
@@ -0,0 +1,13 @@
+from collections.abc import Sequence
+from typing import final
+
+from app.persist.executions.protocol import ExecutionCreateInput
+
+
+@final
+class StubExecutionRepository:
+	def __init__(self) -> None:
+		self.created: list[ExecutionCreateInput] = []
+
+	def create_many(self, entries: Sequence[ExecutionCreateInput]) -> None:
+		self.created.extend(entries)
@@ -1,12 +1,29 @@
+from collections.abc import Sequence
 from typing import final
 
 from app.models.image import Image
+from app.models.types import VariantEntry
+from app.persist.images.protocol import ImageVariantsEntry
 
 
 @final
 class StubImageRepository:
-	def __init__(self) -> None:
+	def __init__(self, entries: Sequence[ImageVariantsEntry] = ()) -> None:
 		self.create_called_with: Image | None = None
+		self.created: list[Image] = []
+		self.entries = list(entries)
+		self.updated: dict[int, Sequence[VariantEntry]] = {}
 
 	def create(self, entry: Image) -> None:
 		self.create_called_with = entry
+		self.created.append(entry)
+
+	def create_many(self, entries: Sequence[Image]) -> None:
+		for entry in entries:
+			self.create(entry)
+
+	def list_by_score(self, *, limit: int, offset: int = 0) -> Sequence[ImageVariantsEntry]:
+		return self.entries[offset : offset + limit]
+
+	def update_variants(self, ingest_id: int, variants: Sequence[VariantEntry]) -> None:
+		self.updated[ingest_id] = variants
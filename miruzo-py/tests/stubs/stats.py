@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import final
 
 from app.persist.stats.protocol import StatsCreateInput
@@ -7,6 +8,12 @@ from app.persist.stats.protocol import StatsCreateInput
 class StubStatsRepository:
 	def __init__(self) -> None:
 		self.create_called_with: StatsCreateInput | None = None
+		self.created: list[StatsCreateInput] = []
 
 	def create(self, entry: StatsCreateInput) -> None:
 		self.create_called_with = entry
+		self.created.append(entry)
+
+	def create_many(self, entries: Sequence[StatsCreateInput]) -> None:
+		for entry in entries:
+			self.create(entry)
@@ -1,9 +1,13 @@
+import errno
+import os
+import sys
 from pathlib import Path
 from typing import IO
 
 import pytest
 
-from app.utils.files.atomic import ensure_durable_write
+from app.utils.files import atomic
+from app.utils.files.atomic import ensure_durable_write, write_file_atomically
 
 
 def test_ensure_durable_write_writes_content(tmp_path: Path) -> None:
@@ -31,3 +35,81 @@ def test_ensure_durable_write_removes_temp_on_error(tmp_path: Path) -> None:
 
 	assert not final_path.exists()
 	assert list(tmp_path.glob('*.tmp')) == []
+
+
+@pytest.mark.parametrize('durable', [True, False])
+def test_write_file_atomically_writes_content(tmp_path: Path, durable: bool) -> None:
+	final_path = tmp_path / 'output.bin'
+
+	write_file_atomically(final_path, memoryview(b'hello-world'), durable=durable)
+
+	assert final_path.read_bytes() == b'hello-world'
+	assert [path.name for path in tmp_path.iterdir()] == ['output.bin']
+
+
+@pytest.mark.parametrize('durable', [True, False])
+def test_write_file_atomically_replaces_existing_file(tmp_path: Path, durable: bool) -> None:
+	final_path = tmp_path / 'output.bin'
+	final_path.write_bytes(b'old-content-that-is-longer')
+
+	write_file_atomically(final_path, b'new', durable=durable)
+
+	assert final_path.read_bytes() == b'new'
+	assert [path.name for path in tmp_path.iterdir()] == ['output.bin']
+
+
+@pytest.mark.parametrize('durable', [True, False])
+def test_write_file_atomically_falls_back_without_tmpfile(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+	durable: bool,
+) -> None:
+	monkeypatch.setattr(atomic, '_write_tmpfile', lambda *_args, **_kwargs: False)
+	final_path = tmp_path / 'output.bin'
+
+	write_file_atomically(final_path, bytearray(b'payload'), durable=durable)
+
+	assert final_path.read_bytes() == b'payload'
+	assert list(tmp_path.glob('*.tmp')) == []
+
+
+def _fail_link_once(monkeypatch: pytest.MonkeyPatch, error: int) -> None:
+	link = os.link
+	calls: list[str] = []
+
+	def fail_once(src: str, dst: Path, *, follow_symlinks: bool = True) -> None:
+		if not calls:
+			calls.append(src)
+			raise OSError(error, os.strerror(error))
+		link(src, dst, follow_symlinks=follow_symlinks)
+
+	monkeypatch.setattr(os, 'link', fail_once)
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='O_TMPFILE is Linux only')
+@pytest.mark.parametrize(
+	('error', 'still_supported'),
+	[
+		# e.g. the directory was renamed while the variant was written
+		(errno.ENOENT, True),
+		(errno.EACCES, True),
+		# /proc/self/fd links are denied for the whole process
+		(errno.EPERM, False),
+		(errno.EXDEV, False),
+	],
+)
+def test_write_file_atomically_disables_tmpfile_only_when_unsupported(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+	error: int,
+	still_supported: bool,
+) -> None:
+	monkeypatch.setattr(atomic, '_tmpfile_supported', True)
+	_fail_link_once(monkeypatch, error)
+	final_path = tmp_path / 'output.bin'
+
+	write_file_atomically(final_path, b'payload', durable=True)
+
+	assert final_path.read_bytes() == b'payload'
+	assert list(tmp_path.glob('*.tmp')) == []
+	assert atomic._tmpfile_supported is still_supported  # pyright: ignore[reportPrivateUsage]
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from app.utils.files.content_hash import (
+	CONTENT_HASH_LENGTH,
+	compute_content_hash,
+	compute_file_content_hash,
+)
+
+
+def test_compute_content_hash_is_short_hex() -> None:
+	content_hash = compute_content_hash(b'hello-world')
+
+	assert len(content_hash) == CONTENT_HASH_LENGTH
+	int(content_hash, 16)
+
+
+def test_compute_content_hash_accepts_buffers() -> None:
+	payload = b'hello-world'
+
+	assert compute_content_hash(memoryview(payload)) == compute_content_hash(payload)
+	assert compute_content_hash(bytearray(payload)) == compute_content_hash(payload)
+	assert compute_content_hash(b'hello-world!') != compute_content_hash(payload)
+
+
+def test_compute_file_content_hash_matches_buffer_hash(tmp_path: Path) -> None:
+	payload = bytes(range(256)) * 8192
+	path = tmp_path / 'payload.bin'
+	path.write_bytes(payload)
+
+	assert compute_file_content_hash(path) == compute_content_hash(payload)
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+from app.utils.files import group_sync as group_sync_module
+from app.utils.files.group_sync import GroupSync
+
+
+class FakeClock:
+	def __init__(self) -> None:
+		self.now = 0.0
+
+	def __call__(self) -> float:
+		return self.now
+
+
+def test_group_sync_flushes_after_max_units(tmp_path: Path) -> None:
+	sync = GroupSync(max_units=2, max_delay=60, clock=FakeClock())
+	assert not sync.should_flush()
+
+	sync.track([tmp_path / 'a.webp'])
+	assert not sync.should_flush()
+
+	sync.track([tmp_path / 'b.webp', tmp_path / 'c.webp'])
+	assert sync.should_flush()
+	assert sync.pending_files == 3
+
+
+def test_group_sync_flushes_after_max_delay(tmp_path: Path) -> None:
+	clock = FakeClock()
+	sync = GroupSync(max_units=100, max_delay=5, clock=clock)
+
+	clock.now = 10.0
+	sync.track([tmp_path / 'a.webp'])
+	clock.now = 14.9
+	assert not sync.should_flush()
+	clock.now = 15.0
+	assert sync.should_flush()
+
+
+@pytest.mark.parametrize('use_syncfs', [True, False])
+def test_group_sync_flush_syncs_once_per_filesystem_or_per_file(
+	tmp_path: Path,
+	monkeypatch: pytest.MonkeyPatch,
+	use_syncfs: bool,
+) -> None:
+	synced_filesystems: list[Path] = []
+	synced_files: list[Path] = []
+	synced_dirs: list[Path] = []
+
+	def sync_filesystem(dir_path: Path) -> bool:
+		synced_filesystems.append(dir_path)
+		return use_syncfs
+
+	monkeypatch.setattr(group_sync_module, '_sync_filesystem', sync_filesystem)
+	monkeypatch.setattr(group_sync_module, '_fsync_file', synced_files.append)
+	monkeypatch.setattr(group_sync_module, 'fsync_dir', synced_dirs.append)
+
+	small_dir = tmp_path / 'l1w320'
+	large_dir = tmp_path / 'l1w640'
+	small_dir.mkdir()
+	large_dir.mkdir()
+
+	sync = GroupSync(max_units=1, max_delay=60, clock=FakeClock())
+	sync.track([small_dir / 'a.webp', large_dir / 'a.webp'])
+	sync.track([small_dir / 'b.webp'])
+	sync.flush()
+
+	assert sync.pending_files == 0
+	assert not sync.should_flush()
+	if use_syncfs:
+		assert synced_filesystems == [small_dir]
+		assert synced_files == []
+		assert synced_dirs == []
+	else:
+		assert synced_filesystems == [small_dir, large_dir]
+		assert synced_files == [small_dir / 'a.webp', small_dir / 'b.webp', large_dir / 'a.webp']
+		assert synced_dirs == [small_dir, large_dir]
+
+
+def test_group_sync_flush_skips_missing_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(group_sync_module, '_sync_filesystem', lambda _: False)
+	written = tmp_path / 'a.webp'
+	written.write_bytes(b'data')
+
+	sync = GroupSync(max_units=1, max_delay=60)
+	sync.track([written, tmp_path / 'missing.webp'])
+	sync.flush()
+
+	assert sync.pending_files == 0
+
+
+@pytest.mark.parametrize(
+	('max_units', 'max_delay'),
+	[(0, 1.0), (1, 0.0)],
+)
+def test_group_sync_rejects_invalid_limits(max_units: int, max_delay: float) -> None:
+	with pytest.raises(ValueError, match='must be greater'):
+		GroupSync(max_units=max_units, max_delay=max_delay)
@@ -0,0 +1,5 @@
+-- Drop list placeholder from images
+ALTER TABLE images
+	DROP CHECK ck_images_dominant_color,
+	DROP COLUMN dominant_color,
+	DROP COLUMN placeholder;
@@ -0,0 +1,6 @@
+-- Add list placeholder to images
+ALTER TABLE images
+	ADD COLUMN placeholder VARCHAR(1024),
+	ADD COLUMN dominant_color INT
+		CONSTRAINT ck_images_dominant_color
+			CHECK (dominant_color BETWEEN 0 AND 16777215);
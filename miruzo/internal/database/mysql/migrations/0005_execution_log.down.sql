@@ -0,0 +1,2 @@
+-- Drop ingest_executions table
+DROP TABLE ingest_executions;
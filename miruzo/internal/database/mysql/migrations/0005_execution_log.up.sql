@@ -0,0 +1,22 @@
+-- Create ingest_executions table
+-- details: docs/database.md
+CREATE TABLE ingest_executions(
+	id BIGINT AUTO_INCREMENT PRIMARY KEY,
+	ingest_id BIGINT NOT NULL,
+	status TINYINT NOT NULL
+		CONSTRAINT ck_ingest_executions_status
+			CHECK (status BETWEEN 0 AND 5),
+	error_type TEXT,
+	error_message TEXT,
+	executed_at DATETIME(6) NOT NULL,
+	inspect_seconds DOUBLE CHECK (inspect_seconds >= 0),
+	collect_seconds DOUBLE CHECK (collect_seconds >= 0),
+	plan_seconds    DOUBLE CHECK (plan_seconds >= 0),
+	execute_seconds DOUBLE CHECK (execute_seconds >= 0),
+	store_seconds   DOUBLE CHECK (store_seconds >= 0),
+	overall_seconds DOUBLE CHECK (overall_seconds >= 0),
+	INDEX ix_ingest_executions_status (status, executed_at),
+	INDEX ix_ingest_executions_ingest (ingest_id, executed_at),
+	CONSTRAINT fk_ingest_executions_ingest
+		FOREIGN KEY (ingest_id) REFERENCES ingests(id) ON DELETE CASCADE
+);
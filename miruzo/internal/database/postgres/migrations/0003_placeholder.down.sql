@@ -0,0 +1,4 @@
+-- Drop list placeholder from images
+ALTER TABLE images
+	DROP COLUMN dominant_color,
+	DROP COLUMN placeholder;
@@ -0,0 +1,4 @@
+-- Drop ingest_executions table
+DROP INDEX ix_ingest_executions_ingest;
+DROP INDEX ix_ingest_executions_status;
+DROP TABLE ingest_executions;
@@ -0,0 +1,29 @@
+-- Create ingest_executions table
+-- details: docs/database.md
+CREATE TABLE ingest_executions(
+	id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+	ingest_id BIGINT
+		CONSTRAINT fk_ingest_executions_ingest
+			NOT NULL
+			REFERENCES ingests(id) ON DELETE CASCADE,
+	status SMALLINT
+		CONSTRAINT ck_ingest_executions_status
+			NOT NULL
+			CHECK (status BETWEEN 0 AND 5),
+	error_type TEXT,
+	error_message TEXT,
+	executed_at FINITE_TIMESTAMP NOT NULL,
+	inspect_seconds DOUBLE PRECISION CHECK (inspect_seconds >= 0),
+	collect_seconds DOUBLE PRECISION CHECK (collect_seconds >= 0),
+	plan_seconds    DOUBLE PRECISION CHECK (plan_seconds >= 0),
+	execute_seconds DOUBLE PRECISION CHECK (execute_seconds >= 0),
+	store_seconds   DOUBLE PRECISION CHECK (store_seconds >= 0),
+	overall_seconds DOUBLE PRECISION CHECK (overall_seconds >= 0)
+);
+
+-- Create index for execution analysis
+CREATE INDEX ix_ingest_executions_status
+ON ingest_executions (status, executed_at);
+
+CREATE INDEX ix_ingest_executions_ingest
+ON ingest_executions (ingest_id, executed_at);
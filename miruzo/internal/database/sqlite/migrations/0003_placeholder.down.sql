@@ -0,0 +1,3 @@
+-- Drop list placeholder from images
+ALTER TABLE images DROP COLUMN dominant_color;
+ALTER TABLE images DROP COLUMN placeholder;
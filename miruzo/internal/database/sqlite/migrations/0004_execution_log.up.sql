@@ -0,0 +1,29 @@
+-- Create ingest_executions table
+-- details: docs/database.md
+CREATE TABLE ingest_executions(
+	id INTEGER PRIMARY KEY,
+	ingest_id INTEGER
+		CONSTRAINT fk_ingest_executions_ingest
+			NOT NULL
+			REFERENCES ingests(id) ON DELETE CASCADE,
+	status INTEGER
+		CONSTRAINT ck_ingest_executions_status
+			NOT NULL
+			CHECK (status BETWEEN 0 AND 5),
+	error_type TEXT,
+	error_message TEXT,
+	executed_at DATETIME NOT NULL,
+	inspect_seconds REAL CHECK (inspect_seconds >= 0),
+	collect_seconds REAL CHECK (collect_seconds >= 0),
+	plan_seconds    REAL CHECK (plan_seconds >= 0),
+	execute_seconds REAL CHECK (execute_seconds >= 0),
+	store_seconds   REAL CHECK (store_seconds >= 0),
+	overall_seconds REAL CHECK (overall_seconds >= 0)
+);
+
+-- Create index for execution analysis
+CREATE INDEX ix_ingest_executions_status
+ON ingest_executions (status, executed_at);
+
+CREATE INDEX ix_ingest_executions_ingest
+ON ingest_executions (ingest_id, executed_at);
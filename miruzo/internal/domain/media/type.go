@@ -19,6 +19,8 @@ type Variant struct {
 	Height uint16
 	// Quality is the optional encoding quality for lossy outputs.
 	Quality mo.Option[QualityType]
+	// Hash is the short content hash of the encoded file; empty for older rows.
+	Hash string
 }
 
 func (v Variant) IsFallback() bool {
@@ -14,6 +14,7 @@ const (
 	ExecutionDatabaseError
 	ExecutionIOError
 	ExecutionImageError
+	ExecutionResourceError
 )
 
 type duration time.Duration
@@ -14,6 +14,7 @@ type Variant struct {
 	Width        uint16             `json:"width"`
 	Height       uint16             `json:"height"`
 	Quality      *media.QualityType `json:"quality"`
+	Hash         string             `json:"hash,omitempty"`
 }
 
 func (v *Variant) ToDomain() media.Variant {
@@ -26,6 +27,7 @@ func (v *Variant) ToDomain() media.Variant {
 		Width:        v.Width,
 		Height:       v.Height,
 		Quality:      mo.PointerToOption(v.Quality),
+		Hash:         v.Hash,
 	}
 }
 